@@ -1,31 +1,56 @@
 # === Imports and Setup ===
-import os, csv, io, base64, logging, webbrowser
+import os, csv, io, base64, logging, threading, webbrowser
 from datetime import datetime
 from functools import wraps
 from collections import Counter
-from flask import Flask, request, render_template, redirect, url_for, flash, session, make_response, send_file
-from xhtml2pdf import pisa
+from flask import Flask, request, render_template, redirect, url_for, flash, session, make_response, send_file, jsonify, abort
 
 # === Internal Modules (Your Own Code) ===
-from ml_model.job_title_predictor import predict_job_title, generate_shap_chart
+from ml_model.job_title_predictor import predict_job_title_many, featurize
 from ml_model.resume_classifier import predict_resume_title
-from utils.parser import extract_text_from_file, extract_resume_data, extract_jd_skills, classify_experience
+from ml_model import registry as model_registry
+from ml_model import shap_explainer
+from utils.parser import (
+    MAX_PDF_PAGES,
+    extract_text_from_file,
+    extract_texts_parallel,
+    extract_jd_skills
+)
 from utils.matcher import (
     calculate_match_score,
+    score_many,
     get_bert_similarity,
+    warm_embeddings,
     generate_feedback,
     calculate_synonym_boosted_score,
-    generate_skill_gap_suggestion
+    generate_skill_gap_suggestion,
+    scoring_key
 )
 from utils.database import (
     init_db,
     insert_result,
     get_all_results,
     update_notes_and_rating,
-    toggle_star as toggle_star_db
+    toggle_star as toggle_star_db,
+    get_resumes,
+    get_result_match_keys,
+    get_cached_matches,
+    put_cached_matches
 )
 from utils.clustering import cluster_resumes
-from utils.gpt_helper import suggest_job_titles, suggest_learning_gap
+from utils.ingest import (
+    enqueue as enqueue_ingestion,
+    ingest_files,
+    resume_skills,
+    resume_top_titles
+)
+from utils.gpt_helper import GPT_DEADLINE, suggest_job_titles_many, suggest_learning_gap
+from utils import circuit_breaker, resources, skill_index
+from utils.circuit_breaker import LatencyBudget
+from utils.text_cache import file_digest
+from utils.local_embeddings import semantic_scores
+from utils.retrieval import DEFAULT_K, MAX_K, match_top_k
+from utils.batch_match import match_jds
 from config import (
     SECRET_KEY,
     ADMIN_USERNAME,
@@ -33,7 +58,11 @@ from config import (
     UPLOAD_FOLDER_RESUMES,
     UPLOAD_FOLDER_JD,
     MAX_CONTENT_LENGTH,
-    ALLOWED_EXTENSIONS
+    ALLOWED_EXTENSIONS,
+    PARSE_WORKERS,
+    PARSE_TIMEOUT,
+    WARM_UP_ON_START,
+    MATCH_LATENCY_BUDGET
 )
 
 # === Logging Setup ===
@@ -53,6 +82,19 @@ app.secret_key = SECRET_KEY
 os.makedirs(UPLOAD_FOLDER_JD, exist_ok=True)
 os.makedirs(UPLOAD_FOLDER_RESUMES, exist_ok=True)
 
+# === Model Warm-up ===
+# Heavy models load on first use; optionally pre-load them in the background
+# so the first request doesn't pay for it while /healthz already answers.
+def warm_up_resources():
+    try:
+        timings = resources.warm_up()
+        logging.info(f"[Warm-up] Done: {timings}")
+    except Exception as e:
+        logging.error(f"[Warm-up FAIL] {e}")
+
+if WARM_UP_ON_START:
+    threading.Thread(target=warm_up_resources, daemon=True).start()
+
 # === Helper Decorators ===
 def login_required(view_func):
     @wraps(view_func)
@@ -94,11 +136,16 @@ def index():
 @app.route('/upload_resume', methods=['POST'])
 def upload_resume():
     files = request.files.getlist('resume')
+    saved_paths = []
     for file in files:
         if file and allowed_file(file.filename):
             save_path = os.path.join(app.config['UPLOAD_FOLDER_RESUMES'], file.filename)
             file.save(save_path)
+            saved_paths.append(save_path)
             logging.info(f"[Resume Upload] {session.get('role', 'guest')} uploaded {file.filename}")
+    if saved_paths:
+        # Parse + featurize + ML titles now, so match runs only do JD scoring
+        enqueue_ingestion(saved_paths, workers=PARSE_WORKERS, timeout=PARSE_TIMEOUT)
     flash("✅ Resume(s) uploaded successfully!")
     return redirect(url_for("index"))
 
@@ -134,43 +181,106 @@ def match_all_selected():
 def match_all_resumes(jd_filename):
     resumes_folder = app.config['UPLOAD_FOLDER_RESUMES']
     jd_path = os.path.join(app.config['UPLOAD_FOLDER_JD'], jd_filename)
-    jd_text = extract_text_from_file(jd_path)
+    jd_text = extract_text_from_file(jd_path, max_pages=None, workers=PARSE_WORKERS)
     jd_skills = extract_jd_skills(jd_text)
 
+    paths = [os.path.join(resumes_folder, f) for f in os.listdir(resumes_folder) if allowed_file(f)]
+
+    # External AI calls share one budget; once it is spent, local fallbacks answer instead
+    budget = LatencyBudget(MATCH_LATENCY_BUDGET)
+
+    # Pre-computed at upload; only new or changed files are parsed here
+    resumes = ingest_files(paths, workers=PARSE_WORKERS, timeout=PARSE_TIMEOUT)
+
+    # Optionally warm the SHAP cache for this run in the background, so opening an explanation is a file read
+    if request.args.get("precompute_shap"):
+        shap_explainer.enqueue(paths)
+
+    # === Reuse stored results for (JD, resume) pairs already scored under this config
+    matching_mode = request.args.get("matching_mode", "exact")
+    skill_weight = float(request.args.get("skill_weight", 0.5))
+    jd_hash = file_digest(jd_path)
+    version = scoring_key(matching_mode, skill_weight)
+    cached = get_cached_matches(jd_hash, {r["content_hash"] for r in resumes.values()}, version)
+    missing = [filename for filename, resume in resumes.items() if resume["content_hash"] not in cached]
+    logging.info(f"[Match] {jd_filename}: {len(resumes) - len(missing)} cached, {len(missing)} to score")
+
+    # === Exact skill scores for the missing pairs in one sparse product
+    scores = dict(zip(missing, score_many([resume_skills(resumes[f]) for f in missing], jd_skills)))
+
+    # === Semantic mode: blend in JD-to-resume cosine from the local vector store
+    if matching_mode == "semantic" and missing:
+        try:
+            semantic = semantic_scores(jd_text, missing)
+        except ValueError as e:  # Vectors written by another embedder; blending them would be meaningless
+            logging.error(f"[Match FAIL] {e}")
+            flash(f"❌ {e}", "danger")
+            return redirect(url_for("admin_dashboard"))
+        scores = {
+            filename: (skill_weight * score + (1 - skill_weight) * semantic.get(filename, 0.0), matched)
+            for filename, (score, matched) in scores.items()
+        }
+
+    # === GPT titles for the missing pairs, plus cached pairs whose title call failed before,
+    # concurrently and rate-limited, within the budget
+    untitled = [filename for filename, resume in resumes.items()
+                if filename in scores or cached[resume["content_hash"]]["gpt_title"] is None]
+    gpt_titles = {}
+    if untitled and not budget.exhausted:
+        gpt_titles = dict(zip(untitled, suggest_job_titles_many([resume_skills(resumes[f]) for f in untitled],
+                                                                deadline=min(GPT_DEADLINE, budget.remaining()))))
+
+    stored_keys = get_result_match_keys()
+    fresh = {}
     results = []
-    for filename in os.listdir(resumes_folder):
-        if not allowed_file(filename):
-            continue
-        path = os.path.join(resumes_folder, filename)
-        text = extract_text_from_file(path)
-        skills, _ = extract_resume_data(text)
-        experience_level = classify_experience(text)
+    for filename, resume in resumes.items():
+        skills = resume_skills(resume)
+        experience_level = resume["experience_level"]
 
         # === ML Prediction: Top-3 titles with confidence
-        ml_titles = predict_job_title(text)
+        ml_titles = resume_top_titles(resume)
         ml_top = ml_titles[0][0]
         confidence = ml_titles[0][1]
 
-        # === GPT Prediction (fallback safe)
-        try:
-            gpt_title = suggest_job_titles(skills)[0]
-        except Exception as e:
-            logging.error(f"[GPT FAIL] {e}")
-            gpt_title = "❌ GPT Failed"
-
-        disagreement = "⚠️" if gpt_title != ml_top else ""
-
-        # === Matching + Gap + Feedback
-        match_score, matched_skills = calculate_match_score(skills, jd_skills)
+        if filename in scores:
+            match_score, matched_skills = scores[filename]
+            gpt_title = None
+        else:
+            hit = cached[resume["content_hash"]]
+            match_score, matched_skills, gpt_title = hit["score"], hit["matched_skills"], hit["gpt_title"]
+
+        # === GPT Prediction (errors and skipped calls are cached as a NULL title, so the
+        # score is reused and only the title is retried next run)
+        titled = False
+        if filename in scores or gpt_title is None:
+            gpt_title = gpt_titles.get(filename, ["❌ Skipped: latency budget spent"])[0]
+            if gpt_title.startswith("❌"):
+                logging.error(f"[GPT FAIL] {filename}: {gpt_title}")
+                gpt_title = None
+            else:
+                titled = True
+            if filename in scores or titled:
+                fresh[resume["content_hash"]] = (match_score, matched_skills, gpt_title)
+
+        # Without a GPT title the ML title is shown in its place, but never stored as one
+        # and never compared against itself
+        disagreement = "⚠️" if gpt_title and gpt_title != ml_top else ""
+
+        # === Gap + Feedback
         feedback = generate_feedback(match_score, matched_skills, jd_skills)
         gaps = generate_skill_gap_suggestion(jd_skills, skills)
 
-        # === Save to DB
-        insert_result(
-            name="N/A", email="N/A", score=round(match_score, 2),
-            skills=", ".join(matched_skills), filename=filename,
-            gpt_title=gpt_title, ml_title=ml_top, resume_title=ml_top
-        )
+        # === Save to DB (skipped when the stored row already holds this exact pair and title)
+        match_key = f"{jd_hash}:{resume['content_hash']}:{version}"
+        if titled or stored_keys.get(filename) != match_key:
+            insert_result(
+                name=resume["name"] or "N/A", email=resume["email"] or "N/A", score=round(match_score, 2),
+                skills=", ".join(matched_skills), filename=filename,
+                gpt_title=gpt_title or "", ml_title=ml_top, resume_title=resume["resume_title"],
+                ml_title_top3=resume["ml_title_top3"],
+                experience_years=resume["experience_years"], experience_level=experience_level,
+                match_key=match_key
+            )
 
         results.append({
             "filename": filename,
@@ -180,14 +290,89 @@ def match_all_resumes(jd_filename):
             "confidence": confidence,
             "experience_level": experience_level,
             "job_title_suggestions": ml_titles,
-            "gpt_title": gpt_title,
+            "gpt_title": gpt_title or ml_top,
+            "gpt_title_is_fallback": gpt_title is None,
             "disagreement": disagreement,
             "feedback": feedback,
             "gaps": gaps
         })
 
+    put_cached_matches(jd_hash, version, fresh)
+
     return render_template("match_result.html", results=results, jd_filename=jd_filename)
 
+# === Top-k Candidates for a JD (index over ingested resumes, no re-parsing) ===
+@app.route('/match_topk/<jd_filename>')
+@role_required('admin')
+def match_topk(jd_filename):
+    jd_path = os.path.join(app.config['UPLOAD_FOLDER_JD'], jd_filename)
+    if not os.path.exists(jd_path):
+        return jsonify(error=f"Unknown JD: {jd_filename}"), 404
+    jd_text = extract_text_from_file(jd_path, max_pages=None, workers=PARSE_WORKERS)
+    jd_skills = extract_jd_skills(jd_text)
+
+    k = min(max(request.args.get("k", DEFAULT_K, type=int), 1), MAX_K)
+    try:
+        matches = match_top_k(jd_text, jd_skills, k=k,
+                              mode=request.args.get("matching_mode", "exact"),
+                              skill_weight=request.args.get("skill_weight", 0.5, type=float),
+                              nprobe=request.args.get("nprobe", type=int))
+    except ValueError as e:  # Resume vectors from another embedder
+        logging.error(f"[Top-k FAIL] {e}")
+        return jsonify(error=str(e)), 409
+
+    resumes = get_resumes([match["filename"] for match in matches])
+    for match in matches:
+        resume = resumes.get(match["filename"], {})
+        match.update(name=resume.get("name"), email=resume.get("email"),
+                     ml_title=resume.get("ml_title"), experience_level=resume.get("experience_level"))
+    return jsonify(jd_filename=jd_filename, jd_skills=jd_skills, k=k, results=matches)
+
+# === Batch Match: Several JDs × All Resumes in One Pass ===
+@app.route('/match_batch')
+@role_required('admin')
+def match_batch():
+    jd_folder = app.config['UPLOAD_FOLDER_JD']
+    resumes_folder = app.config['UPLOAD_FOLDER_RESUMES']
+    jd_files = request.args.getlist("jd") or [f for f in sorted(os.listdir(jd_folder)) if allowed_file(f)]
+    missing = [f for f in jd_files if not os.path.exists(os.path.join(jd_folder, f))]
+    if missing or not jd_files:
+        flash(f"❌ Unknown job descriptions: {', '.join(missing) or 'none selected'}", "danger")
+        return redirect(url_for("admin_dashboard"))
+
+    try:
+        result = match_jds([os.path.join(jd_folder, f) for f in jd_files],
+                           [os.path.join(resumes_folder, f) for f in os.listdir(resumes_folder) if allowed_file(f)],
+                           workers=PARSE_WORKERS, timeout=PARSE_TIMEOUT)
+    except ValueError as e:  # A JD that could not be read
+        logging.error(f"[Batch Match FAIL] {e}")
+        flash(f"❌ {e}", "danger")
+        return redirect(url_for("admin_dashboard"))
+
+    export = request.args.get("format")
+    if export == "csv":
+        buffer = io.StringIO()
+        result.to_csv(buffer)
+        response = make_response(buffer.getvalue())
+        response.headers['Content-Disposition'] = 'attachment; filename=match_matrix.csv'
+        response.headers['Content-Type'] = 'text/csv'
+        return response
+    if export == "parquet":
+        buffer = io.BytesIO()
+        result.to_parquet(buffer)
+        buffer.seek(0)
+        return send_file(buffer, download_name="match_matrix.parquet", as_attachment=True)
+
+    view = request.args.get("view")
+    if view not in result.jd_names:
+        view = result.jd_names[0]
+    return render_template("batch_results.html",
+                           jd_names=result.jd_names,
+                           view=view,
+                           jd_skills=result.jd_skills[result.jd_names.index(view)],
+                           results=result.ranking(view),
+                           n_resumes=len(result.filenames))
+
 # === Admin Dashboard: View Candidates ===
 @app.route('/admin')
 @role_required('admin')
@@ -199,14 +384,30 @@ def admin_dashboard():
     skill_weight = float(request.args.get("skill_weight", 0.6))
     exp_weight = float(request.args.get("exp_weight", 0.4))
     starred_only = request.args.get("starred_only")
-    session["matching_mode"] = mode
+    experience = request.args.get("experience", "")
+    search = request.args.get("search", "").strip().lower()
+    min_score = float(request.args.get("min_score", 0))
+    max_score = float(request.args.get("max_score", 100))
+    required_skills = [s.strip().lower() for s in request.args.get("skills", "").split(",") if s.strip()]
 
     rows = get_all_results()
+    if required_skills:  # "python, sql" = has python AND sql, answered by the skill index
+        with_skills = skill_index.filenames_with_all(required_skills)
+        rows = [row for row in rows if row[4] in with_skills]
+    resumes = get_resumes()
+    # Rows not ingested yet (e.g. from before ingestion existed) get titles predicted in one batch
+    not_ingested = [row[4] for row in rows if not resume_top_titles(resumes.get(row[4], {}))]
+    predicted_titles = dict(zip(not_ingested, predict_job_title_many(
+        [extract_text_from_file(os.path.join(app.config['UPLOAD_FOLDER_RESUMES'], f)) for f in not_ingested]
+    )))
+    budget = LatencyBudget(MATCH_LATENCY_BUDGET)
+    if mode == "semantic":
+        warm_embeddings([" ".join(row[3].split(", ")) for row in rows], budget=budget)
     results = []
     for row in rows:
         skills = row[3].split(", ")
         if mode == "semantic":
-            semantic_score = get_bert_similarity(" ".join(skills), " ".join(skills))
+            semantic_score = get_bert_similarity(" ".join(skills), " ".join(skills), budget=budget)
             skill_score, _ = calculate_match_score(skills, skills)
             score = (skill_weight * skill_score) + ((1 - skill_weight) * semantic_score)
         elif mode == "synonym":
@@ -214,8 +415,7 @@ def admin_dashboard():
         else:
             score, _ = calculate_match_score(skills, skills)
 
-        text = extract_text_from_file(os.path.join(app.config['UPLOAD_FOLDER_RESUMES'], row[4]))
-        ml_titles = predict_job_title(text)
+        ml_titles = resume_top_titles(resumes.get(row[4], {})) or predicted_titles[row[4]]
 
         result = {
             "name": row[0],
@@ -226,7 +426,7 @@ def admin_dashboard():
             "notes": row[5],
             "rating": row[6],
             "starred": row[7],
-            "experience_level": classify_experience(" ".join(skills)),
+            "experience_level": row[14] or "Unknown",
             "feedback": generate_feedback(score, skills, []),
             "ml_titles": ml_titles,
             "gpt_title": row[8] if row[8] else "Not found"
@@ -243,20 +443,32 @@ def admin_dashboard():
 
         results.append(result)
 
-        return render_template("admin.html",
-                       results=results,
-                       matching_mode=mode,      # ✅ Pass to HTML
-                       skill_weight=skill_weight,
-                       exp_weight=exp_weight)
+    return render_template("admin.html",
+                           results=results,
+                           matching_mode=mode,      # ✅ Pass to HTML
+                           skill_weight=skill_weight,
+                           exp_weight=exp_weight)
 
 
 # === SHAP Explanation per Resume ===
 @app.route("/shap/<filename>")
 @login_required
 def shap_chart(filename):
-    from ml_model.job_title_predictor import generate_shap_chart
-    generate_shap_chart(filename)
-    return render_template("shap_view.html", shap_path=f"shap_{filename}.png", filename=filename)
+    # Served from the (resume hash, model version) cache; computed once on a miss
+    try:
+        explanation = shap_explainer.get_explanation(os.path.join(app.config['UPLOAD_FOLDER_RESUMES'], filename))
+    except FileNotFoundError:
+        abort(404)
+    return render_template("shap_view.html", shap_path=explanation["png"], filename=filename,
+                           explanation=explanation)
+
+@app.route("/shap/<filename>/json")
+@login_required
+def shap_json(filename):
+    try:
+        return jsonify(shap_explainer.get_explanation(os.path.join(app.config['UPLOAD_FOLDER_RESUMES'], filename)))
+    except FileNotFoundError:
+        return jsonify(error=f"Unknown resume: {filename}"), 404
 
 # === Analytics Dashboard: Visual Charts ===
 @app.route('/analytics')
@@ -330,8 +542,9 @@ def export_csv():
 @login_required
 def export_pdf(filename):
     resume_path = os.path.join(app.config['UPLOAD_FOLDER_RESUMES'], filename)
-    resume_text = extract_text_from_file(resume_path)
+    resume_text = extract_text_from_file(resume_path, max_pages=None, workers=PARSE_WORKERS)
     html = render_template("pdf_template.html", filename=filename, text=resume_text)
+    from xhtml2pdf import pisa
     result = io.BytesIO()
     pisa.CreatePDF(io.BytesIO(html.encode("utf-8")), dest=result)
     result.seek(0)
@@ -345,16 +558,17 @@ def cluster():
     resume_texts = []
     filenames = []
 
-    for fname in os.listdir(folder):
-        full_path = os.path.join(folder, fname)
-        try:
-            text = extract_text_from_file(full_path)
-            resume_texts.append(text)
-            filenames.append(fname)
-        except:
+    paths = [os.path.join(folder, fname) for fname in os.listdir(folder)]
+    for path, text, error in extract_texts_parallel(paths, workers=PARSE_WORKERS, timeout=PARSE_TIMEOUT,
+                                                    max_pages=MAX_PDF_PAGES):
+        if error:
+            logging.error(f"[Parse FAIL] {os.path.basename(path)}: {error}")
             continue
+        resume_texts.append(text)
+        filenames.append(os.path.basename(path))
 
-    cluster_labels = cluster_resumes(resume_texts)
+    # TF-IDF rows come from the shared feature store, so already-seen resumes are not re-vectorized
+    cluster_labels = cluster_resumes(resume_texts, features=featurize(resume_texts))
     summary = {}
     cluster_results = []
 
@@ -411,6 +625,12 @@ def test_insert():
     output += "</ul>"
     return output
 
+# === Health Check ===
+@app.route("/healthz")
+def healthz():
+    return jsonify(status="ok", resources=resources.status(), circuits=circuit_breaker.status(),
+                   models=model_registry.get_registry().status())
+
 # === Error Handlers ===
 @app.errorhandler(404)
 def not_found(e):
@@ -423,5 +643,6 @@ def server_error(e):
 # === Entrypoint ===
 if __name__ == "__main__":
     init_db()
+    skill_index.index_missing()
     webbrowser.open("http://127.0.0.1:5000/")
     app.run(debug=True)
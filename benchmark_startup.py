@@ -0,0 +1,79 @@
+"""
+Cold-start benchmark: how long `import app` takes, which modules dominate it,
+and how long each lazily loaded resource takes to warm up.
+
+Usage:
+    python benchmark_startup.py [--top 20] [--skip-warmup]
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+WARMUP_SNIPPET = """
+import json, time
+start = time.perf_counter()
+import app
+import_seconds = time.perf_counter() - start
+from utils import resources
+print(json.dumps({"import": import_seconds, "resources": resources.warm_up()}))
+"""
+
+
+def measure_imports(module="app"):
+    """
+    Run `python -X importtime -c "import <module>"` in a fresh interpreter.
+    Returns a list of (module, self_us, cumulative_us).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"❌ import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure_warmup():
+    proc = subprocess.run(
+        [sys.executable, "-c", WARMUP_SNIPPET],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"❌ Warm-up failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=20, help="Number of modules to list")
+    parser.add_argument("--skip-warmup", action="store_true", help="Only measure imports")
+    args = parser.parse_args()
+
+    rows = measure_imports()
+    total_us = max(cumulative for _, _, cumulative in rows)
+    # Depth 1 = modules imported directly by app.py (names are indented two spaces per level)
+    direct = [row for row in rows if len(row[0]) - len(row[0].lstrip()) == 2]
+
+    print(f"⏱️  import app: {total_us / 1e6:.2f}s\n")
+    print(f"{'cumulative (s)':>14}  {'self (s)':>9}  module imported by app")
+    for name, self_us, cumulative_us in sorted(direct, key=lambda r: r[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1e6:>14.3f}  {self_us / 1e6:>9.3f}  {name.strip()}")
+
+    if not args.skip_warmup:
+        warmup = measure_warmup()
+        print(f"\n🔥 Warm-up (after a {warmup['import']:.2f}s import):")
+        for name, seconds in sorted(warmup["resources"].items(), key=lambda kv: kv[1], reverse=True):
+            print(f"{seconds:>14.3f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,3 +10,13 @@ UPLOAD_FOLDER_RESUMES = os.path.join("uploads", "resumes")
 UPLOAD_FOLDER_JD = os.path.join("uploads", "job_descriptions")
 ALLOWED_EXTENSIONS = {"pdf", "docx"}
 MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5 MB
+
+# Batch text extraction
+PARSE_WORKERS = os.cpu_count() or 1
+PARSE_TIMEOUT = 30  # Seconds before a stuck file's worker is killed
+
+# Load spaCy/ML models in a background thread at startup instead of on first request
+WARM_UP_ON_START = os.getenv("WARM_UP_ON_START", "0") == "1"
+
+# Seconds one request may spend on external AI calls (OpenAI, Hugging Face) before local fallbacks take over
+MATCH_LATENCY_BUDGET = float(os.getenv("MATCH_LATENCY_BUDGET", "20"))
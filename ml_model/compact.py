@@ -0,0 +1,342 @@
+import os
+import re
+import sys
+import json
+import math
+import time
+import argparse
+import unicodedata
+from collections import Counter
+from typing import Dict, List
+
+import numpy as np
+
+COMPACT_DIR = os.path.join("ml_model", "compact")
+BUNDLE_FORMAT = 1
+
+
+# ==============================
+# 📦 Export: (vectorizer, model, label encoder) -> compact bundle
+# ==============================
+# A bundle is a directory of plain .npy arrays (float32/int32, loadable with
+# mmap_mode="r") plus two small JSON files. Scoring it needs only NumPy: no
+# scikit-learn or xgboost import in the serving process.
+#
+#   meta.json        format, model kind, objective, TF-IDF settings, classes
+#   vocabulary.json  terms in column order (vocabulary_ only; the pickled
+#                    vectorizer's stop_words_ set of cut terms, if any, is dropped)
+#   idf.npy          float32 idf weights
+#   linear:  coef.npy (classes x features), intercept.npy
+#   trees:   node_feature / node_threshold / node_yes / node_no / node_missing /
+#            node_value (flattened nodes of all trees, global child indices),
+#            tree_root, tree_class, base_margin
+
+def _vectorizer_settings(vectorizer) -> Dict:
+    params = vectorizer.get_params()
+    if params["analyzer"] != "word" or params["tokenizer"] is not None or params["preprocessor"] is not None:
+        raise ValueError("Only the built-in word analyzer can be exported")
+    if params["strip_accents"] not in (None, "ascii", "unicode"):
+        raise ValueError("Custom strip_accents callables cannot be exported")
+    stop_words = vectorizer.get_stop_words()
+    return {
+        "lowercase": params["lowercase"],
+        "strip_accents": params["strip_accents"],
+        "token_pattern": params["token_pattern"],
+        "stop_words": sorted(stop_words) if stop_words else [],
+        "ngram_range": list(params["ngram_range"]),
+        "binary": params["binary"],
+        "sublinear_tf": params["sublinear_tf"],
+        "use_idf": params["use_idf"],
+        "norm": params["norm"],
+    }
+
+
+def _export_linear(model) -> Dict[str, np.ndarray]:
+    return {
+        "coef": np.asarray(model.coef_, dtype=np.float32),
+        "intercept": np.asarray(model.intercept_, dtype=np.float32),
+    }
+
+
+def _export_trees(model, n_features: int) -> Dict[str, np.ndarray]:
+    from scipy import sparse
+    import xgboost
+
+    booster = model.get_booster()
+    n_classes = int(getattr(model, "n_classes_", 2))
+    groups = n_classes if n_classes > 2 else 1
+    feature, threshold, yes, no, missing, value, roots, tree_class = [], [], [], [], [], [], [], []
+
+    for t, dump in enumerate(booster.get_dump(dump_format="json")):
+        nodes = {}
+        stack = [json.loads(dump)]
+        while stack:
+            node = stack.pop()
+            nodes[node["nodeid"]] = node
+            stack.extend(node.get("children", []))
+        offset = len(feature)
+        roots.append(offset)
+        tree_class.append(t % groups)
+        for node_id in range(max(nodes) + 1):
+            node = nodes.get(node_id)
+            if node is None or "leaf" in node:
+                feature.append(-1)
+                threshold.append(0.0)
+                yes.append(-1), no.append(-1), missing.append(-1)
+                value.append(node["leaf"] if node else 0.0)
+            else:
+                feature.append(int(node["split"].lstrip("f")))
+                threshold.append(node["split_condition"])
+                yes.append(offset + node["yes"]), no.append(offset + node["no"])
+                missing.append(offset + node["missing"])
+                value.append(0.0)
+
+    arrays = {
+        "node_feature": np.asarray(feature, dtype=np.int32),
+        "node_threshold": np.asarray(threshold, dtype=np.float32),
+        "node_yes": np.asarray(yes, dtype=np.int32),
+        "node_no": np.asarray(no, dtype=np.int32),
+        "node_missing": np.asarray(missing, dtype=np.int32),
+        "node_value": np.asarray(value, dtype=np.float32),
+        "tree_root": np.asarray(roots, dtype=np.int32),
+        "tree_class": np.asarray(tree_class, dtype=np.int32),
+    }
+    # The intercept (base_score, possibly per class) is whatever margin an all-missing row gets beyond its leaves
+    empty = xgboost.DMatrix(sparse.csr_matrix((1, n_features), dtype=np.float32))
+    margin = np.asarray(booster.predict(empty, output_margin=True), dtype=np.float64).reshape(groups)
+    leaves = _tree_margins(arrays, np.zeros((1, n_features), dtype=np.float32), groups)[0]
+    arrays["base_margin"] = (margin - leaves).astype(np.float32)
+    return arrays
+
+
+def export(artifact, out_dir: str) -> str:
+    """
+    Write a compact bundle for a (vectorizer, model, label_encoder) tuple.
+    """
+    vectorizer, model, label_encoder = artifact
+    n_features = len(vectorizer.vocabulary_)
+    if hasattr(model, "get_booster"):
+        kind, objective = "trees", model.get_params().get("objective") or ""
+        arrays = _export_trees(model, n_features)
+    elif hasattr(model, "coef_"):
+        kind = "linear"
+        objective = "ovr" if getattr(model, "multi_class", "auto") == "ovr" else "multinomial"
+        arrays = _export_linear(model)
+    else:
+        raise ValueError(f"Cannot export a {type(model).__name__}")
+
+    os.makedirs(out_dir, exist_ok=True)
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    idf = getattr(vectorizer, "idf_", None)
+    arrays["idf"] = np.asarray(idf if idf is not None else np.ones(n_features), dtype=np.float32)
+    for name, array in arrays.items():
+        np.save(os.path.join(out_dir, f"{name}.npy"), array)
+    with open(os.path.join(out_dir, "vocabulary.json"), "w", encoding="utf-8") as f:
+        json.dump(terms, f)
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "format": BUNDLE_FORMAT,
+            "kind": kind,
+            "objective": objective,
+            "tfidf": _vectorizer_settings(vectorizer),
+            "classes": [str(c) for c in label_encoder.classes_],
+        }, f)
+    return out_dir
+
+
+# ==============================
+# ⚡ NumPy-Only Scoring
+# ==============================
+
+def _tree_margins(arrays: Dict[str, np.ndarray], X: np.ndarray, groups: int) -> np.ndarray:
+    """
+    Sum of leaf values per (row, class group). Zero counts as missing, as it
+    does for the sparse TF-IDF rows the model was trained and served on.
+    """
+    n_rows = X.shape[0]
+    roots = np.asarray(arrays["tree_root"])
+    feature, threshold = np.asarray(arrays["node_feature"]), np.asarray(arrays["node_threshold"])
+    yes, no, missing = np.asarray(arrays["node_yes"]), np.asarray(arrays["node_no"]), np.asarray(arrays["node_missing"])
+
+    node = np.broadcast_to(roots, (n_rows, len(roots))).copy()
+    rows = np.arange(n_rows)[:, None]
+    while True:
+        split = feature[node]
+        active = split >= 0
+        if not active.any():
+            break
+        x = X[rows, np.maximum(split, 0)]
+        step = np.where(x == 0, missing[node], np.where(x < threshold[node], yes[node], no[node]))
+        node = np.where(active, step, node)
+
+    leaf_values = np.asarray(arrays["node_value"])[node].astype(np.float64)
+    margins = np.zeros((n_rows, groups))
+    np.add.at(margins.T, np.asarray(arrays["tree_class"]), leaf_values.T)
+    return margins
+
+
+def _softmax(margins: np.ndarray) -> np.ndarray:
+    shifted = np.exp(margins - margins.max(axis=1, keepdims=True))
+    return shifted / shifted.sum(axis=1, keepdims=True)
+
+
+def _sigmoid(margins: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-margins))
+
+
+class CompactModel:
+    """
+    A loaded bundle. predict_proba(texts) reproduces
+    model.predict_proba(vectorizer.transform(texts)) of the exported pickle.
+    """
+
+    def __init__(self, bundle_dir: str, mmap: bool = True):
+        with open(os.path.join(bundle_dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta["format"] != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported bundle format {self.meta['format']}")
+        with open(os.path.join(bundle_dir, "vocabulary.json"), encoding="utf-8") as f:
+            self.vocabulary = {term: i for i, term in enumerate(json.load(f))}
+        mode = "r" if mmap else None
+        self.arrays = {name[:-4]: np.load(os.path.join(bundle_dir, name), mmap_mode=mode)
+                       for name in os.listdir(bundle_dir) if name.endswith(".npy")}
+        self.classes = np.asarray(self.meta["classes"], dtype=object)
+        tfidf = self.meta["tfidf"]
+        self._token_re = re.compile(tfidf["token_pattern"])
+        self._stop_words = frozenset(tfidf["stop_words"])
+
+    # --- Featurization (TfidfVectorizer.transform, word analyzer) ---
+    def _terms(self, text: str) -> List[str]:
+        tfidf = self.meta["tfidf"]
+        if tfidf["lowercase"]:
+            text = text.lower()
+        if tfidf["strip_accents"] == "unicode":
+            text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+        elif tfidf["strip_accents"] == "ascii":
+            text = unicodedata.normalize("NFKD", text).encode("ASCII", "ignore").decode("ASCII")
+        tokens = [t for t in self._token_re.findall(text) if t not in self._stop_words]
+        low, high = tfidf["ngram_range"]
+        if (low, high) == (1, 1):
+            return tokens
+        terms = tokens[:] if low == 1 else []
+        for n in range(max(low, 2), high + 1):
+            terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def transform(self, texts: List[str]) -> np.ndarray:
+        tfidf = self.meta["tfidf"]
+        X = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float64)
+        for row, text in enumerate(texts):
+            counts = Counter(self.vocabulary[t] for t in self._terms(text) if t in self.vocabulary)
+            for column, count in counts.items():
+                if tfidf["binary"]:
+                    count = 1
+                X[row, column] = 1 + math.log(count) if tfidf["sublinear_tf"] else count
+        if tfidf["use_idf"]:
+            X *= self.arrays["idf"].astype(np.float64)
+        if tfidf["norm"] == "l2":
+            norms = np.sqrt((X * X).sum(axis=1, keepdims=True))
+        elif tfidf["norm"] == "l1":
+            norms = np.abs(X).sum(axis=1, keepdims=True)
+        else:
+            return X
+        return np.divide(X, norms, out=X, where=norms > 0)
+
+    # --- Scoring ---
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        X = self.transform(list(texts))
+        objective = self.meta["objective"]
+        if self.meta["kind"] == "linear":
+            margins = X @ self.arrays["coef"].T.astype(np.float64) + self.arrays["intercept"]
+            if margins.shape[1] == 1:
+                p = _sigmoid(margins[:, 0])
+                return np.column_stack([1 - p, p])
+            if objective == "ovr":
+                p = _sigmoid(margins)
+                return p / p.sum(axis=1, keepdims=True)
+            return _softmax(margins)
+
+        groups = len(self.arrays["base_margin"])
+        margins = _tree_margins(self.arrays, X.astype(np.float32), groups) + self.arrays["base_margin"]
+        if objective.startswith("multi:"):
+            return _softmax(margins)
+        p = _sigmoid(margins[:, 0])
+        return np.column_stack([1 - p, p])
+
+    def predict_top_k(self, texts: List[str], k: int = 3):
+        """
+        [(label, percent)] per text, best first; same shape as predict_job_title_many.
+        """
+        probs = self.predict_proba(texts)
+        top = np.argsort(-probs, axis=1, kind="stable")[:, :k]
+        return [[(self.classes[i], round(float(probs[row, i]) * 100, 2)) for i in top[row]]
+                for row in range(len(top))]
+
+
+# ==============================
+# 🏁 Benchmark: joblib path vs compact bundle
+# ==============================
+
+_BENCH_CHILD = r'''
+import sys, time, json, resource, random
+path, pickle_path, bundle_dir, n_texts = sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4])
+started = time.perf_counter()
+if path == "joblib":
+    import joblib
+    vectorizer, model, _ = joblib.load(pickle_path)
+    predict = lambda texts: model.predict_proba(vectorizer.transform(texts))
+    words = list(vectorizer.vocabulary_)
+else:
+    from ml_model.compact import CompactModel
+    compact = CompactModel(bundle_dir)
+    predict = compact.predict_proba
+    words = list(compact.vocabulary)
+load_s = time.perf_counter() - started
+random.seed(0)
+texts = [" ".join(random.choice(words) for _ in range(200)) for _ in range(n_texts)]
+predict(texts[:1])
+started = time.perf_counter()
+for text in texts[:50]:
+    predict([text])
+single_ms = (time.perf_counter() - started) / min(50, n_texts) * 1000
+started = time.perf_counter()
+predict(texts)
+batch_ms = (time.perf_counter() - started) * 1000
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"load_s": load_s, "single_ms": single_ms, "batch_ms": batch_ms, "max_rss_mb": rss_kb / 1024}))
+'''
+
+
+def benchmark(pickle_path: str, bundle_dir: str, n_texts: int = 500) -> Dict[str, Dict]:
+    """
+    Load time, per-text and batch latency, and peak RSS of each path, each in a fresh interpreter.
+    """
+    import subprocess
+
+    results = {}
+    for path in ("joblib", "compact"):
+        output = subprocess.run([sys.executable, "-c", _BENCH_CHILD, path, pickle_path, bundle_dir, str(n_texts)],
+                                check=True, capture_output=True, text=True).stdout
+        results[path] = json.loads(output.strip().splitlines()[-1])
+    return results
+
+
+if __name__ == "__main__":
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Export and benchmark NumPy-only inference bundles.")
+    parser.add_argument("command", choices=["export", "bench"])
+    parser.add_argument("pickle", help="(vectorizer, model, label_encoder) joblib pickle")
+    parser.add_argument("--out", help=f"Bundle directory (default: {COMPACT_DIR}/<pickle name>)")
+    parser.add_argument("--texts", type=int, default=500, help="Batch size for the benchmark")
+    args = parser.parse_args()
+
+    out_dir = args.out or os.path.join(COMPACT_DIR, os.path.splitext(os.path.basename(args.pickle))[0])
+    if args.command == "export":
+        export(joblib.load(args.pickle), out_dir)
+        size = sum(os.path.getsize(os.path.join(out_dir, f)) for f in os.listdir(out_dir))
+        print(f"✅ Exported {args.pickle} → {out_dir} ({size / 1024:.0f} KB)")
+    else:
+        for path, stats in benchmark(args.pickle, out_dir, args.texts).items():
+            print(f"{path:>8}: load {stats['load_s']:.2f}s | 1 text {stats['single_ms']:.2f} ms | "
+                  f"{args.texts} texts {stats['batch_ms']:.1f} ms | peak RSS {stats['max_rss_mb']:.0f} MB")
@@ -0,0 +1,319 @@
+import os
+import time
+import uuid
+import pickle
+import shutil
+import hashlib
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+FEATURE_DIR = os.getenv("FEATURE_STORE_DIR", os.path.join("database", "features"))
+FEATURE_MAX_SHARDS = 32          # Merge a vectorizer's shards into one past this many files
+FEATURE_MAX_VERSIONS = 4         # Vectorizer versions indexed in memory; the least recently used is dropped
+FEATURE_MAX_ROWS = 50_000        # TF-IDF rows held in memory per process, across all shards
+FEATURE_SHARD_ROWS = 4096        # Compaction merges small shards into files of this many rows
+FEATURE_PRUNE_AGE = 3600         # Seconds a stale version's directory is left for processes not yet reloaded
+
+
+# ==============================
+# 🧮 Shared TF-IDF Feature Store
+# ==============================
+# One sparse row per (document hash, vectorizer version), computed once and
+# shared by prediction, SHAP and clustering. Rows are persisted as CSR shards,
+# database/features/<vectorizer version>/<shard>.npz, each holding the rows of
+# one batch of newly seen documents plus their keys. Shards are write-once;
+# readers pick up other processes' shards by watching the directory.
+# Directories of vectorizers no model serves any more are removed by prune()
+# (python -m ml_model.feature_store).
+
+_versions = weakref.WeakKeyDictionary()
+
+
+def vectorizer_version(vectorizer) -> str:
+    """
+    Fingerprint of a fitted vectorizer: its parameters, vocabulary and idf weights.
+    Two pickles of the same fitted vectorizer share a version, and so share rows.
+    """
+    try:
+        return _versions[vectorizer]
+    except KeyError:
+        pass
+    digest = hashlib.sha256()
+    params = vectorizer.get_params()
+    digest.update(repr(sorted((key, repr(value)) for key, value in params.items())).encode("utf-8"))
+    digest.update(pickle.dumps(sorted(vectorizer.vocabulary_.items())))
+    idf = getattr(vectorizer, "idf_", None)
+    if idf is not None:
+        digest.update(np.ascontiguousarray(idf, dtype=np.float64).tobytes())
+    version = digest.hexdigest()[:16]
+    _versions[vectorizer] = version
+    return version
+
+
+def document_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class FeatureStore:
+    """
+    Every known row is indexed (key -> shard, row), but only shard matrices
+    used recently stay in memory: at most max_rows rows in all, least
+    recently used shards first out, re-read from disk when needed again.
+    """
+
+    def __init__(self, root: str = FEATURE_DIR, max_shards: int = FEATURE_MAX_SHARDS,
+                 max_versions: int = FEATURE_MAX_VERSIONS, max_rows: int = FEATURE_MAX_ROWS,
+                 shard_rows: int = FEATURE_SHARD_ROWS):
+        self.root = root
+        self.max_shards = max_shards
+        self.max_versions = max_versions
+        self.max_rows = max_rows
+        self.shard_rows = shard_rows
+        self._lock = threading.Lock()
+        self._dir_versions: Dict[str, int] = {}
+        self._shards: Dict[str, Dict[str, int]] = {}              # version -> {shard: rows}
+        self._index: Dict[str, Dict[str, Tuple[str, int]]] = {}
+        self._resident: "OrderedDict[Tuple[str, str], sparse.csr_matrix]" = OrderedDict()
+        self._resident_rows = 0
+
+    # --- Reading ---
+    def transform(self, vectorizer, texts: List[str]) -> sparse.csr_matrix:
+        """
+        Same as vectorizer.transform(texts), computing only rows not stored yet (once per distinct text).
+        """
+        texts = list(texts)
+        version = vectorizer_version(vectorizer)
+        keys = [document_key(text) for text in texts]
+        with self._lock:
+            for attempt in range(2):
+                self._refresh(version)
+                self._evict(keep=version)
+                index = self._index[version]
+                missing = {}
+                for key, text in zip(keys, texts):
+                    if key not in index:
+                        missing.setdefault(key, text)
+                if missing:
+                    self._append(version, list(missing), vectorizer.transform(list(missing.values())))
+                try:
+                    return self._gather(version, keys, len(vectorizer.vocabulary_))
+                except FileNotFoundError:
+                    if attempt:
+                        raise
+                    self._dir_versions.pop(version, None)   # Compacted away by another process: look again
+
+    def _gather(self, version: str, keys: List[str], n_features: int) -> sparse.csr_matrix:
+        if not keys:
+            return sparse.csr_matrix((0, n_features), dtype=np.float64)
+        index = self._index[version]
+        by_shard: Dict[str, List[int]] = {}
+        positions: Dict[str, List[int]] = {}
+        for position, key in enumerate(keys):
+            shard, row = index[key]
+            by_shard.setdefault(shard, []).append(row)
+            positions.setdefault(shard, []).append(position)
+        blocks = [self._matrix(version, shard)[rows] for shard, rows in by_shard.items()]
+        order = np.concatenate([positions[shard] for shard in by_shard])
+        stacked = sparse.vstack(blocks, format="csr")
+        # stacked row i belongs at position order[i]
+        return stacked[np.argsort(order, kind="stable")]
+
+    def _matrix(self, version: str, shard: str) -> sparse.csr_matrix:
+        """
+        A shard's rows, from memory or read back from disk.
+        """
+        matrix = self._resident.get((version, shard))
+        if matrix is None:
+            matrix = _load_matrix(os.path.join(self.root, version, shard))
+            self._keep(version, shard, matrix)
+        else:
+            self._resident.move_to_end((version, shard))
+        return matrix
+
+    def _keep(self, version: str, shard: str, matrix: sparse.csr_matrix) -> None:
+        """
+        Hold a shard in memory, dropping least recently used ones past max_rows (never the newest).
+        """
+        self._resident[(version, shard)] = matrix
+        self._resident_rows += matrix.shape[0]
+        while self._resident_rows > self.max_rows and len(self._resident) > 1:
+            _, dropped = self._resident.popitem(last=False)
+            self._resident_rows -= dropped.shape[0]
+
+    def _forget(self, version: str, shard: str) -> None:
+        dropped = self._resident.pop((version, shard), None)
+        if dropped is not None:
+            self._resident_rows -= dropped.shape[0]
+
+    def _refresh(self, version: str) -> None:
+        """
+        Index shards written since the last look (by this or another process).
+        """
+        directory = os.path.join(self.root, version)
+        self._shards.setdefault(version, {})
+        self._index.setdefault(version, {})
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if self._dir_versions.get(version) == mtime:
+            return
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".npz"))
+        shards, index = self._shards[version], self._index[version]
+        for stale in set(shards) - set(names):   # Merged away by a compaction
+            del shards[stale]
+            self._forget(version, stale)
+        for name in names:
+            if name in shards:
+                continue
+            try:
+                keys = _load_keys(os.path.join(directory, name))
+            except FileNotFoundError:
+                continue
+            shards[name] = len(keys)
+            index.update((key, (name, row)) for row, key in enumerate(keys))
+        self._index[version] = {key: loc for key, loc in index.items() if loc[0] in shards}
+        self._dir_versions[version] = mtime
+        self._compact(version)   # Other processes' appends count toward the bound too
+
+    def _evict(self, keep: str) -> None:
+        """
+        Mark `keep` as most recently used and drop the least recently used versions past max_versions.
+        Dropped versions are read back from disk if they are used again.
+        """
+        self._shards[keep] = self._shards.pop(keep)
+        while len(self._shards) > self.max_versions:
+            self._drop_version(next(iter(self._shards)))
+
+    def _drop_version(self, version: str) -> None:
+        for shard in self._shards.pop(version, {}):
+            self._forget(version, shard)
+        self._index.pop(version, None)
+        self._dir_versions.pop(version, None)
+
+    # --- Writing ---
+    def _append(self, version: str, keys: List[str], matrix: sparse.csr_matrix) -> None:
+        directory = os.path.join(self.root, version)
+        os.makedirs(directory, exist_ok=True)
+        name = _save_shard(directory, keys, matrix)
+        self._shards[version][name] = len(keys)
+        self._index[version].update((key, (name, row)) for row, key in enumerate(keys))
+        self._keep(version, name, matrix.tocsr())
+        self._compact(version)
+
+    def _compact(self, version: str) -> None:
+        """
+        Once more than max_shards shards hold fewer than shard_rows rows, merge
+        those into shards of shard_rows rows, so no single file (or read) grows with the corpus.
+        """
+        shards, index = self._shards[version], self._index[version]
+        small = {name for name, rows in shards.items() if rows < self.shard_rows}
+        if len(small) <= self.max_shards:
+            return
+        directory = os.path.join(self.root, version)
+        keys = [key for key, (name, _) in index.items() if name in small]
+        for start in range(0, len(keys), self.shard_rows):
+            chunk = keys[start:start + self.shard_rows]
+            merged = self._gather(version, chunk, 0)
+            name = _save_shard(directory, chunk, merged)
+            shards[name] = len(chunk)
+            index.update((key, (name, row)) for row, key in enumerate(chunk))
+            self._keep(version, name, merged)
+        for stale in small:
+            try:
+                os.remove(os.path.join(directory, stale))
+            except FileNotFoundError:
+                pass
+            del shards[stale]
+            self._forget(version, stale)
+
+    def prune(self, keep: Iterable[str], min_age: float = FEATURE_PRUNE_AGE) -> List[str]:
+        """
+        Delete the rows of every vectorizer version not in `keep` whose directory
+        has not changed for min_age seconds. Returns the removed versions.
+        """
+        keep = set(keep)
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        removed = []
+        with self._lock:
+            for version in names:
+                directory = os.path.join(self.root, version)
+                if version in keep or not os.path.isdir(directory):
+                    continue
+                if time.time() - os.stat(directory).st_mtime < min_age:
+                    continue
+                shutil.rmtree(directory, ignore_errors=True)
+                self._drop_version(version)
+                removed.append(version)
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            shutil.rmtree(self.root, ignore_errors=True)
+            self._dir_versions.clear()
+            self._shards.clear()
+            self._index.clear()
+            self._resident.clear()
+            self._resident_rows = 0
+
+
+def _save_shard(directory: str, keys: List[str], matrix) -> str:
+    matrix = sparse.csr_matrix(matrix)
+    name = f"{time.time_ns():020d}-{os.getpid()}-{uuid.uuid4().hex[:8]}.npz"
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez(f, data=matrix.data, indices=matrix.indices, indptr=matrix.indptr,
+                 shape=np.array(matrix.shape), keys=np.array(keys))
+    os.replace(tmp_path, os.path.join(directory, name))
+    return name
+
+
+def _load_keys(path: str) -> List[str]:
+    with np.load(path) as data:   # Reads only the keys array of the archive
+        return data["keys"].tolist()
+
+
+def _load_matrix(path: str) -> sparse.csr_matrix:
+    with np.load(path) as data:
+        return sparse.csr_matrix((data["data"], data["indices"], data["indptr"]), shape=tuple(data["shape"]))
+
+
+_store: Optional[FeatureStore] = None
+
+
+def get_store() -> FeatureStore:
+    global _store
+    if _store is None:
+        _store = FeatureStore()
+    return _store
+
+
+def transform(vectorizer, texts: List[str]) -> sparse.csr_matrix:
+    """
+    vectorizer.transform(texts) through the shared feature store.
+    """
+    return get_store().transform(vectorizer, texts)
+
+
+def prune(vectorizers, min_age: float = FEATURE_PRUNE_AGE) -> List[str]:
+    """
+    Remove stored rows of every vectorizer other than the given (currently served) ones.
+    """
+    return get_store().prune({vectorizer_version(vectorizer) for vectorizer in vectorizers}, min_age)
+
+
+if __name__ == "__main__":
+    from utils import resources
+    from ml_model import job_title_predictor, resume_classifier  # Registers the models
+
+    served = [resources.get("job_title_model")[1], resources.get("resume_classifier_model")[0]]
+    removed = prune(served)
+    print(f"✅ Removed {len(removed)} stale feature version(s)" + (f": {', '.join(removed)}" if removed else ""))
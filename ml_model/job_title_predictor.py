@@ -1,37 +1,84 @@
-import joblib
 import numpy as np
 
-MODEL_PATH = "ml_model/job_title_predictor.pkl"
+from ml_model import feature_store, registry
+from utils import resources
+
+MODEL_NAME = "job_title"
+MODEL_PATH = "ml_model/job_title_predictor.pkl"   # Served until a registry version is promoted
+
+def _load_model():
+    """
+    (version, vectorizer, model, label_encoder), read together so the version always names the model.
+    """
+    try:
+        version, (vectorizer, model, label_encoder) = registry.load_model_version(MODEL_NAME, MODEL_PATH)
+    except Exception as e:
+        raise RuntimeError(f"❌ Failed to load job title model: {e}")
+    return version, vectorizer, model, label_encoder
+
+resources.register("job_title_model", _load_model, version=lambda: registry.model_version(MODEL_NAME, MODEL_PATH))
+
+TOP_K = 3
+
+
+def top_k_classes(probs, k=TOP_K):
+    """
+    Column indices of the k largest values per row, largest first, without a full sort.
+    Ties go to the higher column, the order np.argsort(row)[::-1] gives them.
+    """
+    n_rows, n_classes = probs.shape
+    k = min(k, n_classes)
+    if k <= 0:
+        return np.zeros((n_rows, 0), dtype=np.intp)
+    threshold = np.partition(probs, n_classes - k, axis=1)[:, n_classes - k][:, None]
+    above = probs > threshold
+    tied = probs == threshold
+    # Of the values tied at the threshold, keep as many as are still needed, rightmost first
+    needed = k - above.sum(axis=1, keepdims=True)
+    tied_from_right = np.cumsum(tied[:, ::-1], axis=1)[:, ::-1]
+    keep = above | (tied & (tied_from_right <= needed))
+    columns = np.nonzero(keep)[1].reshape(n_rows, k)
+    values = np.take_along_axis(probs, columns, axis=1)
+    order = np.lexsort((-columns, -values), axis=1)
+    return np.take_along_axis(columns, order, axis=1)
+
+
+def predict_job_title_many(texts, k=TOP_K):
+    """
+    predict_job_title for many texts: one transform, one predict_proba over the
+    sparse batch, partition-based top-k and label lookup through classes_.
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    _, vectorizer, model, label_encoder = resources.get("job_title_model")
+    probs = model.predict_proba(feature_store.transform(vectorizer, texts))
+    top = top_k_classes(probs, k)
+    labels = np.asarray(label_encoder.classes_)[top]
+    percents = np.round(np.take_along_axis(probs, top, axis=1) * 100, 2)
+    return [list(zip(row_labels, row_percents)) for row_labels, row_percents in zip(labels, percents)]
 
-try:
-    vectorizer, model, label_encoder = joblib.load(MODEL_PATH)
-except Exception as e:
-    raise RuntimeError(f"❌ Failed to load job title model: {e}")
 
 def predict_job_title(text):
-    X = vectorizer.transform([text])
-    probs = model.predict_proba(X)[0]
-    top_indices = np.argsort(probs)[::-1][:3]
-    top_titles = [(label_encoder.inverse_transform([i])[0], round(probs[i] * 100, 2)) for i in top_indices]
-    return top_titles
+    return predict_job_title_many([text])[0]
+
+
+def featurize(texts):
+    """
+    The job-title model's TF-IDF rows for texts, from the shared feature store.
+    """
+    _, vectorizer, _, _ = resources.get("job_title_model")
+    return feature_store.transform(vectorizer, list(texts))
+
 def get_top_title_only(text):
     return predict_job_title(text)[0][0]
 
 
 def generate_shap_chart(filename):
-    import shap
-    import matplotlib.pyplot as plt
-    from utils.parser import extract_text_from_file
+    """
+    SHAP chart for an uploaded resume, from the explanation cache; returns its path under static/.
+    """
     import os
+    from ml_model.shap_explainer import get_explanation
 
-    text_path = os.path.join("uploads", "resumes", filename)
-    resume_text = extract_text_from_file(text_path)
-    X = vectorizer.transform([resume_text])
-
-    explainer = shap.Explainer(model)
-    shap_values = explainer(X)
-
-    plt.figure(figsize=(10, 5))
-    shap.plots.bar(shap_values[0], show=False)
-    plt.savefig(f"static/shap_{filename}.png")
-    plt.close()
+    return get_explanation(os.path.join("uploads", "resumes", filename))["png"]
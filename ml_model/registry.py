@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+
+REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", os.path.join("ml_model", "registry"))
+ARTIFACT_NAME = "model.joblib"
+CURRENT_NAME = "CURRENT"
+RELOAD_CHECK_SECONDS = 5.0       # How often a running process looks for a newly promoted version
+
+
+# ==============================
+# 🗃️ Versioned Model Registry
+# ==============================
+# registry/<model>/<version>/model.joblib + meta.json, and registry/<model>/CURRENT
+# naming the promoted version. Versions are written into a temp dir and renamed
+# into place, and CURRENT is swapped with os.replace, so readers only ever see
+# complete artifacts. Artifacts are uncompressed joblib dumps: loading them with
+# mmap_mode="r" maps their numpy arrays from the page cache, shared by every
+# worker process, instead of copying them into each one.
+
+class ModelRegistry:
+
+    def __init__(self, root: str = REGISTRY_DIR, check_interval: float = RELOAD_CHECK_SECONDS):
+        self.root = root
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._current: Dict[str, tuple] = {}      # model -> (checked_at, version)
+
+    def _model_dir(self, name: str) -> str:
+        return os.path.join(self.root, name)
+
+    def versions(self, name: str) -> List[str]:
+        directory = self._model_dir(name)
+        if not os.path.isdir(directory):
+            return []
+        found = [v for v in os.listdir(directory) if os.path.exists(os.path.join(directory, v, ARTIFACT_NAME))]
+        return sorted(found, key=_version_number)
+
+    # --- Publishing ---
+    def publish(self, name: str, artifact, promote: bool = False) -> str:
+        """
+        Store an artifact (any joblib-dumpable object) as the next version of a model.
+        """
+        directory = self._model_dir(name)
+        os.makedirs(directory, exist_ok=True)
+        tmp_dir = os.path.join(directory, f".tmp-{os.getpid()}-{time.time_ns()}")
+        os.makedirs(tmp_dir)
+        try:
+            path = os.path.join(tmp_dir, ARTIFACT_NAME)
+            joblib.dump(artifact, path)          # Uncompressed, so arrays can be memory-mapped
+            with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"created_at": time.time(), "sha256": _file_sha256(path)}, f)
+            while True:
+                existing = self.versions(name)
+                version = f"v{_version_number(existing[-1]) + 1 if existing else 1}"
+                try:
+                    os.rename(tmp_dir, os.path.join(directory, version))
+                    break
+                except OSError:
+                    if not os.path.exists(os.path.join(directory, version)):
+                        raise                  # A concurrent publisher took the number; otherwise fail
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        if promote:
+            self.promote(name, version)
+        return version
+
+    def promote(self, name: str, version: str) -> None:
+        """
+        Make `version` the one every process serves (atomic; running processes pick it up on their next check).
+        """
+        if version not in self.versions(name):
+            raise ValueError(f"Unknown version {version} of model {name}")
+        directory = self._model_dir(name)
+        tmp_path = os.path.join(directory, f".{CURRENT_NAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(directory, CURRENT_NAME))
+        with self._lock:
+            self._current.pop(name, None)
+
+    # --- Reading ---
+    def current_version(self, name: str) -> Optional[str]:
+        """
+        The promoted version, re-read from disk at most every check_interval seconds.
+        """
+        now = time.monotonic()
+        with self._lock:
+            cached = self._current.get(name)
+            if cached is not None and now - cached[0] < self.check_interval:
+                return cached[1]
+        try:
+            with open(os.path.join(self._model_dir(name), CURRENT_NAME), encoding="utf-8") as f:
+                version = f.read().strip() or None
+        except FileNotFoundError:
+            version = None
+        with self._lock:
+            self._current[name] = (now, version)
+        return version
+
+    def load(self, name: str, version: Optional[str] = None):
+        version = version or self.current_version(name)
+        if version is None:
+            raise FileNotFoundError(f"No promoted version of model {name}")
+        return joblib.load(os.path.join(self._model_dir(name), version, ARTIFACT_NAME), mmap_mode="r")
+
+    def status(self) -> Dict[str, Optional[str]]:
+        if not os.path.isdir(self.root):
+            return {}
+        return {name: self.current_version(name) for name in sorted(os.listdir(self.root))
+                if os.path.isdir(self._model_dir(name))}
+
+
+def _version_number(version: str) -> int:
+    try:
+        return int(version.lstrip("v"))
+    except ValueError:
+        return 0
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+_registry: Optional[ModelRegistry] = None
+
+
+def get_registry() -> ModelRegistry:
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
+
+
+def current_version(name: str) -> Optional[str]:
+    return get_registry().current_version(name)
+
+
+def model_version(name: str, legacy_path: str) -> str:
+    """
+    The promoted version of a model, or a name for the legacy pickle served while none is.
+    """
+    version = current_version(name)
+    if version is not None:
+        return version
+    return _legacy_version(legacy_path)
+
+
+def load_model_version(name: str, legacy_path: str) -> Tuple[str, object]:
+    """
+    (version, artifact) read together, so the version always names the artifact returned.
+    """
+    version = current_version(name)
+    if version is not None:
+        return version, get_registry().load(name, version)
+    return _legacy_version(legacy_path), joblib.load(legacy_path)
+
+
+def _legacy_version(path: str) -> str:
+    try:
+        return f"legacy-{os.stat(path).st_mtime_ns}"
+    except OSError:
+        return "legacy"
+
+
+def load_model(name: str, legacy_path: str):
+    """
+    The promoted version of a model, or the pickle at legacy_path while none has been promoted.
+    """
+    registry = get_registry()
+    if registry.current_version(name) is None:
+        return joblib.load(legacy_path)
+    return registry.load(name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish, promote and list model versions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    publish = commands.add_parser("publish", help="Store a pickle as the next version of a model")
+    publish.add_argument("name")
+    publish.add_argument("path")
+    publish.add_argument("--promote", action="store_true")
+    promote = commands.add_parser("promote", help="Serve a version (running apps reload within seconds)")
+    promote.add_argument("name")
+    promote.add_argument("version")
+    listing = commands.add_parser("list", help="Show versions of a model")
+    listing.add_argument("name")
+    args = parser.parse_args()
+
+    registry = get_registry()
+    if args.command == "publish":
+        version = registry.publish(args.name, joblib.load(args.path), promote=args.promote)
+        print(f"✅ Published {args.name} {version}" + (" (promoted)" if args.promote else ""))
+    elif args.command == "promote":
+        registry.promote(args.name, args.version)
+        print(f"✅ {args.name} now serves {args.version}")
+    else:
+        current = registry.current_version(args.name)
+        for version in registry.versions(args.name):
+            print(f"{'*' if version == current else ' '} {version}")
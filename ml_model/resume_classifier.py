@@ -1,20 +1,40 @@
 import os
-import joblib
+import numpy as np
 
-MODEL_PATH = os.path.join("ml_model", "models", "resume_classifier.pkl")
+from ml_model import feature_store, registry
+from utils import resources
 
-try:
-    vectorizer, model, label_encoder = joblib.load(MODEL_PATH)
-except Exception as e:
-    raise RuntimeError(f"❌ Failed to load ML model/vectorizer: {e}")
+MODEL_NAME = "resume_classifier"
+MODEL_PATH = os.path.join("ml_model", "models", "resume_classifier.pkl")   # Served until a version is promoted
 
-def predict_resume_title(resume_text):
-    if not resume_text.strip():
-        return "Unknown", 0.0
+def _load_model():
+    try:
+        return registry.load_model(MODEL_NAME, MODEL_PATH)
+    except Exception as e:
+        raise RuntimeError(f"❌ Failed to load ML model/vectorizer: {e}")
+
+resources.register("resume_classifier_model", _load_model, version=lambda: registry.current_version(MODEL_NAME))
+
+def predict_resume_title_many(resume_texts):
+    """
+    predict_resume_title for many texts with one transform and one predict_proba
+    (the predicted class is the argmax of the probabilities). Blank texts get ("Unknown", 0.0).
+    """
+    resume_texts = list(resume_texts)
+    results = [("Unknown", 0.0)] * len(resume_texts)
+    rows = [i for i, text in enumerate(resume_texts) if text.strip()]
+    if not rows:
+        return results
 
-    X_input = vectorizer.transform([resume_text])
-    prediction = model.predict(X_input)[0]
-    confidence = max(model.predict_proba(X_input)[0]) * 100
-    predicted_label = label_encoder.inverse_transform([prediction])[0]
+    vectorizer, model, label_encoder = resources.get("resume_classifier_model")
+    probs = model.predict_proba(feature_store.transform(vectorizer, [resume_texts[i] for i in rows]))
+    best = probs.argmax(axis=1)
+    labels = np.asarray(label_encoder.classes_)[best]
+    confidences = probs[np.arange(len(rows)), best] * 100
+    for i, label, confidence in zip(rows, labels, confidences):
+        results[i] = (label, round(confidence, 2))
+    return results
 
-    return predicted_label, round(confidence, 2)
\ No newline at end of file
+
+def predict_resume_title(resume_text):
+    return predict_resume_title_many([resume_text])[0]
@@ -1,11 +1,233 @@
-import shap
-import joblib
+import os
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
 import numpy as np
 
-vectorizer, model, label_encoder = joblib.load("ml_model/job_title_predictor.pkl")
-explainer = shap.Explainer(model)
+from ml_model import feature_store
+from ml_model import job_title_predictor  # Registers the "job_title_model" resource
+from utils import resources
+from utils.text_cache import file_digest
+
+SHAP_CACHE_DIR = os.path.join("static", "shap")    # <model version>/<text version>/<resume hash>.png|.json
+SHAP_TOP_FEATURES = 20           # Features kept per explanation (by |SHAP value|)
+SHAP_CHART_FEATURES = 10         # Bars drawn in the PNG
+
+
+# ==============================
+# 🔬 Long-Lived, Model-Specific Explainer
+# ==============================
+# Built around the same job_title_model object prediction uses, and rebuilt
+# whenever that object is replaced (a promotion or a new legacy pickle). The
+# resource is a (version, vectorizer, model, label_encoder, explainer) tuple
+# taken from that one object, so a hot reload can never pair one version's
+# cache key with another's model. Tree models get the exact TreeExplainer,
+# linear ones the exact LinearExplainer over an all-zero TF-IDF baseline; both
+# take the sparse TF-IDF rows as they are. Anything else falls back to the
+# generic shap.Explainer.
+
+def _load_explainer():
+    version, vectorizer, model, label_encoder = resources.get("job_title_model")
+    return version, vectorizer, model, label_encoder, _build_explainer(vectorizer, model)
+
+
+def _served_model_id() -> int:
+    # The explainer tuple holds the model, so its id cannot be reused while the explainer is loaded
+    return id(resources.get("job_title_model")[2])
+
+
+def _build_explainer(vectorizer, model):
+    import shap
+    if hasattr(model, "get_booster") or hasattr(model, "estimators_"):
+        return shap.TreeExplainer(model)
+    if hasattr(model, "coef_"):
+        background = np.zeros((1, len(vectorizer.vocabulary_)))
+        return shap.LinearExplainer(model, shap.maskers.Independent(background))
+    return _DenseInput(shap.Explainer(model))
+
+
+class _DenseInput:
+    """
+    The generic shap explainers take dense input only.
+    """
+
+    def __init__(self, explainer):
+        self.explainer = explainer
+
+    def shap_values(self, X):
+        return self.explainer.shap_values(X.toarray())
+
+
+resources.register("job_title_explainer", _load_explainer, version=_served_model_id)
+
+
+def _class_values(explainer, X) -> np.ndarray:
+    """
+    SHAP values as (rows, features, classes), whichever layout the installed shap returns.
+    """
+    values = explainer.shap_values(X)
+    if isinstance(values, list):   # Older shap: one (rows, features) array per class
+        values = np.stack([_dense(v) for v in values], axis=-1)
+    values = _dense(values)
+    return values[:, :, None] if values.ndim == 2 else values
+
+
+def _dense(values) -> np.ndarray:
+    return values.toarray() if hasattr(values, "toarray") else np.asarray(values)
+
+
+def explain_texts(texts: List[str], explainer: Optional[tuple] = None) -> List[Dict]:
+    """
+    Explain the predicted job title of each text, in one explainer call over the batch.
+    `explainer` is a job_title_explainer resource tuple (default: the current one).
+    """
+    if not texts:
+        return []
+    _, vectorizer, model, label_encoder, shap_explainer = explainer or resources.get("job_title_explainer")
+    X = feature_store.transform(vectorizer, texts)
+    predicted = model.predict_proba(X).argmax(axis=1)
+    values = _class_values(shap_explainer, X)
+    features = vectorizer.get_feature_names_out()
+    classes = np.asarray(label_encoder.classes_)
+
+    explanations = []
+    for row, cls in enumerate(predicted):
+        contributions = values[row, :, min(cls, values.shape[2] - 1)]
+        top = np.argsort(-np.abs(contributions), kind="stable")[:SHAP_TOP_FEATURES]
+        explanations.append({
+            "predicted_title": str(classes[cls]),
+            "features": [{"feature": str(features[i]), "shap": round(float(contributions[i]), 6)}
+                         for i in top if contributions[i] != 0],
+        })
+    return explanations
+
 
 def explain_prediction(text):
-    X = vectorizer.transform([text])
-    shap_values = explainer(X)
-    return shap_values
+    return explain_texts([text])[0]
+
+
+# ==============================
+# 🗄️ Explanation Cache (PNG + JSON per resume hash and model version)
+# ==============================
+
+def text_version() -> str:
+    """
+    Extractor and page cap the explained text is read with: the same text ingestion predicts the ML title from.
+    """
+    from utils.parser import EXTRACTOR_VERSION, MAX_PDF_PAGES
+
+    return f"x{EXTRACTOR_VERSION}-p{MAX_PDF_PAGES}"
+
+
+def _cache_paths(resume_hash: str, version: str) -> Tuple[str, str]:
+    base = os.path.join(SHAP_CACHE_DIR, version, text_version(), resume_hash)
+    return base + ".png", base + ".json"
+
+
+def _render_png(explanation: Dict, path: str) -> None:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    top = explanation["features"][:SHAP_CHART_FEATURES][::-1]
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.barh([f["feature"] for f in top], [f["shap"] for f in top],
+            color=["#d62728" if f["shap"] > 0 else "#1f77b4" for f in top])
+    ax.set_xlabel(f"SHAP value for “{explanation['predicted_title']}”")
+    fig.tight_layout()
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def _store(explanation: Dict, png_path: str, json_path: str) -> None:
+    os.makedirs(os.path.dirname(json_path), exist_ok=True)
+    tmp_png, tmp_json = f"{png_path}.{os.getpid()}.tmp.png", f"{json_path}.{os.getpid()}.tmp"
+    _render_png(explanation, tmp_png)
+    with open(tmp_json, "w", encoding="utf-8") as f:
+        json.dump(explanation, f)
+    os.replace(tmp_png, png_path)
+    os.replace(tmp_json, json_path)   # JSON last: its presence marks a complete entry
+
+
+def explain_files(paths: List[str]) -> List[Dict]:
+    """
+    Cached explanations for resume files, computing all misses in one batch.
+    Each dict also carries filename, resume_hash, model_version and png (relative to static/).
+    Texts are capped at MAX_PDF_PAGES like ingestion, so the chart explains the ML title shown beside it.
+
+    Raises:
+        FileNotFoundError: if a resume file does not exist.
+    """
+    from utils.parser import MAX_PDF_PAGES, extract_text_from_file
+
+    hashes = [file_digest(path) for path in paths]   # A missing file fails before the explainer loads
+    explainer = resources.get("job_title_explainer")
+    version = explainer[0]
+    results: List[Optional[Dict]] = [None] * len(paths)
+    missing = []
+    for i, (path, resume_hash) in enumerate(zip(paths, hashes)):
+        png_path, json_path = _cache_paths(resume_hash, version)
+        meta = {"filename": os.path.basename(path), "resume_hash": resume_hash, "model_version": version,
+                "png": os.path.relpath(png_path, "static").replace(os.sep, "/")}
+        try:
+            with open(json_path, encoding="utf-8") as f:
+                results[i] = {**json.load(f), **meta}
+        except (FileNotFoundError, ValueError):
+            missing.append((i, path, meta, png_path, json_path))
+
+    if missing:
+        texts = [extract_text_from_file(path, max_pages=MAX_PDF_PAGES) for _, path, _, _, _ in missing]
+        explanations = explain_texts(texts, explainer)
+        for (i, _, meta, png_path, json_path), explanation in zip(missing, explanations):
+            _store(explanation, png_path, json_path)
+            results[i] = {**explanation, **meta}
+    return results
+
+
+def get_explanation(path: str) -> Dict:
+    return explain_files([path])[0]
+
+
+# === Batch precomputation (e.g. for every resume of a match run) ===
+SHAP_PRECOMPUTE_BATCH = 64
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def precompute(paths: List[str]) -> int:
+    """
+    Fill the cache for the given resumes; returns how many were explained.
+    """
+    for i in range(0, len(paths), SHAP_PRECOMPUTE_BATCH):
+        explain_files(paths[i:i + SHAP_PRECOMPUTE_BATCH])
+    return len(paths)
+
+
+def enqueue(paths: List[str]) -> Future:
+    """
+    Precompute explanations in a background thread, so the request that asked doesn't wait.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shap")
+    future = _executor.submit(precompute, list(paths))
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def _log_failure(future: Future) -> None:
+    if future.exception() is not None:
+        logging.error(f"[SHAP precompute FAIL] {future.exception()}")
+
+
+if __name__ == "__main__":
+    from config import UPLOAD_FOLDER_RESUMES, ALLOWED_EXTENSIONS
+
+    uploads = [os.path.join(UPLOAD_FOLDER_RESUMES, f) for f in sorted(os.listdir(UPLOAD_FOLDER_RESUMES))
+               if f.rsplit(".", 1)[-1].lower() in ALLOWED_EXTENSIONS]
+    print(f"✅ Explained {precompute(uploads)} resumes with model {resources.get('job_title_explainer')[0]}")
@@ -0,0 +1,72 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+import multiprocessing
+from unittest.mock import patch
+
+from utils.parser import extract_texts_parallel
+
+
+def _fake_read(path, max_pages=None):
+    """
+    Stands in for the real extractor inside the worker processes.
+    """
+    name = os.path.basename(path)
+    if name.startswith("hang"):
+        time.sleep(60)
+    if name.startswith("crash"):
+        os._exit(1)
+    if name.startswith("broken"):
+        raise ValueError("not a PDF")
+    return f"text of {name}"
+
+
+@unittest.skipUnless(multiprocessing.get_start_method() == "fork", "workers must inherit the patched extractor")
+class TestExtractTextsParallel(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _paths(self, *names):
+        paths = []
+        for name in names:
+            path = os.path.join(self.tmp_dir, name)
+            with open(path, "w") as f:
+                f.write(name)
+            paths.append(path)
+        return paths
+
+    def _run(self, paths, **kwargs):
+        with patch("utils.parser._read_text", _fake_read):
+            return {os.path.basename(path): (text, error)
+                    for path, text, error in extract_texts_parallel(paths, use_cache=False, **kwargs)}
+
+    def test_hung_file_is_killed_and_batch_completes(self):
+        paths = self._paths("a.pdf", "hang.pdf", "b.pdf", "c.pdf")
+        started = time.monotonic()
+        results = self._run(paths, workers=2, timeout=1.0)
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(results["hang.pdf"], ("", "Timed out after 1.0s"))
+        for name in ("a.pdf", "b.pdf", "c.pdf"):
+            self.assertEqual(results[name], (f"text of {name}", None))
+
+    def test_crashing_worker_is_replaced(self):
+        paths = self._paths("crash.pdf", "a.pdf", "b.pdf")
+        results = self._run(paths, workers=1, timeout=5.0)
+        self.assertEqual(results["crash.pdf"], ("", "Worker exited unexpectedly"))
+        self.assertEqual(results["a.pdf"], ("text of a.pdf", None))
+        self.assertEqual(results["b.pdf"], ("text of b.pdf", None))
+
+    def test_read_errors_are_reported_per_file(self):
+        results = self._run(self._paths("broken.pdf", "a.pdf"), workers=1, timeout=5.0)
+        self.assertEqual(results["broken.pdf"], ("", "not a PDF"))
+        self.assertEqual(results["a.pdf"], ("text of a.pdf", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
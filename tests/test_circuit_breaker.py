@@ -0,0 +1,85 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from utils import gpt_helper
+from utils.circuit_breaker import CircuitBreaker, CircuitOpenError, LatencyBudget
+
+
+def _fail():
+    raise ConnectionError("provider down")
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker("test", failure_threshold=3, cooldown=60)
+        for _ in range(3):
+            with self.assertRaises(ConnectionError):
+                breaker.call(_fail)
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            breaker.call(lambda: "not called")
+
+    def test_success_resets_failure_count(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, cooldown=60)
+        with self.assertRaises(ConnectionError):
+            breaker.call(_fail)
+        breaker.call(lambda: None)
+        with self.assertRaises(ConnectionError):
+            breaker.call(_fail)
+        self.assertEqual(breaker.state, "closed")
+
+    def test_half_open_trial_after_cooldown(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0.05)
+        with self.assertRaises(ConnectionError):
+            breaker.call(_fail)
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())  # Only one trial at a time
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+
+    def test_failed_trial_reopens(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0.05)
+        with self.assertRaises(ConnectionError):
+            breaker.call(_fail)
+        time.sleep(0.06)
+        with self.assertRaises(ConnectionError):
+            breaker.call(_fail)
+        self.assertEqual(breaker.state, "open")
+        self.assertFalse(breaker.allow())
+
+
+class TestLatencyBudget(unittest.TestCase):
+
+    def test_timeout_is_clamped(self):
+        budget = LatencyBudget(1.0)
+        connect, read = budget.timeout((3.05, 30))
+        self.assertLessEqual(connect, 1.0)
+        self.assertLessEqual(read, 1.0)
+
+    def test_exhausted(self):
+        self.assertTrue(LatencyBudget(0).exhausted)
+        self.assertFalse(LatencyBudget(None).exhausted)
+
+
+class TestGPTFailsFast(unittest.TestCase):
+
+    def setUp(self):
+        gpt_helper.OPENAI_BREAKER.reset()
+
+    def tearDown(self):
+        gpt_helper.OPENAI_BREAKER.reset()
+
+    @patch("utils.gpt_helper.requests.post")
+    def test_open_circuit_skips_requests(self, mock_post):
+        for _ in range(gpt_helper.OPENAI_BREAKER.failure_threshold):
+            gpt_helper.OPENAI_BREAKER.record_failure()
+        titles = gpt_helper.suggest_job_titles_many([["python"], ["java"]], api_key="fake", use_cache=False)
+        self.assertTrue(all(t[0].startswith("❌") for t in titles))
+        mock_post.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
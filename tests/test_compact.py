@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import LabelEncoder
+
+from ml_model import compact
+from ml_model.compact import CompactModel
+
+TEXTS = [
+    "Python developer with Django, SQL and AWS experience. Built REST APIs and CI/CD pipelines.",
+    "Registered nurse: patient care, ICU, medication administration",
+    "Machine learning engineer — TensorFlow, PyTorch, NLP; résumé available",
+    "",
+]
+PICKLES = [
+    os.path.join("ml_model", "job_title_predictor.pkl"),
+    os.path.join("ml_model", "models", "resume_classifier.pkl"),
+]
+
+
+class TestCompactExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def _linear_artifact(self, **vectorizer_params):
+        docs = ["python sql data pipelines", "nurse patient care icu", "java spring backend api",
+                "patient icu nurse shifts", "data science python ml", "backend api java services"]
+        labels = ["data", "nurse", "backend", "nurse", "data", "backend"]
+        label_encoder = LabelEncoder().fit(labels)
+        vectorizer = TfidfVectorizer(**vectorizer_params).fit(docs)
+        model = LogisticRegression(max_iter=500).fit(vectorizer.transform(docs), label_encoder.transform(labels))
+        return vectorizer, model, label_encoder, docs
+
+    def test_tree_models_match_predict_proba(self):
+        for path in PICKLES:
+            with self.subTest(path=path), warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                vectorizer, model, label_encoder = joblib.load(path)
+                bundle = os.path.join(self.tmp_dir, os.path.basename(path))
+                compact.export((vectorizer, model, label_encoder), bundle)
+                scorer = CompactModel(bundle)
+                expected = model.predict_proba(vectorizer.transform(TEXTS))
+                np.testing.assert_allclose(scorer.predict_proba(TEXTS), expected, atol=1e-5)
+                self.assertEqual(list(scorer.classes), [str(c) for c in label_encoder.classes_])
+
+    def test_linear_model_matches_predict_proba(self):
+        vectorizer, model, label_encoder, docs = self._linear_artifact(stop_words="english", ngram_range=(1, 2),
+                                                                       sublinear_tf=True, max_features=20)
+        compact.export((vectorizer, model, label_encoder), self.tmp_dir)
+        scorer = CompactModel(self.tmp_dir)
+        texts = docs + TEXTS
+        np.testing.assert_allclose(scorer.predict_proba(texts),
+                                   model.predict_proba(vectorizer.transform(texts)), atol=1e-5)
+        top = scorer.predict_top_k(["nurse in the icu"], k=2)[0]
+        self.assertEqual(top[0][0], "nurse")
+        self.assertEqual(len(top), 2)
+
+    def test_transform_matches_vectorizer(self):
+        vectorizer, model, label_encoder, _ = self._linear_artifact(strip_accents="unicode", ngram_range=(1, 2))
+        compact.export((vectorizer, model, label_encoder), self.tmp_dir)
+        texts = ["Pythön data data data pipelines", "ICU nurse, patient-care"] + TEXTS
+        np.testing.assert_allclose(CompactModel(self.tmp_dir).transform(texts),
+                                   vectorizer.transform(texts).toarray(), atol=1e-6)
+
+    def test_bundle_is_float32_and_memory_mapped(self):
+        vectorizer, model, label_encoder, _ = self._linear_artifact()
+        compact.export((vectorizer, model, label_encoder), self.tmp_dir)
+        scorer = CompactModel(self.tmp_dir)
+        self.assertIsInstance(scorer.arrays["coef"], np.memmap)
+        self.assertEqual(scorer.arrays["coef"].dtype, np.float32)
+        self.assertEqual(scorer.arrays["idf"].dtype, np.float32)
+
+    def test_custom_analyzer_is_rejected(self):
+        vectorizer, model, label_encoder, _ = self._linear_artifact(analyzer="char")
+        with self.assertRaises(ValueError):
+            compact.export((vectorizer, model, label_encoder), self.tmp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import os
+import json
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import numpy as np
+import requests
+from utils import embeddings
+from utils.circuit_breaker import BudgetExceeded, LatencyBudget
+from utils.embeddings import EmbeddingStore, HFEmbeddingClient, embed_texts, cosine_similarity
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    Stands in for the Hugging Face endpoint: one 3-d vector per input, derived from its length.
+    """
+    requests_seen = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _StubHandler.requests_seen.append(body["inputs"])
+        vectors = [[float(len(text)), 1.0, 0.0] for text in body["inputs"]]
+        payload = json.dumps(vectors).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestEmbeddings(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), _StubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/embed"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _StubHandler.requests_seen.clear()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = EmbeddingStore(os.path.join(self.tmp_dir, "emb.db"), max_entries=100)
+        self.client = HFEmbeddingClient(api_url=self.url, token="fake", batch_size=2)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_batched_requests(self):
+        vectors = embed_texts(["a", "bb", "ccc"], store=self.store, client=self.client)
+        self.assertEqual(vectors.shape, (3, 3))
+        self.assertEqual(_StubHandler.requests_seen, [["a", "bb"], ["ccc"]])
+
+    def test_repeats_served_from_store(self):
+        embed_texts(["python", "sql"], store=self.store, client=self.client)
+        _StubHandler.requests_seen.clear()
+        vectors = embed_texts(["sql", "python", "python\n"], store=self.store, client=self.client)
+        self.assertEqual(_StubHandler.requests_seen, [])
+        np.testing.assert_array_equal(vectors[1], vectors[2])  # Same normalized text
+
+    def test_lru_eviction(self):
+        store = EmbeddingStore(os.path.join(self.tmp_dir, "small.db"), max_entries=2)
+        store.put_many({"a": np.ones(3)})
+        store.put_many({"b": np.ones(3)})
+        store.put_many({"c": np.ones(3)})
+        self.assertEqual(set(store.get_many(["a", "b", "c"])), {"b", "c"})
+
+    def test_cosine_similarity(self):
+        self.assertAlmostEqual(cosine_similarity(np.array([1.0, 0.0]), np.array([1.0, 1.0])), 2 ** -0.5)
+
+
+class TestEmbeddingBudget(unittest.TestCase):
+
+    def setUp(self):
+        embeddings.HF_BREAKER.reset()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = EmbeddingStore(os.path.join(self.tmp_dir, "emb.db"))
+
+    def tearDown(self):
+        embeddings.HF_BREAKER.reset()
+        shutil.rmtree(self.tmp_dir)
+
+    def _client(self, post):
+        session = MagicMock()
+        session.post.side_effect = post
+        return HFEmbeddingClient(api_url="http://hf.invalid", token="fake", batch_size=1, session=session)
+
+    def test_budget_bounds_the_whole_run(self):
+        def slow_post(url, headers, json, timeout):
+            time.sleep(0.05)
+            response = MagicMock()
+            response.json.return_value = [[1.0, 0.0]] * len(json["inputs"])
+            return response
+
+        client = self._client(slow_post)
+        started = time.monotonic()
+        with self.assertRaises(BudgetExceeded):
+            embed_texts([f"text {i}" for i in range(20)], store=self.store, client=client,
+                        budget=LatencyBudget(0.12))
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertLess(client.session.post.call_count, 20)
+
+    def test_budget_timeouts_are_not_counted_by_the_breaker(self):
+        def timing_out_post(url, headers, json, timeout):
+            raise requests.ReadTimeout("read timed out")
+
+        for _ in range(embeddings.HF_BREAKER.failure_threshold):
+            with self.assertRaises(BudgetExceeded):
+                embed_texts(["python"], store=self.store, client=self._client(timing_out_post),
+                            budget=LatencyBudget(1.0))
+        self.assertEqual(embeddings.HF_BREAKER.status(), {"state": "closed", "failures": 0})
+
+        # Without a budget, the same timeout is the provider's and counts
+        with self.assertRaises(requests.ReadTimeout):
+            embed_texts(["python"], store=self.store, client=self._client(timing_out_post))
+        self.assertEqual(embeddings.HF_BREAKER.status()["failures"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
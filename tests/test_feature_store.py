@@ -0,0 +1,126 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ml_model import feature_store
+from ml_model.feature_store import FeatureStore, vectorizer_version
+
+CORPUS = [
+    "python flask sql developer",
+    "marketing seo social media",
+    "excel tableau data analysis",
+    "java spring backend developer",
+]
+
+
+class TestFeatureStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.vectorizer = TfidfVectorizer().fit(CORPUS)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def assertSameRows(self, a, b):
+        self.assertEqual(a.shape, b.shape)
+        self.assertEqual((a != b).nnz, 0)
+
+    def test_matches_vectorizer(self):
+        store = FeatureStore(self.tmp_dir)
+        texts = ["python sql", "seo java", "python sql", "nothing known"]
+        self.assertSameRows(store.transform(self.vectorizer, texts), self.vectorizer.transform(texts))
+
+    def test_rows_computed_once(self):
+        store = FeatureStore(self.tmp_dir)
+        store.transform(self.vectorizer, ["python sql", "seo"])
+        with patch.object(self.vectorizer, "transform", wraps=self.vectorizer.transform) as transform:
+            store.transform(self.vectorizer, ["seo", "python sql", "java", "java"])
+        self.assertEqual(transform.call_args[0][0], ["java"])
+
+    def test_rows_persist_across_instances(self):
+        FeatureStore(self.tmp_dir).transform(self.vectorizer, CORPUS)
+        with patch.object(self.vectorizer, "transform") as transform:
+            rows = FeatureStore(self.tmp_dir).transform(self.vectorizer, CORPUS[::-1])
+        transform.assert_not_called()
+        self.assertSameRows(rows, self.vectorizer.transform(CORPUS[::-1]))
+
+    def test_compaction(self):
+        store = FeatureStore(self.tmp_dir, max_shards=2)
+        for text in CORPUS:
+            store.transform(self.vectorizer, [text])
+        shard_dir = os.path.join(self.tmp_dir, vectorizer_version(self.vectorizer))
+        self.assertLessEqual(len(os.listdir(shard_dir)), 2)
+        self.assertSameRows(FeatureStore(self.tmp_dir).transform(self.vectorizer, CORPUS),
+                            self.vectorizer.transform(CORPUS))
+
+    def test_in_memory_versions_are_bounded(self):
+        store = FeatureStore(self.tmp_dir, max_versions=2)
+        vectorizers = [TfidfVectorizer().fit(CORPUS[i:]) for i in range(3)]
+        for vectorizer in vectorizers:
+            store.transform(vectorizer, CORPUS)
+        self.assertEqual(set(store._shards), {vectorizer_version(v) for v in vectorizers[1:]})
+        # An evicted version is read back from disk, not recomputed
+        with patch.object(vectorizers[0], "transform") as transform:
+            rows = store.transform(vectorizers[0], CORPUS)
+        transform.assert_not_called()
+        self.assertSameRows(rows, vectorizers[0].transform(CORPUS))
+        self.assertEqual(len(store._shards), 2)
+
+    def test_refresh_compacts_other_processes_shards(self):
+        for text in CORPUS:
+            FeatureStore(self.tmp_dir).transform(self.vectorizer, [text])
+        store = FeatureStore(self.tmp_dir, max_shards=2)
+        self.assertSameRows(store.transform(self.vectorizer, CORPUS), self.vectorizer.transform(CORPUS))
+        self.assertLessEqual(len(store._shards[vectorizer_version(self.vectorizer)]), 2)
+
+    def test_resident_rows_are_capped(self):
+        store = FeatureStore(self.tmp_dir, max_rows=2)
+        for text in CORPUS:
+            store.transform(self.vectorizer, [text])
+        self.assertLessEqual(store._resident_rows, 2)
+        self.assertEqual(store._resident_rows, sum(m.shape[0] for m in store._resident.values()))
+        # Rows dropped from memory are read back from their shard, not recomputed
+        with patch.object(self.vectorizer, "transform") as transform:
+            rows = store.transform(self.vectorizer, CORPUS)
+        transform.assert_not_called()
+        self.assertSameRows(rows, self.vectorizer.transform(CORPUS))
+        self.assertLessEqual(store._resident_rows, 2)
+
+    def test_compaction_bounds_shard_size(self):
+        store = FeatureStore(self.tmp_dir, max_shards=1, shard_rows=2)
+        for text in CORPUS:
+            store.transform(self.vectorizer, [text])
+        sizes = store._shards[vectorizer_version(self.vectorizer)].values()
+        self.assertLessEqual(max(sizes), 2)
+        self.assertEqual(sum(sizes), len(CORPUS))
+        self.assertSameRows(FeatureStore(self.tmp_dir).transform(self.vectorizer, CORPUS),
+                            self.vectorizer.transform(CORPUS))
+
+    def test_prune_removes_versions_no_longer_served(self):
+        store = FeatureStore(self.tmp_dir)
+        refit = TfidfVectorizer().fit(CORPUS[:2])
+        store.transform(self.vectorizer, CORPUS)
+        store.transform(refit, CORPUS)
+        self.assertEqual(store.prune([vectorizer_version(self.vectorizer)]), [])   # Too recent
+        old = time.time() - feature_store.FEATURE_PRUNE_AGE - 1
+        os.utime(os.path.join(self.tmp_dir, vectorizer_version(refit)), (old, old))
+        with patch.object(feature_store, "get_store", return_value=store):
+            self.assertEqual(feature_store.prune([self.vectorizer]), [vectorizer_version(refit)])
+        self.assertEqual(os.listdir(self.tmp_dir), [vectorizer_version(self.vectorizer)])
+        self.assertNotIn(vectorizer_version(refit), store._shards)
+        self.assertSameRows(store.transform(refit, CORPUS[:1]), refit.transform(CORPUS[:1]))
+
+    def test_version_tracks_fit(self):
+        refit = TfidfVectorizer().fit(CORPUS[:2])
+        self.assertEqual(vectorizer_version(self.vectorizer), vectorizer_version(TfidfVectorizer().fit(CORPUS)))
+        self.assertNotEqual(vectorizer_version(self.vectorizer), vectorizer_version(refit))
+
+
+if __name__ == "__main__":
+    unittest.main()
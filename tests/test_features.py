@@ -0,0 +1,42 @@
+import unittest
+from utils.parser import (
+    ResumeFeatures,
+    extract_features,
+    extract_email,
+    extract_phone,
+    extract_skills,
+    classify_experience
+)
+
+
+class TestResumeFeatures(unittest.TestCase):
+
+    def setUp(self):
+        self.sample_text = """
+        Jane Roe
+        Email: jane.roe@example.com | Phone: +1 555 123 4567
+        Backend developer with 6+ years of Python and SQL, 2 years of JavaScript.
+        """
+
+    def test_single_pass_matches_field_extractors(self):
+        features = extract_features(self.sample_text, with_name=False)
+        self.assertEqual(features.email, extract_email(self.sample_text))
+        self.assertEqual(features.phone, extract_phone(self.sample_text))
+        self.assertEqual(features.skills, extract_skills(self.sample_text))
+        self.assertEqual(features.experience_level, classify_experience(self.sample_text))
+        self.assertEqual(features.experience_years, 6)
+
+    def test_years_not_read_as_phone(self):
+        features = extract_features("Over 10 years in SQL", with_name=False)
+        self.assertIsNone(features.phone)
+        self.assertEqual(features.experience_level, "Senior")
+
+    def test_record_is_slotted(self):
+        features = ResumeFeatures(skills=["python"])
+        self.assertFalse(hasattr(features, "__dict__"))
+        self.assertEqual(features.experience_level, "Unknown")
+        self.assertEqual(features.as_dict()["skills"], ["python"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from utils import gpt_helper
+from utils.gpt_cache import GPTCache
+
+
+class TestGPTCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = GPTCache(os.path.join(self.tmp_dir, "gpt_cache.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_key_ignores_order_and_case(self):
+        self.assertEqual(GPTCache.key("titles", ["Python", "SQL"], "m", "1"),
+                         GPTCache.key("titles", ["sql", " python"], "m", "1"))
+
+    def test_key_includes_model_and_prompt_version(self):
+        base = GPTCache.key("titles", ["python"], "m", "1")
+        self.assertNotEqual(base, GPTCache.key("titles", ["python"], "other", "1"))
+        self.assertNotEqual(base, GPTCache.key("titles", ["python"], "m", "2"))
+        self.assertNotEqual(base, GPTCache.key("learning_gap", ["python"], "m", "1"))
+
+    def test_roundtrip_and_counters(self):
+        self.assertIsNone(self.cache.get("titles", ["python"], "m", "1"))
+        self.cache.put("titles", ["python"], "m", "1", ["Python Developer"])
+        self.assertEqual(self.cache.get("titles", ["Python"], "m", "1"), ["Python Developer"])
+        self.assertEqual(self.cache.stats()["titles"], {"hits": 1, "misses": 1})
+
+    def test_expired_entries_miss(self):
+        cache = GPTCache(self.cache.db_path, ttl=0.05)
+        cache.put("titles", ["python"], "m", "1", ["Python Developer"])
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("titles", ["python"], "m", "1"))
+
+    def test_lru_eviction(self):
+        cache = GPTCache(self.cache.db_path, max_entries=2)
+        cache.put("titles", ["old"], "m", "1", ["a"])
+        cache.put("titles", ["recent"], "m", "1", ["b"])
+        time.sleep(0.01)
+        cache.get("titles", ["old"], "m", "1")  # "old" becomes most recently used
+        cache.put("titles", ["new"], "m", "1", ["c"])
+        self.assertIsNotNone(cache.get("titles", ["old"], "m", "1"))
+        self.assertIsNone(cache.get("titles", ["recent"], "m", "1"))
+
+
+class TestCachedSuggestions(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = GPTCache(os.path.join(self.tmp_dir, "gpt_cache.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    @patch.object(gpt_helper, "_chat", return_value="- Data Engineer")
+    def test_single_call_is_cached(self, mock_chat):
+        first = gpt_helper.suggest_job_titles(["sql", "python"], api_key="fake", cache=self.cache)
+        second = gpt_helper.suggest_job_titles(["Python", "SQL"], api_key="fake", cache=self.cache)
+        self.assertEqual(first, second)
+        self.assertEqual(mock_chat.call_count, 1)
+
+    @patch.object(gpt_helper, "_chat", side_effect=Exception("boom"))
+    def test_errors_are_not_cached(self, mock_chat):
+        for _ in range(2):
+            result = gpt_helper.suggest_job_titles(["python"], api_key="fake", cache=self.cache)
+            self.assertTrue(result[0].startswith("❌"))
+        self.assertEqual(mock_chat.call_count, 2)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+    @patch.object(gpt_helper, "_chat", return_value="- Developer")
+    def test_many_dedupes_skill_sets(self, mock_chat):
+        skill_lists = [["python", "sql"], ["SQL", "Python"], ["java"], ["python", "sql"]]
+        titles = gpt_helper.suggest_job_titles_many(skill_lists, api_key="fake", rate=100, cache=self.cache,
+                                                    pack_size=1)
+        self.assertEqual(titles, [["Developer"]] * 4)
+        self.assertEqual(mock_chat.call_count, 2)
+
+        gpt_helper.suggest_job_titles_many(skill_lists, api_key="fake", rate=100, cache=self.cache, pack_size=1)
+        self.assertEqual(mock_chat.call_count, 2)
+
+    @patch.object(gpt_helper, "_chat", return_value="- Learn Docker")
+    def test_learning_gap_keyed_on_missing_skills(self, mock_chat):
+        gpt_helper.suggest_learning_gap(["python"], ["python", "docker"], api_key="fake", cache=self.cache)
+        result = gpt_helper.suggest_learning_gap(["python", "sql"], ["docker", "sql"], api_key="fake",
+                                                 cache=self.cache)
+        self.assertEqual(result, ["Learn Docker"])
+        self.assertEqual(mock_chat.call_count, 1)
+
+
+    @patch.object(gpt_helper, "_chat", return_value="- Learn Docker")
+    def test_shared_cache_by_default(self, mock_chat):
+        with patch.object(gpt_helper, "get_cache", return_value=self.cache):
+            gpt_helper.suggest_learning_gap(["python"], ["docker"], api_key="fake")
+            gpt_helper.suggest_learning_gap(["python"], ["docker"], api_key="fake")
+            gpt_helper.suggest_job_titles(["python"], api_key="fake")
+            gpt_helper.suggest_job_titles(["python"], api_key="fake")
+        self.assertEqual(mock_chat.call_count, 2)
+        self.assertEqual(self.cache.stats()["entries"], 2)
+
+    @patch.object(gpt_helper, "_chat", return_value="- Learn Docker")
+    def test_opt_out_of_the_cache(self, mock_chat):
+        with patch.object(gpt_helper, "get_cache", return_value=self.cache):
+            for _ in range(2):
+                gpt_helper.suggest_learning_gap(["python"], ["docker"], api_key="fake", use_cache=False)
+                gpt_helper.suggest_job_titles(["python"], api_key="fake", use_cache=False)
+        self.assertEqual(mock_chat.call_count, 4)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
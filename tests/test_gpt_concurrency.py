@@ -0,0 +1,190 @@
+import json
+import time
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from utils import gpt_helper
+from utils.gpt_helper import TokenBucket, suggest_job_titles_many, suggest_job_titles_packed
+
+
+class _FakeOpenAI(BaseHTTPRequestHandler):
+    """
+    Chat-completions stand-in: echoes the first skill as a title. The first
+    `fail_first` requests get a 429, and every request takes `delay` seconds.
+    """
+    lock = threading.Lock()
+    calls = 0
+    in_flight = 0
+    max_in_flight = 0
+    fail_first = 0
+    delay = 0.0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = _FakeOpenAI
+        with cls.lock:
+            cls.calls += 1
+            call = cls.calls
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            time.sleep(cls.delay)
+            if call <= cls.fail_first:
+                self._reply(429, {"error": "rate limited"})
+                return
+            skills = body["messages"][1]["content"].split("\n\n")[1]
+            title = skills.split(", ")[0].title() + " Developer"
+            self._reply(200, {"choices": [{"message": {"content": f"- {title}"}}]})
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSuggestJobTitlesMany(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeOpenAI)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url_patch = patch.object(gpt_helper, "OPENAI_API_URL",
+                                     f"http://127.0.0.1:{cls.server.server_port}/v1/chat/completions")
+        cls.url_patch.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.url_patch.stop()
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _FakeOpenAI.calls = _FakeOpenAI.in_flight = _FakeOpenAI.max_in_flight = 0
+        _FakeOpenAI.fail_first = 0
+        _FakeOpenAI.delay = 0.0
+        gpt_helper.OPENAI_BREAKER.reset()
+
+    def test_results_keep_input_order(self):
+        skill_lists = [["python"], ["java"], ["sql"], ["go"]]
+        titles = suggest_job_titles_many(skill_lists, api_key="fake", rate=100, use_cache=False, pack_size=1)
+        self.assertEqual([t[0] for t in titles],
+                         ["Python Developer", "Java Developer", "Sql Developer", "Go Developer"])
+
+    def test_concurrency_limit(self):
+        _FakeOpenAI.delay = 0.1
+        suggest_job_titles_many([[f"skill{i}"] for i in range(8)], api_key="fake", max_workers=3, rate=100,
+                                use_cache=False, pack_size=1)
+        self.assertLessEqual(_FakeOpenAI.max_in_flight, 3)
+        self.assertGreater(_FakeOpenAI.max_in_flight, 1)
+
+    @patch.object(gpt_helper, "GPT_BACKOFF_BASE", 0.01)
+    def test_retries_after_429(self):
+        _FakeOpenAI.fail_first = 2
+        titles = suggest_job_titles_many([["python"]], api_key="fake", rate=100, use_cache=False, pack_size=1)
+        self.assertEqual(titles, [["Python Developer"]])
+        self.assertEqual(_FakeOpenAI.calls, 3)
+
+    def test_overall_deadline(self):
+        _FakeOpenAI.delay = 1.0
+        started = time.monotonic()
+        titles = suggest_job_titles_many([[f"skill{i}"] for i in range(4)], api_key="fake", max_workers=1, rate=100,
+                                         deadline=0.3, use_cache=False, pack_size=1)
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertTrue(all(t[0].startswith("❌") for t in titles))
+
+    def test_deadline_timeouts_leave_the_breaker_closed(self):
+        _FakeOpenAI.delay = 1.0
+        messages = gpt_helper._title_messages(["python"])
+        for _ in range(gpt_helper.OPENAI_BREAKER.failure_threshold):
+            with self.assertRaises(gpt_helper.DeadlineExceeded):
+                gpt_helper._chat(messages, 100, "fake", deadline=time.monotonic() + 0.2)
+        self.assertEqual(gpt_helper.OPENAI_BREAKER.status()["state"], "closed")
+        self.assertEqual(gpt_helper.OPENAI_BREAKER.status()["failures"], 0)
+
+    def test_provider_timeouts_still_count(self):
+        _FakeOpenAI.delay = 0.5
+        with patch.object(gpt_helper, "GPT_MAX_RETRIES", 0), self.assertRaises(gpt_helper.requests.Timeout):
+            gpt_helper._chat(gpt_helper._title_messages(["python"]), 100, "fake", timeout=(1.0, 0.1))
+        self.assertEqual(gpt_helper.OPENAI_BREAKER.status()["failures"], 1)
+
+
+def _packed_reply(messages, *args, skip_ids=(), **kwargs):
+    """
+    Packed-prompt stand-in for _chat: titles each candidate after its first skill, leaving out skip_ids.
+    """
+    lines = messages[1]["content"].split("\n\n")[1].split("\n")
+    candidates = []
+    for line in lines:
+        candidate_id, skills = line.split(": ", 1)
+        if int(candidate_id) not in skip_ids:
+            candidates.append({"id": int(candidate_id), "titles": [skills.split(", ")[0].title() + " Developer"]})
+    return json.dumps({"candidates": candidates})
+
+
+class TestPackedTitles(unittest.TestCase):
+
+    def test_one_request_per_pack(self):
+        with patch.object(gpt_helper, "_chat", side_effect=_packed_reply) as mock_chat:
+            titles = suggest_job_titles_packed([["python"], ["java"], [], ["sql"]], api_key="fake")
+        self.assertEqual(titles, [["Python Developer"], ["Java Developer"], ["❌ No skills provided"],
+                                  ["Sql Developer"]])
+        self.assertEqual(mock_chat.call_count, 1)
+
+    def test_retries_only_missing_candidates(self):
+        replies = [lambda m, *a, **kw: _packed_reply(m, skip_ids=(2,)), _packed_reply]
+        prompts = []
+
+        def chat(messages, *args, **kwargs):
+            prompts.append(messages[1]["content"])
+            return replies[len(prompts) - 1](messages)
+
+        with patch.object(gpt_helper, "_chat", side_effect=chat):
+            titles = suggest_job_titles_packed([["python"], ["java"], ["sql"]], api_key="fake")
+        self.assertEqual([t[0] for t in titles], ["Python Developer", "Java Developer", "Sql Developer"])
+        self.assertEqual(len(prompts), 2)
+        self.assertIn("1: java", prompts[1])
+        self.assertNotIn("python", prompts[1])
+
+    def test_unparseable_reply_gives_up(self):
+        with patch.object(gpt_helper, "_chat", return_value="not json") as mock_chat:
+            titles = suggest_job_titles_packed([["python"], ["java"]], api_key="fake")
+        self.assertEqual(titles, [["❌ Could not parse GPT response"]] * 2)
+        self.assertEqual(mock_chat.call_count, gpt_helper.GPT_PACK_RETRIES + 1)
+
+    def test_many_packs_requests(self):
+        skill_lists = [["python"], ["java"], ["sql"], ["go"], ["rust"]]
+        with patch.object(gpt_helper, "_chat", side_effect=_packed_reply) as mock_chat:
+            titles = suggest_job_titles_many(skill_lists, api_key="fake", rate=100, use_cache=False, pack_size=2)
+        self.assertEqual([t[0] for t in titles],
+                         ["Python Developer", "Java Developer", "Sql Developer", "Go Developer", "Rust Developer"])
+        self.assertEqual(mock_chat.call_count, 3)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_rate_is_enforced_after_burst(self):
+        bucket = TokenBucket(rate=20, capacity=1)
+        started = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.18)
+
+    def test_gives_up_at_deadline(self):
+        bucket = TokenBucket(rate=1, capacity=1)
+        bucket.acquire()
+        self.assertFalse(bucket.acquire(deadline=time.monotonic() + 0.1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import docx
+import spacy
+
+from ml_model import feature_store
+from utils import database, ingest, parser, resources
+
+
+def stub_nlp():
+    """
+    Blank English pipeline whose only NER is a rule for the test candidates' names.
+    """
+    nlp = spacy.blank("en")
+    nlp.add_pipe("entity_ruler").add_patterns([
+        {"label": "PERSON", "pattern": "Jane Roe"},
+        {"label": "PERSON", "pattern": "John Doe"},
+    ])
+    return nlp
+
+
+def write_docx(path, lines):
+    document = docx.Document()
+    for line in lines:
+        document.add_paragraph(line)
+    document.save(path)
+
+
+class TestIngestion(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.original_db = database.DB_NAME
+        database.DB_NAME = os.path.join(self.tmp_dir, "results.db")
+        database.init_db()
+        self.saved_store, feature_store._store = feature_store._store, feature_store.FeatureStore(
+            os.path.join(self.tmp_dir, "features"))
+        resources.register("spacy_sm", stub_nlp)
+        resources.reset("spacy_sm")
+        self.patches = [
+            patch.object(parser.text_cache, "get_text", return_value=None),
+            patch.object(parser.text_cache, "put_text"),
+            patch.object(ingest.local_embeddings, "add_documents"),
+        ]
+        for p in self.patches:
+            p.start()
+
+        self.paths = [os.path.join(self.tmp_dir, "jane.docx"), os.path.join(self.tmp_dir, "john.docx")]
+        write_docx(self.paths[0], ["Jane Roe", "jane@example.com", "Python and SQL developer, 6 years"])
+        write_docx(self.paths[1], ["John Doe", "Marketing lead: SEO, Excel and communication"])
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        resources.register("spacy_sm", parser._load_nlp)
+        resources.reset("spacy_sm")
+        feature_store._store = self.saved_store
+        database.DB_NAME = self.original_db
+        shutil.rmtree(self.tmp_dir)
+
+    def _ingest(self, **kwargs):
+        with patch.object(ingest, "extract_texts_parallel", wraps=ingest.extract_texts_parallel) as extract:
+            rows = ingest.ingest_files(self.paths, workers=1, **kwargs)
+        parsed = [os.path.basename(p) for call in extract.call_args_list for p in call.args[0]]
+        return rows, parsed
+
+    def test_rows_hold_features_titles_and_versions(self):
+        rows, parsed = self._ingest()
+        self.assertEqual(sorted(parsed), ["jane.docx", "john.docx"])
+        jane = rows["jane.docx"]
+        self.assertEqual(jane["name"], "Jane Roe")
+        self.assertEqual(jane["email"], "jane@example.com")
+        self.assertIn("python", ingest.resume_skills(jane))
+        self.assertEqual(jane["experience_level"], "Senior")
+        self.assertEqual(len(ingest.resume_top_titles(jane)), 3)
+        self.assertTrue(jane["resume_title"])
+        for column, version in ingest.current_versions().items():
+            self.assertEqual(jane[column], version)
+
+    def test_unchanged_files_are_skipped(self):
+        first, _ = self._ingest()
+        second, parsed = self._ingest()
+        self.assertEqual(parsed, [])
+        self.assertEqual(first, second)
+
+    def test_changed_content_is_reingested(self):
+        self._ingest()
+        write_docx(self.paths[1], ["John Doe", "Java and Spring backend engineer"])
+        rows, parsed = self._ingest()
+        self.assertEqual(parsed, ["john.docx"])
+        self.assertIn("java", ingest.resume_skills(rows["john.docx"]))
+
+    def test_version_change_reingests(self):
+        self._ingest()
+        for column in ("model_version", "extractor_version", "taxonomy_version"):
+            with self.subTest(column=column):
+                versions = {**ingest.current_versions(), column: "changed"}
+                with patch.object(ingest, "current_versions", return_value=versions):
+                    rows, parsed = self._ingest()
+                self.assertEqual(sorted(parsed), ["jane.docx", "john.docx"])
+                self.assertEqual(rows["jane.docx"][column], "changed")
+
+    def test_unreadable_files_are_left_out(self):
+        missing = os.path.join(self.tmp_dir, "missing.docx")
+        rows = ingest.ingest_files(self.paths + [missing], workers=1)
+        self.assertEqual(sorted(rows), ["jane.docx", "john.docx"])
+
+    def test_background_queue(self):
+        future = ingest.enqueue(self.paths, workers=1)
+        rows = future.result(timeout=120)
+        self.assertEqual(sorted(rows), ["jane.docx", "john.docx"])
+        self.assertEqual(sorted(database.get_resumes()), ["jane.docx", "john.docx"])
+
+    def test_background_failures_are_logged(self):
+        with patch.object(ingest, "ingest_files", side_effect=RuntimeError("boom")), \
+                self.assertLogs(level="ERROR") as logs:
+            future = ingest.enqueue(self.paths)
+            with self.assertRaises(RuntimeError):
+                future.result(timeout=10)
+        self.assertIn("boom", "\n".join(logs.output))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+from utils import local_embeddings, resources
+from utils.local_embeddings import LocalEmbedder, VectorStore, add_documents, semantic_scores
+
+CORPUS = ["python sql developer", "marketing copywriting", "python machine learning", "sales manager",
+          "java backend engineer", "data analyst excel"]
+
+
+class TestVectorStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.store = VectorStore(os.path.join(self.tmp_dir, "vectors.npy"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_appends_are_visible_as_memmap(self):
+        self.store.append(["a.pdf", "b.pdf"], np.eye(2, 4))
+        self.store.append(["c.pdf"], np.ones((1, 4)))
+        matrix, ids = self.store.load()
+        self.assertIsInstance(matrix, np.memmap)
+        self.assertEqual(matrix.shape, (3, 4))
+        self.assertEqual(ids, ["a.pdf", "b.pdf", "c.pdf"])
+        self.assertEqual(np.load(self.store.path).shape, (3, 4))
+
+    def test_latest_row_wins(self):
+        self.store.append(["a.pdf"], np.zeros((1, 4)))
+        self.store.append(["a.pdf"], np.ones((1, 4)))
+        self.assertEqual(self.store.latest_rows(), {"a.pdf": 1})
+
+    def test_rejects_dimension_change(self):
+        self.store.append(["a.pdf"], np.zeros((1, 4)))
+        with self.assertRaises(ValueError):
+            self.store.append(["b.pdf"], np.zeros((1, 3)))
+
+
+class TestEmbedderHeader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.saved_store, local_embeddings._store = local_embeddings._store, VectorStore(
+            os.path.join(self.tmp_dir, "vectors.npy"))
+        self.embedder = LocalEmbedder.fit(CORPUS, dim=4)
+        resources.register("local_embedder", lambda: self.embedder)
+        resources.reset("local_embedder")
+
+    def tearDown(self):
+        resources.register("local_embedder", local_embeddings._load_embedder)
+        resources.reset("local_embedder")
+        local_embeddings._store = self.saved_store
+        shutil.rmtree(self.tmp_dir)
+
+    def _switch_embedder(self, dim):
+        self.embedder = LocalEmbedder.fit(CORPUS[::-1], dim=dim)
+        resources.reset("local_embedder")
+
+    def test_header_records_embedder_and_dim(self):
+        add_documents(["a.pdf"], ["python developer"])
+        self.assertEqual(local_embeddings.get_store().header(),
+                         {"embedder": self.embedder.fingerprint, "dim": self.embedder.dim})
+        self.assertEqual(self.embedder.dim, 4)
+        self.assertIn("a.pdf", semantic_scores("python"))
+
+    def test_other_dimension_is_refused(self):
+        add_documents(["a.pdf"], ["python developer"])
+        self._switch_embedder(3)
+        with self.assertRaises(ValueError):
+            semantic_scores("python")
+        with self.assertRaises(ValueError):
+            add_documents(["b.pdf"], ["sales"])
+
+    def test_same_dimension_other_embedder_is_refused(self):
+        add_documents(["a.pdf"], ["python developer"])
+        self._switch_embedder(4)
+        with self.assertRaisesRegex(ValueError, "re-embed"):
+            semantic_scores("python")
+        with self.assertRaises(ValueError):
+            add_documents(["b.pdf"], ["sales"])
+
+    def test_store_without_header_is_checked_by_dimension(self):
+        local_embeddings.get_store().append(["a.pdf"], np.ones((1, 4)))
+        self.assertEqual(local_embeddings.get_store().header(), {"embedder": "", "dim": 4})
+        self.assertIn("a.pdf", semantic_scores("python"))
+        self._switch_embedder(3)
+        with self.assertRaises(ValueError):
+            semantic_scores("python")
+
+    def test_append_during_a_query_is_ignored(self):
+        store = local_embeddings.get_store()
+        add_documents(["a.pdf"], ["python developer"])
+        load = store.load
+
+        def load_then_append():
+            snapshot = load()
+            add_documents(["b.pdf", "a.pdf"], ["sales manager", "java engineer"])   # An upload lands mid-query
+            return snapshot
+
+        with patch.object(store, "load", side_effect=load_then_append):
+            scores = semantic_scores("python")
+        self.assertEqual(list(scores), ["a.pdf"])
+        self.assertEqual(store.latest_rows(), {"a.pdf": 2, "b.pdf": 1})
+
+    def test_clear_removes_header(self):
+        add_documents(["a.pdf"], ["python developer"])
+        local_embeddings.get_store().clear()
+        self.assertEqual(local_embeddings.get_store().header(), {})
+
+
+class TestLocalEmbedder(unittest.TestCase):
+
+    def test_tfidf_svd_vectors_are_unit_length(self):
+        corpus = ["python sql developer", "marketing copywriting", "python machine learning", "sales manager"]
+        vectors = LocalEmbedder.fit(corpus, dim=8).embed(corpus)
+        self.assertEqual(vectors.dtype, np.float32)
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from utils import database, local_embeddings, parser, resources
+from utils.local_embeddings import LocalEmbedder
+from utils.matcher import scoring_key
+
+
+class TestMatchCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.original_db = database.DB_NAME
+        database.DB_NAME = os.path.join(self.tmp_dir, "results.db")
+        database.init_db()
+
+    def tearDown(self):
+        database.DB_NAME = self.original_db
+        shutil.rmtree(self.tmp_dir)
+
+    def test_only_stored_pairs_are_returned(self):
+        version = scoring_key("exact")
+        database.put_cached_matches("jd1", version, {"r1": (87.5, ["python", "sql"], "Engineer")})
+        found = database.get_cached_matches("jd1", ["r1", "r2"], version)
+        self.assertEqual(found, {"r1": {"score": 87.5, "matched_skills": ["python", "sql"], "gpt_title": "Engineer"}})
+
+    def test_missing_title_is_kept_as_null(self):
+        version = scoring_key("exact")
+        database.put_cached_matches("jd1", version, {"r1": (40.0, ["python"], None)})
+        self.assertIsNone(database.get_cached_matches("jd1", ["r1"], version)["r1"]["gpt_title"])
+        database.put_cached_matches("jd1", version, {"r1": (40.0, ["python"], "Engineer")})
+        self.assertEqual(database.get_cached_matches("jd1", ["r1"], version)["r1"]["gpt_title"], "Engineer")
+
+    def test_keyed_by_jd_and_scoring_version(self):
+        database.put_cached_matches("jd1", scoring_key("exact"), {"r1": (50.0, ["python"], "Engineer")})
+        self.assertEqual(database.get_cached_matches("jd2", ["r1"], scoring_key("exact")), {})
+        self.assertEqual(database.get_cached_matches("jd1", ["r1"], scoring_key("semantic", 0.7)), {})
+
+    def test_scoring_key_ignores_weight_in_exact_mode(self):
+        self.assertEqual(scoring_key("exact", 0.3), scoring_key("exact", 0.9))
+        self.assertNotEqual(scoring_key("semantic", 0.3), scoring_key("semantic", 0.9))
+
+    def test_scoring_key_changes_with_the_local_embedder(self):
+        keys = {scoring_key("semantic", 0.5)}
+        corpus = ["python sql developer", "marketing copywriting", "sales manager", "java engineer"]
+        for embedder in (LocalEmbedder.fit(corpus, dim=2), LocalEmbedder.fit(corpus[::-1], dim=2)):
+            resources.register("local_embedder", lambda: embedder)
+            resources.reset("local_embedder")
+            try:
+                keys.add(scoring_key("semantic", 0.5))
+            finally:
+                resources.register("local_embedder", local_embeddings._load_embedder)
+                resources.reset("local_embedder")
+        self.assertEqual(len(keys), 3)
+
+
+    def test_taxonomy_edit_rescores_pairs(self):
+        taxonomy = os.path.join(self.tmp_dir, "skills.txt")
+        with open(taxonomy, "w", encoding="utf-8") as f:
+            f.write("python\nsql\n")
+        saved = parser._skill_matcher
+        try:
+            with patch.object(parser, "SKILL_TAXONOMY_PATH", taxonomy):
+                parser._skill_matcher = None
+                before = scoring_key("exact")
+                database.put_cached_matches("jd1", before, {"r1": (50.0, ["python"], "Engineer")})
+                self.assertIn("r1", database.get_cached_matches("jd1", ["r1"], scoring_key("exact")))
+
+                with open(taxonomy, "w", encoding="utf-8") as f:
+                    f.write("python\nsql|postgres\n")
+                parser._skill_matcher = None
+                after = scoring_key("exact")
+        finally:
+            parser._skill_matcher = saved
+        self.assertNotEqual(before, after)
+        self.assertEqual(database.get_cached_matches("jd1", ["r1"], after), {})   # Scored again by /match_all
+
+    def test_extractor_change_rescores_pairs(self):
+        before = scoring_key("exact")
+        with patch("utils.matcher.EXTRACTOR_VERSION", "changed"):
+            self.assertNotEqual(scoring_key("exact"), before)
+        with patch("utils.matcher.MAX_PDF_PAGES", 99):
+            self.assertNotEqual(scoring_key("exact"), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,9 @@ from utils.matcher import (
     calculate_match_score,
     calculate_synonym_boosted_score,
     generate_feedback,
-    get_bert_similarity
+    get_bert_similarity,
+    score_many,
+    SkillMatrix
 )
 
 
@@ -17,6 +19,27 @@ class TestMatcher(unittest.TestCase):
         self.assertIn("python", matched)
         self.assertIn("sql", matched)
 
+    def test_score_many_matches_single_scores(self):
+        resumes = [["python", "sql", "communication"], [], ["excel", "excel"], ["java"]]
+        jd_skills = ["python", "sql", "excel", "sql"]
+        batch = score_many(resumes, jd_skills)
+        for resume_skills, (score, matched) in zip(resumes, batch):
+            expected_score, expected_matched = calculate_match_score(resume_skills, jd_skills)
+            self.assertEqual(score, expected_score)
+            self.assertCountEqual(matched, expected_matched)
+
+    def test_score_many_empty_jd(self):
+        self.assertEqual(score_many([["python"]], []), [(0, [])])
+
+    def test_percent_matrix_matches_single_scores(self):
+        resumes = [["python", "sql", "communication"], [], ["excel"], ["java"]]
+        jds = [["python", "sql", "excel", "sql"], [], ["java", "go"]]
+        scores = SkillMatrix(resumes).percent_matrix(jds)
+        self.assertEqual(scores.shape, (3, 4))
+        for j, jd_skills in enumerate(jds):
+            for i, resume_skills in enumerate(resumes):
+                self.assertEqual(round(scores[j, i], 2), calculate_match_score(resume_skills, jd_skills)[0])
+
     def test_synonym_boosted_score(self):
         resume_skills = ["leadership"]
         jd_skills = ["management"]
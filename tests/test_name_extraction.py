@@ -0,0 +1,83 @@
+import unittest
+
+import spacy
+
+from utils import parser, resources
+from utils.parser import (
+    NAME_HEADER_CHARS,
+    extract_name,
+    extract_names,
+    extract_resume_data,
+    extract_resume_data_many
+)
+
+
+class _RecordingNlp:
+    """
+    Blank English pipeline with an entity ruler for the test names; records the text lengths it tags.
+    """
+
+    def __init__(self):
+        self.nlp = spacy.blank("en")
+        self.nlp.add_pipe("entity_ruler").add_patterns([
+            {"label": "PERSON", "pattern": "Jane Roe"},
+            {"label": "PERSON", "pattern": "John Doe"},
+        ])
+        self.tagged = []
+
+    @property
+    def pipe_names(self):
+        return self.nlp.pipe_names
+
+    def __call__(self, text, disable=None):
+        self.tagged.append(len(text))
+        return self.nlp(text)
+
+    def pipe(self, texts, batch_size=None, n_process=1, disable=None):
+        for text in texts:
+            self.tagged.append(len(text))
+            yield self.nlp(text)
+
+
+FILLER = "Responsible for data pipelines and reporting. " * 40   # Well past the header window
+
+
+class TestNameExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.nlp = _RecordingNlp()
+        resources.register("spacy_sm", lambda: self.nlp)
+        resources.reset("spacy_sm")
+
+    def tearDown(self):
+        resources.register("spacy_sm", parser._load_nlp)
+        resources.reset("spacy_sm")
+
+    def test_name_in_header_tags_only_the_header(self):
+        self.assertEqual(extract_name("Jane Roe\njane@example.com\n" + FILLER), "Jane Roe")
+        self.assertEqual(self.nlp.tagged, [NAME_HEADER_CHARS])
+
+    def test_full_text_fallback(self):
+        self.assertEqual(extract_name(FILLER + "References: John Doe"), "John Doe")
+        self.assertEqual(self.nlp.tagged, [NAME_HEADER_CHARS, len(FILLER) + len("References: John Doe")])
+
+    def test_short_text_has_no_fallback(self):
+        self.assertIsNone(extract_name("Python developer"))
+        self.assertEqual(len(self.nlp.tagged), 1)
+
+    def test_batch_matches_single_documents(self):
+        texts = ["Jane Roe\n" + FILLER, FILLER + "John Doe", "No name here", "", "John Doe, SQL analyst"]
+        expected = [extract_name(text) for text in texts]
+        self.nlp.tagged.clear()
+        self.assertEqual(extract_names(texts, batch_size=2), expected)
+        self.assertEqual(expected, ["Jane Roe", "John Doe", None, None, "John Doe"])
+        # One header pass over every text, then full text only where the header had no name
+        self.assertEqual(len(self.nlp.tagged), len(texts) + 1)
+
+    def test_resume_data_batch_matches_single_documents(self):
+        texts = ["Jane Roe\njane@example.com\nPython and SQL, 3 years", FILLER + "John Doe\n+1 555 123 4567"]
+        self.assertEqual(extract_resume_data_many(texts), [extract_resume_data(text) for text in texts])
+
+
+if __name__ == "__main__":
+    unittest.main()
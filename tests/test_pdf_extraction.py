@@ -0,0 +1,120 @@
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+from utils import parser
+from utils.parser import (
+    MAX_PDF_PAGES,
+    extract_features,
+    extract_text_from_file,
+    extract_text_from_pdf,
+    extract_texts_parallel,
+    iter_pdf_pages
+)
+
+FIXTURE_PDF = os.path.join(os.path.dirname(__file__), "fixtures", "resume.pdf")
+
+
+def write_pdf(path, pages):
+    """
+    Minimal PDF with one line of Helvetica text per page.
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+class TestPdfPages(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.pages = [f"Page {i} python developer" for i in range(25)]
+        self.path = os.path.join(self.tmp_dir, "long.pdf")
+        write_pdf(self.path, self.pages)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_iter_pdf_pages_in_order(self):
+        self.assertEqual(list(iter_pdf_pages(self.path)), self.pages)
+        self.assertEqual(list(iter_pdf_pages(self.path, max_pages=3, start=10)), self.pages[10:13])
+
+    def test_whole_document_by_default(self):
+        self.assertEqual(extract_text_from_pdf(self.path), "".join(p + "\n" for p in self.pages))
+
+    def test_page_cap(self):
+        text = extract_text_from_pdf(self.path, max_pages=2)
+        self.assertEqual(text, "Page 0 python developer\nPage 1 python developer\n")
+
+    def test_ingest_cap_is_opt_in_for_batch_extraction(self):
+        (_, capped, error), = extract_texts_parallel([self.path], workers=1, use_cache=False,
+                                                     max_pages=MAX_PDF_PAGES)
+        self.assertIsNone(error)
+        self.assertEqual(capped.count("\n"), MAX_PDF_PAGES)
+        (_, full, _), = extract_texts_parallel([self.path], workers=1, use_cache=False)
+        self.assertEqual(full.count("\n"), len(self.pages))
+
+    def test_cap_is_part_of_the_cache_key(self):
+        self.assertNotEqual(parser._cache_version(None), parser._cache_version(MAX_PDF_PAGES))
+
+    def test_long_pdf_is_split_across_processes(self):
+        with patch("utils.parser.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool:
+            text = extract_text_from_pdf(self.path, workers=3)
+        pool.assert_called_once_with(max_workers=3)
+        self.assertEqual(text, extract_text_from_pdf(self.path))
+
+    def test_short_pdf_is_read_in_process(self):
+        with patch("utils.parser.ProcessPoolExecutor", wraps=ProcessPoolExecutor) as pool:
+            text = extract_text_from_pdf(self.path, max_pages=parser.PARALLEL_PAGE_THRESHOLD - 1, workers=3)
+        pool.assert_not_called()
+        self.assertEqual(text.count("\n"), parser.PARALLEL_PAGE_THRESHOLD - 1)
+
+
+class TestPdfFixture(unittest.TestCase):
+    """
+    A one-page resume saved by a real PDF writer, read through the same paths uploads take.
+    """
+
+    def test_text(self):
+        text = extract_text_from_file(FIXTURE_PDF, use_cache=False)
+        self.assertTrue(text.startswith("John Doe\nEmail: john.doe@example.com\n"))
+        self.assertIn("- Worked on data pipelines using Python and SQL.\n", text)
+        self.assertEqual(len(list(iter_pdf_pages(FIXTURE_PDF))), 1)
+
+    def test_batch_extraction_matches_single_file(self):
+        (path, text, error), = extract_texts_parallel([FIXTURE_PDF], workers=1, use_cache=False,
+                                                      max_pages=MAX_PDF_PAGES)
+        self.assertIsNone(error)
+        self.assertEqual((path, text), (FIXTURE_PDF, extract_text_from_file(FIXTURE_PDF, use_cache=False)))
+
+    def test_features(self):
+        features = extract_features(extract_text_from_file(FIXTURE_PDF, use_cache=False), with_name=False)
+        self.assertEqual(features.email, "john.doe@example.com")
+        for skill in ("python", "sql", "machine learning", "data analysis", "leadership"):
+            self.assertIn(skill, features.skills)
+
+
+if __name__ == "__main__":
+    unittest.main()
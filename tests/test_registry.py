@@ -0,0 +1,79 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import joblib
+import numpy as np
+
+from ml_model import registry
+from ml_model.registry import ModelRegistry
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.registry = ModelRegistry(os.path.join(self.tmp_dir, "registry"), check_interval=0)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_publish_and_promote(self):
+        first = self.registry.publish("clf", {"weights": [1]})
+        second = self.registry.publish("clf", {"weights": [2]})
+        self.assertEqual(self.registry.versions("clf"), [first, second])
+        self.assertIsNone(self.registry.current_version("clf"))
+        with self.assertRaises(FileNotFoundError):
+            self.registry.load("clf")
+
+        self.registry.promote("clf", second)
+        self.assertEqual(self.registry.load("clf"), {"weights": [2]})
+        self.registry.promote("clf", first)  # Rollback is just promoting an older version
+        self.assertEqual(self.registry.load("clf"), {"weights": [1]})
+
+    def test_promote_unknown_version(self):
+        with self.assertRaises(ValueError):
+            self.registry.promote("clf", "v9")
+
+    def test_arrays_are_memory_mapped(self):
+        self.registry.publish("clf", {"coef": np.arange(100_000, dtype=np.float64)}, promote=True)
+        loaded = self.registry.load("clf")
+        self.assertIsInstance(loaded["coef"], np.memmap)
+        self.assertEqual(loaded["coef"][-1], 99_999)
+
+    def test_current_version_is_rechecked_after_interval(self):
+        slow = ModelRegistry(self.registry.root, check_interval=60)
+        self.registry.publish("clf", "a", promote=True)
+        self.assertEqual(slow.current_version("clf"), "v1")
+        self.registry.publish("clf", "b", promote=True)
+        self.assertEqual(slow.current_version("clf"), "v1")  # Still within the check interval
+        self.assertEqual(self.registry.current_version("clf"), "v2")
+
+    def test_legacy_fallback(self):
+        legacy_path = os.path.join(self.tmp_dir, "legacy.pkl")
+        joblib.dump("legacy model", legacy_path)
+        saved, registry._registry = registry._registry, self.registry
+        try:
+            self.assertEqual(registry.load_model("clf", legacy_path), "legacy model")
+            self.registry.publish("clf", "registry model", promote=True)
+            self.assertEqual(registry.load_model("clf", legacy_path), "registry model")
+        finally:
+            registry._registry = saved
+
+    def test_version_is_loaded_with_the_model(self):
+        legacy_path = os.path.join(self.tmp_dir, "legacy.pkl")
+        joblib.dump("legacy model", legacy_path)
+        saved, registry._registry = registry._registry, self.registry
+        try:
+            version, model = registry.load_model_version("clf", legacy_path)
+            self.assertEqual((version, model), (registry.model_version("clf", legacy_path), "legacy model"))
+            self.assertTrue(version.startswith("legacy-"))
+            self.registry.publish("clf", "registry model", promote=True)
+            self.assertEqual(registry.load_model_version("clf", legacy_path), ("v1", "registry model"))
+        finally:
+            registry._registry = saved
+
+
+if __name__ == "__main__":
+    unittest.main()
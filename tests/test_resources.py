@@ -0,0 +1,53 @@
+import unittest
+from utils import resources
+
+
+class TestResources(unittest.TestCase):
+
+    def setUp(self):
+        self.calls = 0
+
+        def loader():
+            self.calls += 1
+            return {"model": "loaded"}
+
+        resources.register("test_model", loader)
+        resources.reset("test_model")
+
+    def test_lazy_single_load(self):
+        self.assertFalse(resources.is_loaded("test_model"))
+        first = resources.get("test_model")
+        second = resources.get("test_model")
+        self.assertIs(first, second)
+        self.assertEqual(self.calls, 1)
+
+    def test_warm_up_reports_timings(self):
+        timings = resources.warm_up(["test_model"])
+        self.assertIn("test_model", timings)
+        self.assertTrue(resources.status()["test_model"])
+
+    def test_unknown_resource(self):
+        with self.assertRaises(KeyError):
+            resources.get("does_not_exist")
+
+    def test_reloads_on_version_change(self):
+        state = {"version": 1, "fail": False}
+
+        def loader():
+            if state["fail"]:
+                raise RuntimeError("broken artifact")
+            return {"version": state["version"]}
+
+        resources.register("versioned_model", loader, version=lambda: state["version"])
+        resources.reset("versioned_model")
+        self.assertEqual(resources.get("versioned_model"), {"version": 1})
+        state["version"] = 2
+        self.assertEqual(resources.get("versioned_model"), {"version": 2})
+
+        # A version that fails to load leaves the previous one in service
+        state["version"], state["fail"] = 3, True
+        self.assertEqual(resources.get("versioned_model"), {"version": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from utils import database
+from utils.local_embeddings import VectorStore
+from utils.retrieval import RetrievalIndex, top_k_blocks
+
+
+class TestTopKBlocks(unittest.TestCase):
+
+    def test_ties_go_to_lower_row_across_blocks(self):
+        scores = np.array([1, 5, 5, 3, 5, 5, 0], dtype=float)
+        for block_rows in (2, 3, 100):
+            rows, top = top_k_blocks(len(scores), 3, lambda start, stop: scores[start:stop], block_rows)
+            self.assertEqual(rows, [1, 2, 4])
+            self.assertEqual(top, [5.0, 5.0, 5.0])
+
+    def test_skipped_rows_are_never_returned(self):
+        scores = np.array([-np.inf, 2.0, -np.inf])
+        rows, _ = top_k_blocks(len(scores), 5, lambda start, stop: scores[start:stop])
+        self.assertEqual(rows, [1])
+
+
+class TestRetrievalIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.original_db = database.DB_NAME
+        database.DB_NAME = os.path.join(self.tmp_dir, "results.db")
+        database.init_db()
+        resumes = {"a.pdf": "python, sql", "b.pdf": "python", "c.pdf": "", "d.pdf": "python, sql, docker"}
+        for filename, skills in resumes.items():
+            database.upsert_resume(filename, "hash", "", "", "", skills, 0, "Junior")
+        self.store = VectorStore(os.path.join(self.tmp_dir, "vectors.npy"))
+        self.index = RetrievalIndex(self.store, ivf_path=os.path.join(self.tmp_dir, "ivf.npz"))
+
+    def tearDown(self):
+        database.DB_NAME = self.original_db
+        shutil.rmtree(self.tmp_dir)
+
+    def test_exact_top_k(self):
+        results = self.index.search("", ["python", "sql"], k=2)
+        self.assertEqual([r["filename"] for r in results], ["a.pdf", "d.pdf"])
+        self.assertEqual(results[0]["score"], 100.0)
+        self.assertEqual(results[0]["matched_skills"], ["python", "sql"])
+
+    def test_picks_up_new_ingestions(self):
+        self.index.search("", ["docker"], k=1)
+        database.upsert_resume("e.pdf", "hash", "", "", "", "docker", 0, "Junior")
+        results = self.index.search("", ["docker"], k=2)
+        self.assertEqual([r["filename"] for r in results], ["d.pdf", "e.pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
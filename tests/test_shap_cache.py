@@ -0,0 +1,135 @@
+import os
+import shutil
+import tempfile
+import unittest
+import importlib.util
+from unittest.mock import patch
+
+import numpy as np
+from scipy import sparse
+
+from ml_model import feature_store, job_title_predictor, registry, shap_explainer
+from utils import resources
+
+
+class _WeightExplainer:
+    """
+    Explainer stand-in: each feature's contribution is its TF-IDF value times a per-class weight.
+    """
+
+    def __init__(self, vectorizer=None, model=None):
+        pass
+
+    def shap_values(self, X):
+        assert sparse.issparse(X), "TF-IDF rows should reach the explainer sparse"
+        weights = np.arange(1, 6, dtype=float)
+        return X.toarray()[:, :, None] * weights[None, None, :]
+
+
+def _fake_png(explanation, path):
+    with open(path, "wb") as f:
+        f.write(b"png")
+
+
+class TestExplanationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.paths = []
+        self.max_pages = []
+        for i, text in enumerate(["python sql developer", "marketing seo brand", "excel tableau analysis"]):
+            path = os.path.join(self.tmp_dir, f"resume{i}.pdf")
+            with open(path, "w") as f:
+                f.write(text)
+            self.paths.append(path)
+
+        self.saved_store, feature_store._store = feature_store._store, feature_store.FeatureStore(
+            os.path.join(self.tmp_dir, "features"))
+        resources.reset("job_title_explainer")
+        self.patches = [
+            patch.object(shap_explainer, "_build_explainer", _WeightExplainer),
+            patch.object(shap_explainer, "SHAP_CACHE_DIR", os.path.join(self.tmp_dir, "shap")),
+            patch.object(shap_explainer, "_render_png", _fake_png),
+            patch("utils.parser.extract_text_from_file", self._read),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def _read(self, path, max_pages=None):
+        self.max_pages.append(max_pages)
+        with open(path) as f:
+            return f.read()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        feature_store._store = self.saved_store
+        resources.reset("job_title_explainer")
+        shutil.rmtree(self.tmp_dir)
+
+    def test_second_request_is_a_cache_read(self):
+        with patch.object(shap_explainer, "explain_texts", wraps=shap_explainer.explain_texts) as explain:
+            first = shap_explainer.get_explanation(self.paths[0])
+            second = shap_explainer.get_explanation(self.paths[0])
+        self.assertEqual(explain.call_count, 1)
+        self.assertEqual(first, second)
+        self.assertTrue(os.path.exists(os.path.join(
+            self.tmp_dir, "shap", first["model_version"], shap_explainer.text_version(), first["resume_hash"] + ".png")))
+
+    def test_batch_explains_only_misses(self):
+        shap_explainer.get_explanation(self.paths[1])
+        with patch.object(shap_explainer, "explain_texts", wraps=shap_explainer.explain_texts) as explain:
+            results = shap_explainer.explain_files(self.paths)
+        self.assertEqual(len(explain.call_args[0][0]), 2)
+        self.assertEqual([r["filename"] for r in results], ["resume0.pdf", "resume1.pdf", "resume2.pdf"])
+
+    def test_new_model_version_recomputes(self):
+        shap_explainer.get_explanation(self.paths[0])
+        _, artifact = registry.load_model_version(job_title_predictor.MODEL_NAME, job_title_predictor.MODEL_PATH)
+        try:
+            with patch.object(registry, "model_version", return_value="v99"), \
+                    patch.object(registry, "load_model_version", return_value=("v99", artifact)) as load, \
+                    patch.object(shap_explainer, "explain_texts", wraps=shap_explainer.explain_texts) as explain:
+                result = shap_explainer.get_explanation(self.paths[0])
+                # Prediction and explanation share one load of the new model
+                self.assertIs(resources.get("job_title_explainer")[2], resources.get("job_title_model")[2])
+                self.assertEqual(load.call_count, 1)
+        finally:
+            resources.reset("job_title_model")
+        self.assertEqual(explain.call_count, 1)
+        self.assertEqual(result["model_version"], "v99")
+
+    def test_text_is_read_like_ingestion(self):
+        from utils import parser
+
+        result = shap_explainer.get_explanation(self.paths[0])
+        self.assertEqual(self.max_pages, [parser.MAX_PDF_PAGES])
+        self.assertIn(f"/{shap_explainer.text_version()}/", result["png"])
+        with patch.object(parser, "MAX_PDF_PAGES", parser.MAX_PDF_PAGES + 1), \
+                patch.object(shap_explainer, "explain_texts", wraps=shap_explainer.explain_texts) as explain:
+            shap_explainer.get_explanation(self.paths[0])
+        self.assertEqual(explain.call_count, 1)   # A new page cap is a cache miss
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            shap_explainer.get_explanation(os.path.join(self.tmp_dir, "missing.pdf"))
+
+    def test_features_ranked_by_magnitude(self):
+        features = shap_explainer.explain_texts(["python sql developer"])[0]["features"]
+        magnitudes = [abs(f["shap"]) for f in features]
+        self.assertEqual(magnitudes, sorted(magnitudes, reverse=True))
+        self.assertTrue(all(f["shap"] != 0 for f in features))
+
+
+@unittest.skipUnless(importlib.util.find_spec("shap"), "shap is not installed")
+class TestTreeExplainer(unittest.TestCase):
+
+    def test_explains_predicted_title(self):
+        resources.reset("job_title_explainer")
+        explanation = shap_explainer.explain_prediction("python developer with sql and flask")
+        self.assertTrue(explanation["features"])
+        self.assertIsInstance(explanation["predicted_title"], str)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from utils import database, skill_index
+
+
+class TestSkillIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.original_db = database.DB_NAME
+        database.DB_NAME = os.path.join(self.tmp_dir, "results.db")
+        database.init_db()
+        skill_index.update_many({
+            "a.pdf": ["python", "sql"],
+            "b.pdf": ["python"],
+            "c.pdf": ["python", "sql", "docker"],
+        })
+
+    def tearDown(self):
+        database.DB_NAME = self.original_db
+        shutil.rmtree(self.tmp_dir)
+
+    def test_and_filter(self):
+        self.assertEqual(skill_index.filenames_with_all(["python", "sql"]), {"a.pdf", "c.pdf"})
+        self.assertEqual(skill_index.filenames_with_all(["Docker"]), {"c.pdf"})
+        self.assertEqual(skill_index.filenames_with_all(["python", "rust"]), set())
+
+    def test_postings_are_sorted_ids(self):
+        posting = skill_index.postings(["python"])["python"]
+        self.assertEqual(list(posting), sorted(posting))
+        self.assertEqual(len(posting), 3)
+
+    def test_incremental_update(self):
+        skill_index.update_many({"b.pdf": ["sql"]})
+        self.assertEqual(skill_index.filenames_with_all(["python"]), {"a.pdf", "c.pdf"})
+        self.assertEqual(skill_index.filenames_with_all(["sql"]), {"a.pdf", "b.pdf", "c.pdf"})
+
+    def test_match_counts(self):
+        self.assertEqual(skill_index.match_counts(["sql", "docker", "go"]), {"a.pdf": 1, "c.pdf": 2})
+
+    def test_rebuild_from_resumes(self):
+        database.upsert_resume("d.pdf", "hash", "", "", "", "go, sql", 0, "Junior")
+        skill_index.index_missing()
+        self.assertEqual(skill_index.filenames_with_all(["go"]), {"d.pdf"})
+        skill_index.rebuild()
+        self.assertEqual(skill_index.filenames_with_all(["sql"]), {"d.pdf"})
+
+
+    def test_concurrent_updates_of_a_new_file(self):
+        errors = []
+        start = threading.Barrier(8)
+
+        def ingest(worker):
+            start.wait()
+            try:
+                for round_ in range(10):
+                    skill_index.update_many({"new.pdf": ["python", f"skill{worker}"],
+                                             f"w{worker}-{round_}.pdf": ["sql"]})
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=ingest, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(skill_index.filenames_with_all(["sql"])), 2 + 8 * 10)
+        self.assertIn("new.pdf", skill_index.filenames_with_all(["python"]))
+        skill_postings = skill_index.postings([f"skill{worker}" for worker in range(8)])
+        self.assertEqual(sum(len(posting) for posting in skill_postings.values()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
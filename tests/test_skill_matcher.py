@@ -0,0 +1,45 @@
+import os
+import unittest
+from utils.skill_matcher import SkillMatcher, load_taxonomy
+
+TAXONOMY_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "skill_taxonomy.txt")
+
+
+class TestSkillMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = SkillMatcher([
+            "java", "javascript", "c++", "sql", "nlp",
+            "machine learning", ("scikit-learn", ["sklearn"]), "node.js"
+        ])
+
+    def test_word_boundaries(self):
+        skills = self.matcher.extract("Frontend work in JavaScript; no relation to nlpx or mysqlish.")
+        self.assertEqual(skills, ["javascript"])
+
+    def test_symbols_and_phrases(self):
+        text = "C++/SQL, Machine-Learning with sklearn and Node.js."
+        self.assertEqual(self.matcher.extract(text),
+                         ["c++", "sql", "machine learning", "scikit-learn", "node.js"])
+
+    def test_offsets_and_counts(self):
+        text = "Java, then more Java and SQL"
+        matches = self.matcher.find(text)
+        self.assertEqual(matches[0], ("java", 0, 4))
+        self.assertEqual(text[matches[-1][1]:matches[-1][2]], "SQL")
+        self.assertEqual(self.matcher.counts(text), {"java": 2, "sql": 1})
+
+    def test_large_taxonomy(self):
+        skills = [f"skill{i} tool" for i in range(10000)] + ["python"]
+        matcher = SkillMatcher(skills)
+        text = "Python and skill9999 tool and skill42 tool, but not skill7 alone. " * 50
+        self.assertEqual(matcher.extract(text), ["python", "skill9999 tool", "skill42 tool"])
+
+    def test_taxonomy_file_covers_keywords(self):
+        canonical = {name for name, _ in load_taxonomy(TAXONOMY_PATH)}
+        for skill in ["python", "java", "c++", "sql", "nlp", "machine learning", "excel"]:
+            self.assertIn(skill, canonical)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from utils import matcher, resources, skill_vectors
+from utils.matcher import calculate_synonym_boosted_score, calculate_synonym_boosted_scores
+from utils.skill_vectors import SkillVectorTable
+
+STUB_VECTORS = {
+    "python": [1.0, 0.0, 0.0, 0.0],
+    "python3": [0.95, 0.31, 0.0, 0.0],
+    "python 3": [0.95, 0.31, 0.0, 0.0],
+    "leadership": [0.0, 1.0, 0.0, 0.0],
+    "management": [0.0, 0.9, 0.44, 0.0],
+    "mentoring": [0.0, 0.6, 0.0, 0.8],
+    "sql": [0.0, 0.0, 1.0, 0.0],
+    "database": [0.0, 0.0, 0.8, 0.6],
+    "mysql": [0.0, 0.0, 0.9, 0.44],
+}
+
+
+class _Doc:
+    def __init__(self, text):
+        self.vector = np.array(STUB_VECTORS.get(text, [0.0] * 4), dtype=np.float32) * 3   # Unnormalized, like spaCy
+
+
+class _StubNlp:
+    """
+    Stands in for en_core_web_md: fixed 4-d vectors, zero for unknown words.
+    """
+
+    class vocab:
+        class vectors:
+            pass
+        vectors_length = 4
+
+    def __init__(self):
+        self.embedded = []
+
+    def pipe(self, texts, batch_size=None):
+        for text in texts:
+            self.embedded.append(text)
+            yield _Doc(text)
+
+
+class TestSkillVectors(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.nlp = _StubNlp()
+        resources.register("spacy_md", lambda: self.nlp)
+        resources.reset("spacy_md")
+        self.table = SkillVectorTable.build(list(STUB_VECTORS))
+        resources.register("skill_vectors", lambda: self.table)
+        resources.reset("skill_vectors")
+        self.nlp.embedded.clear()
+
+    def tearDown(self):
+        resources.register("spacy_md", matcher._load_nlp)
+        resources.reset("spacy_md")
+        resources.register("skill_vectors", skill_vectors._load_table)
+        resources.reset("skill_vectors")
+        shutil.rmtree(self.tmp_dir)
+
+    def test_rows_are_unit_length(self):
+        norms = np.linalg.norm(self.table.vectors(["python", "database"]), axis=1)
+        np.testing.assert_allclose(norms, 1.0, rtol=1e-6)
+        self.assertEqual(self.nlp.embedded, [])   # Precomputed, nothing embedded on lookup
+
+    def test_save_and_load(self):
+        path = os.path.join(self.tmp_dir, "skill_vectors.npz")
+        self.table.save(path)
+        loaded = SkillVectorTable.load(path)
+        np.testing.assert_array_equal(loaded.vectors(["sql", "mysql"]), self.table.vectors(["sql", "mysql"]))
+
+    def test_unseen_skills_are_embedded_once(self):
+        self.table.vectors(["rust", "python", "rust"])
+        self.table.vectors(["rust"])
+        self.assertEqual(self.nlp.embedded, ["rust"])
+
+    def test_missing_file_falls_back_to_per_skill_embedding(self):
+        with patch.object(skill_vectors, "SKILL_VECTORS_PATH", os.path.join(self.tmp_dir, "missing.npz")):
+            table = skill_vectors._load_table()
+        self.assertEqual(len(table), 0)
+        np.testing.assert_allclose(table.vectors(["sql"]), self.table.vectors(["sql"]), rtol=1e-6)
+        self.assertEqual(self.nlp.embedded, ["sql"])
+
+    def test_batch_matches_single_scores(self):
+        resumes = [["leadership"], ["python3", "sql"], [], ["excel"], ["mysql", "leadership", "python"]]
+        jd_skills = ["Management", "SQL", "Python", "Excel"]
+        batch = calculate_synonym_boosted_scores(resumes, jd_skills)
+        for resume_skills, (score, matched) in zip(resumes, batch):
+            expected_score, expected_matched = calculate_synonym_boosted_score(resume_skills, jd_skills)
+            self.assertEqual(score, expected_score)
+            self.assertCountEqual(matched, expected_matched)
+        self.assertEqual(batch[0], (25.0, ["management"]))
+
+    def test_identical_strings_match_without_vectors(self):
+        # "excel" has no vector (all zero, similarity 0) but the same string always matches
+        self.assertEqual(calculate_synonym_boosted_score(["excel"], ["excel"]), (100.0, ["excel"]))
+
+    def test_empty_jd(self):
+        self.assertEqual(calculate_synonym_boosted_scores([["python"], []], []), [(0, []), (0, [])])
+
+
+if __name__ == "__main__":
+    unittest.main()
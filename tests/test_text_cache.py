@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import unittest
+from utils import text_cache
+
+
+class TestTextCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, "cache.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_digest_changes_with_content(self):
+        path = os.path.join(self.tmp_dir, "resume.pdf")
+        with open(path, "wb") as f:
+            f.write(b"first")
+        first = text_cache.file_digest(path)
+        with open(path, "wb") as f:
+            f.write(b"second")
+        self.assertNotEqual(first, text_cache.file_digest(path))
+
+    def test_key_includes_extractor_version(self):
+        self.assertNotEqual(text_cache.cache_key("abc", "1"), text_cache.cache_key("abc", "2"))
+
+    def test_roundtrip(self):
+        text_cache.put_text("k", "Python developer", db_path=self.db_path)
+        self.assertEqual(text_cache.get_text("k", db_path=self.db_path), "Python developer")
+        self.assertIsNone(text_cache.get_text("missing", db_path=self.db_path))
+
+    def test_lru_eviction(self):
+        text_cache.put_text("old", "a" * 10, db_path=self.db_path, max_bytes=25)
+        text_cache.put_text("recent", "b" * 10, db_path=self.db_path, max_bytes=25)
+        text_cache.get_text("old", db_path=self.db_path)  # "old" becomes most recently used
+        text_cache.put_text("new", "c" * 10, db_path=self.db_path, max_bytes=25)
+        self.assertIsNotNone(text_cache.get_text("old", db_path=self.db_path))
+        self.assertIsNone(text_cache.get_text("recent", db_path=self.db_path))
+        self.assertIsNotNone(text_cache.get_text("new", db_path=self.db_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
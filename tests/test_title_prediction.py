@@ -0,0 +1,55 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from ml_model import feature_store
+from ml_model.job_title_predictor import predict_job_title, predict_job_title_many, top_k_classes
+from ml_model.resume_classifier import predict_resume_title, predict_resume_title_many
+
+
+class TestTopKClasses(unittest.TestCase):
+
+    def test_matches_reversed_argsort_with_ties(self):
+        rng = np.random.default_rng(0)
+        probs = rng.integers(0, 3, size=(200, 6)).astype(float)
+        expected = np.array([np.argsort(row, kind="stable")[::-1][:3] for row in probs])
+        np.testing.assert_array_equal(top_k_classes(probs, 3), expected)
+
+    def test_k_larger_than_classes(self):
+        self.assertEqual(top_k_classes(np.array([[0.2, 0.8]]), 3).tolist(), [[1, 0]])
+
+
+class TestBatchPrediction(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.saved_store, feature_store._store = feature_store._store, feature_store.FeatureStore(self.tmp_dir)
+
+    def tearDown(self):
+        feature_store._store = self.saved_store
+        shutil.rmtree(self.tmp_dir)
+
+    texts = [
+        "Python developer with Flask, SQL and REST API experience",
+        "Marketing campaigns, SEO, social media and brand strategy",
+        "Excel, Tableau dashboards and statistical data analysis",
+    ]
+
+    def test_job_titles_match_single_calls(self):
+        self.assertEqual(predict_job_title_many(self.texts), [predict_job_title(t) for t in self.texts])
+
+    def test_resume_titles_match_single_calls(self):
+        texts = self.texts + ["   "]
+        results = predict_resume_title_many(texts)
+        self.assertEqual(results, [predict_resume_title(t) for t in texts])
+        self.assertEqual(results[-1], ("Unknown", 0.0))
+
+    def test_empty_batch(self):
+        self.assertEqual(predict_job_title_many([]), [])
+        self.assertEqual(predict_resume_title_many([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
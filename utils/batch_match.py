@@ -0,0 +1,112 @@
+import os
+import csv
+import argparse
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.ingest import ingest_files, resume_skills
+from utils.matcher import SkillMatrix
+from utils.parser import PARSE_TIMEOUT, extract_texts_parallel, extract_jd_skills
+
+
+# ==============================
+# 📊 JD × Resume Score Matrix
+# ==============================
+
+class BatchMatch:
+    """
+    Exact skill-match scores of several JDs against the same resumes.
+    scores[j, i] is calculate_match_score(resume i, JD j) before rounding.
+    """
+
+    def __init__(self, jd_names: List[str], jd_skills: List[List[str]], filenames: List[str],
+                 resumes: Dict[str, dict], skills: SkillMatrix, scores: np.ndarray):
+        self.jd_names = jd_names
+        self.jd_skills = jd_skills
+        self.filenames = filenames
+        self.resumes = resumes
+        self.skills = skills
+        self.scores = scores
+
+    def ranking(self, jd_name: str, k: Optional[int] = None) -> List[dict]:
+        """
+        Resumes for one JD, best first (ties keep folder order).
+        """
+        j = self.jd_names.index(jd_name)
+        order = np.argsort(-self.scores[j], kind="stable")[:k]
+        matched = self.skills.matched(order, self.jd_skills[j])
+        return [{
+            "filename": self.filenames[i],
+            "name": self.resumes[self.filenames[i]]["name"] or "N/A",
+            "experience_level": self.resumes[self.filenames[i]]["experience_level"],
+            "score": round(float(self.scores[j, i]), 2),
+            "matched_skills": matched_skills,
+        } for i, matched_skills in zip(order.tolist(), matched)]
+
+    # === Export ===
+    def header(self) -> List[str]:
+        return ["filename", "name", *self.jd_names]
+
+    def rows(self):
+        rounded = np.round(self.scores, 2)
+        for i, filename in enumerate(self.filenames):
+            yield [filename, self.resumes[filename]["name"] or "", *rounded[:, i].tolist()]
+
+    def to_csv(self, f) -> None:
+        writer = csv.writer(f)
+        writer.writerow(self.header())
+        writer.writerows(self.rows())
+
+    def to_parquet(self, f) -> None:
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("⚠️ Parquet export needs pandas and pyarrow: pip install pandas pyarrow")
+        pd.DataFrame(list(self.rows()), columns=self.header()).to_parquet(f, index=False)
+
+
+def match_jds(jd_paths: List[str], resume_paths: List[str], workers: Optional[int] = None,
+              timeout: float = PARSE_TIMEOUT) -> BatchMatch:
+    """
+    Score every JD against every resume in one pass.
+
+    Each resume is parsed at most once (and not at all if its ingested
+    features are current); all JDs are then scored with a single sparse product.
+    """
+    resumes = ingest_files(resume_paths, workers=workers, timeout=timeout)
+    filenames = list(resumes)
+    skills = SkillMatrix([resume_skills(resumes[name]) for name in filenames])
+
+    jd_texts = {}
+    for path, text, error in extract_texts_parallel(jd_paths, workers=workers, timeout=timeout):
+        if error:
+            raise ValueError(f"Could not read JD {os.path.basename(path)}: {error}")
+        jd_texts[path] = text
+    jd_names = [os.path.basename(path) for path in jd_paths]
+    jd_skills = [extract_jd_skills(jd_texts[path]) for path in jd_paths]
+
+    return BatchMatch(jd_names, jd_skills, filenames, resumes, skills, skills.percent_matrix(jd_skills))
+
+
+if __name__ == "__main__":
+    from config import UPLOAD_FOLDER_RESUMES, UPLOAD_FOLDER_JD, ALLOWED_EXTENSIONS, PARSE_WORKERS
+    from utils.database import init_db
+
+    parser = argparse.ArgumentParser(description="Score several JDs against all uploaded resumes.")
+    parser.add_argument("jds", nargs="*", help=f"JD files (default: everything in {UPLOAD_FOLDER_JD})")
+    parser.add_argument("--out", default="match_matrix.csv", help="Output .csv or .parquet file")
+    args = parser.parse_args()
+
+    def uploads(folder):
+        return [os.path.join(folder, f) for f in sorted(os.listdir(folder))
+                if f.rsplit(".", 1)[-1].lower() in ALLOWED_EXTENSIONS]
+
+    init_db()
+    result = match_jds(args.jds or uploads(UPLOAD_FOLDER_JD), uploads(UPLOAD_FOLDER_RESUMES), workers=PARSE_WORKERS)
+    if args.out.endswith(".parquet"):
+        result.to_parquet(args.out)
+    else:
+        with open(args.out, "w", newline="", encoding="utf-8") as f:
+            result.to_csv(f)
+    print(f"✅ Scored {len(result.jd_names)} JDs × {len(result.filenames)} resumes → {args.out}")
@@ -0,0 +1,154 @@
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+CIRCUIT_FAILURE_THRESHOLD = 5    # Consecutive failures before a circuit opens
+CIRCUIT_COOLDOWN = 30.0          # Seconds an open circuit fails fast before letting a trial call through
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class BudgetExceeded(Exception):
+    """
+    The request's latency budget ran out before or during an external call.
+    Not the provider's fault, so breakers don't count it as a failure.
+    """
+
+
+# ==============================
+# 🔌 Circuit Breaker
+# ==============================
+
+class CircuitBreaker:
+    """
+    Fail fast on a provider that keeps failing.
+
+    closed: calls go through; `failure_threshold` consecutive failures open it.
+    open: calls are refused for `cooldown` seconds.
+    half_open: one trial call goes through; success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+                 cooldown: float = CIRCUIT_COOLDOWN):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+            self.opened_at = 0.0
+            self._trial_running = False
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != "closed":
+                logging.info(f"[Circuit {self.name}] Closed")
+            self.state = "closed"
+            self.failures = 0
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    logging.warning(f"[Circuit {self.name}] Open after {self.failures} failures; "
+                                    f"failing fast for {self.cooldown:g}s")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """
+        A permitted call ended without reaching the provider: no verdict either way.
+        """
+        with self._lock:
+            self._trial_running = False
+
+    def call(self, fn, *args, **kwargs):
+        """
+        fn(*args, **kwargs) through the breaker; raises CircuitOpenError without calling fn while open.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit open")
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {"state": self.state, "failures": self.failures}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """
+    The process-wide breaker for a provider, created on first use.
+    """
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+
+def status() -> Dict[str, Dict]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.status() for breaker in breakers}
+
+
+# ==============================
+# ⏱️ Per-Request Latency Budget
+# ==============================
+
+class LatencyBudget:
+    """
+    Wall-clock allowance for the external calls made while serving one request.
+    Once it is spent, callers should take their local fallback instead of calling out.
+    """
+
+    def __init__(self, seconds: Optional[float]):
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        if self.deadline is None:
+            return float("inf")
+        return max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, timeout):
+        """
+        Clamp a requests timeout (seconds or a (connect, read) tuple) to what is left.
+        """
+        remaining = self.remaining()
+        if isinstance(timeout, tuple):
+            return tuple(min(t, remaining) for t in timeout)
+        return min(timeout, remaining)
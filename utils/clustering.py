@@ -1,10 +1,7 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
-
 # Optional: Label mapping for clearer labels in UI
 DEFAULT_LABELS = ["Tech-heavy", "Managerial", "Business-oriented", "Creative"]
 
-def cluster_resumes(resume_texts, num_clusters=3, label_map=None):
+def cluster_resumes(resume_texts, num_clusters=3, label_map=None, features=None):
     """
     Cluster resumes into groups using TF-IDF + KMeans.
     
@@ -12,6 +9,8 @@ def cluster_resumes(resume_texts, num_clusters=3, label_map=None):
         resume_texts (list): List of resume text strings.
         num_clusters (int): Number of clusters to generate.
         label_map (list): Optional list of human-readable cluster labels.
+        features (sparse matrix): Optional precomputed TF-IDF rows, one per text
+            (e.g. from the feature store); skips fitting a vectorizer.
 
     Returns:
         list of dict: [{'label': 'Tech-heavy', 'filename': 'resume1.pdf'}, ...]
@@ -19,8 +18,14 @@ def cluster_resumes(resume_texts, num_clusters=3, label_map=None):
     if not resume_texts:
         return []
 
-    vectorizer = TfidfVectorizer(stop_words='english', max_features=5000)
-    X = vectorizer.fit_transform(resume_texts)
+    from sklearn.cluster import KMeans
+
+    if features is not None:
+        X = features
+    else:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vectorizer = TfidfVectorizer(stop_words='english', max_features=5000)
+        X = vectorizer.fit_transform(resume_texts)
 
     model = KMeans(n_clusters=num_clusters, random_state=42, n_init=10)
     labels = model.fit_predict(X)
@@ -23,17 +23,89 @@ def init_db():
             ml_title TEXT DEFAULT '',
             resume_title TEXT DEFAULT '',
             ml_title_top3 TEXT DEFAULT '',
-            gpt_confidence REAL DEFAULT 0.0
+            gpt_confidence REAL DEFAULT 0.0,
+            experience_years INTEGER,
+            experience_level TEXT DEFAULT '',
+            match_key TEXT DEFAULT ''
+        )
+    ''')
+    _add_missing_columns(c, "results", [
+        ("experience_years", "INTEGER"),
+        ("experience_level", "TEXT DEFAULT ''"),
+        ("match_key", "TEXT DEFAULT ''")
+    ])
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS resumes (
+            filename TEXT PRIMARY KEY,
+            content_hash TEXT,
+            name TEXT,
+            email TEXT,
+            phone TEXT,
+            skills TEXT,
+            experience_years INTEGER,
+            experience_level TEXT DEFAULT '',
+            ml_title TEXT DEFAULT '',
+            ml_title_top3 TEXT DEFAULT '',
+            resume_title TEXT DEFAULT '',
+            resume_confidence REAL DEFAULT 0.0,
+            ingested_at TEXT,
+            model_version TEXT DEFAULT '',
+            extractor_version TEXT DEFAULT '',
+            taxonomy_version TEXT DEFAULT ''
+        )
+    ''')
+    _add_missing_columns(c, "resumes", [
+        ("model_version", "TEXT DEFAULT ''"),
+        ("extractor_version", "TEXT DEFAULT ''"),
+        ("taxonomy_version", "TEXT DEFAULT ''")
+    ])
+    # JD × resume match results by content, so re-opening a JD only scores new pairs
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS match_cache (
+            jd_hash TEXT,
+            resume_hash TEXT,
+            scoring_version TEXT,
+            score REAL,
+            matched_skills TEXT,
+            gpt_title TEXT,
+            created_at TEXT,
+            PRIMARY KEY (jd_hash, resume_hash, scoring_version)
+        )
+    ''')
+    # Inverted skill index (see utils/skill_index.py): small integer ids per resume,
+    # and per skill a sorted uint32 array of the ids that have it
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS skill_index_docs (
+            doc_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            filename TEXT UNIQUE,
+            skills TEXT DEFAULT ''
+        )
+    ''')
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS skill_postings (
+            skill TEXT PRIMARY KEY,
+            doc_ids BLOB
         )
     ''')
     conn.commit()
     conn.close()
 
 
+def _add_missing_columns(cursor, table, columns):
+    """
+    Adds columns introduced after a database file was first created.
+    """
+    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    for name, declaration in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
+
+
 # === Insert or update result ===
 def insert_result(name, email, score, skills, filename,
                   gpt_title='', ml_title='', resume_title='',
-                  ml_title_top3='', gpt_confidence=0.0, starred=0):
+                  ml_title_top3='', gpt_confidence=0.0, starred=0,
+                  experience_years=None, experience_level='', match_key=''):
     """
     Inserts or replaces a resume result into the database.
     """
@@ -41,11 +113,13 @@ def insert_result(name, email, score, skills, filename,
     c = conn.cursor()
     c.execute('''
         INSERT OR REPLACE INTO results 
-        (name, email, score, skills, filename, gpt_title, ml_title, resume_title, ml_title_top3, gpt_confidence, starred)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        (name, email, score, skills, filename, gpt_title, ml_title, resume_title, ml_title_top3, gpt_confidence, starred,
+         experience_years, experience_level, match_key)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     ''', (name, email, score, skills, filename,
           gpt_title, ml_title, resume_title,
-          ml_title_top3, gpt_confidence, starred))
+          ml_title_top3, gpt_confidence, starred,
+          experience_years, experience_level, match_key))
     conn.commit()
     conn.close()
 
@@ -71,7 +145,8 @@ def get_all_results():
     c = conn.cursor()
     c.execute('''
         SELECT name, email, score, skills, filename, notes, rating, starred,
-               gpt_title, ml_title, resume_title, ml_title_top3, gpt_confidence
+               gpt_title, ml_title, resume_title, ml_title_top3, gpt_confidence,
+               experience_years, experience_level
         FROM results
     ''')
     rows = c.fetchall()
@@ -91,3 +166,131 @@ def update_notes_and_rating(filename, notes, rating):
     ''', (notes, rating, filename))
     conn.commit()
     conn.close()
+
+
+# === Ingested resume features (JD-independent, computed once per upload) ===
+def upsert_resume(filename, content_hash, name, email, phone, skills,
+                  experience_years, experience_level,
+                  ml_title='', ml_title_top3='', resume_title='', resume_confidence=0.0,
+                  model_version='', extractor_version='', taxonomy_version=''):
+    """
+    Inserts or replaces the pre-computed features of one uploaded resume,
+    with the versions of the models, extractor and taxonomy that produced them.
+    """
+    conn = sqlite3.connect(DB_NAME)
+    c = conn.cursor()
+    c.execute('''
+        INSERT OR REPLACE INTO resumes
+        (filename, content_hash, name, email, phone, skills, experience_years, experience_level,
+         ml_title, ml_title_top3, resume_title, resume_confidence, ingested_at,
+         model_version, extractor_version, taxonomy_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), ?, ?, ?)
+    ''', (filename, content_hash, name, email, phone, skills,
+          experience_years, experience_level,
+          ml_title, ml_title_top3, resume_title, resume_confidence,
+          model_version, extractor_version, taxonomy_version))
+    conn.commit()
+    conn.close()
+
+
+def get_resumes(filenames=None):
+    """
+    Returns ingested resume rows as dicts keyed by filename (all rows if filenames is None).
+    """
+    conn = sqlite3.connect(DB_NAME)
+    conn.row_factory = sqlite3.Row
+    c = conn.cursor()
+    if filenames is None:
+        c.execute('SELECT * FROM resumes')
+        rows = c.fetchall()
+    else:
+        rows = []
+        filenames = list(filenames)
+        for i in range(0, len(filenames), 500):  # Stay under SQLite's bound-parameter limit
+            chunk = filenames[i:i + 500]
+            c.execute(f'SELECT * FROM resumes WHERE filename IN ({",".join("?" * len(chunk))})', chunk)
+            rows.extend(c.fetchall())
+    conn.close()
+    return {row["filename"]: dict(row) for row in rows}
+
+
+def get_resume_skills():
+    """
+    Returns {filename: comma-separated skills} for every ingested resume.
+    """
+    conn = sqlite3.connect(DB_NAME)
+    c = conn.cursor()
+    c.execute('SELECT filename, skills FROM resumes')
+    rows = c.fetchall()
+    conn.close()
+    return {filename: skills for filename, skills in rows}
+
+
+def get_resumes_version():
+    """
+    Cheap change marker for the resumes table: its newest rowid.
+    INSERT OR REPLACE always allocates a new rowid, so any upsert changes it.
+    """
+    conn = sqlite3.connect(DB_NAME)
+    c = conn.cursor()
+    c.execute('SELECT MAX(rowid) FROM resumes')
+    version = c.fetchone()[0]
+    conn.close()
+    return version
+
+
+def get_result_match_keys():
+    """
+    Returns {filename: match_key} of the stored results, to skip rewriting unchanged rows.
+    """
+    conn = sqlite3.connect(DB_NAME)
+    c = conn.cursor()
+    c.execute('SELECT filename, match_key FROM results')
+    rows = c.fetchall()
+    conn.close()
+    return dict(rows)
+
+
+# === Match cache: (JD hash, resume hash, scoring version) -> result ===
+def get_cached_matches(jd_hash, resume_hashes, scoring_version):
+    """
+    Returns {resume_hash: {"score", "matched_skills", "gpt_title"}} for the pairs already scored.
+    gpt_title is None when the title suggestion failed or was skipped; callers retry just that.
+    """
+    conn = sqlite3.connect(DB_NAME)
+    c = conn.cursor()
+    found = {}
+    resume_hashes = list(resume_hashes)
+    for i in range(0, len(resume_hashes), 500):  # Stay under SQLite's bound-parameter limit
+        chunk = resume_hashes[i:i + 500]
+        c.execute(f'''
+            SELECT resume_hash, score, matched_skills, gpt_title FROM match_cache
+            WHERE jd_hash = ? AND scoring_version = ? AND resume_hash IN ({",".join("?" * len(chunk))})
+        ''', (jd_hash, scoring_version, *chunk))
+        for resume_hash, score, matched_skills, gpt_title in c.fetchall():
+            found[resume_hash] = {
+                "score": score,
+                "matched_skills": matched_skills.split(", ") if matched_skills else [],
+                "gpt_title": gpt_title
+            }
+    conn.close()
+    return found
+
+
+def put_cached_matches(jd_hash, scoring_version, matches):
+    """
+    Stores {resume_hash: (score, matched_skills, gpt_title)} for one JD in a single transaction.
+    gpt_title may be None, which is stored as NULL.
+    """
+    if not matches:
+        return
+    conn = sqlite3.connect(DB_NAME)
+    c = conn.cursor()
+    c.executemany('''
+        INSERT OR REPLACE INTO match_cache
+        (jd_hash, resume_hash, scoring_version, score, matched_skills, gpt_title, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, datetime('now'))
+    ''', [(jd_hash, resume_hash, scoring_version, score, ", ".join(matched), gpt_title)
+          for resume_hash, (score, matched, gpt_title) in matches.items()])
+    conn.commit()
+    conn.close()
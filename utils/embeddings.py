@@ -0,0 +1,216 @@
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import requests
+from dotenv import load_dotenv
+
+from utils.circuit_breaker import BudgetExceeded, CircuitOpenError, LatencyBudget, get_breaker
+
+load_dotenv()
+HF_API_TOKEN = os.getenv("HF_API_TOKEN")
+HF_API_URL = os.getenv(
+    "HF_API_URL",
+    "https://api-inference.huggingface.co/models/sentence-transformers/all-MiniLM-L6-v2"
+)
+
+EMBEDDING_DB = os.path.join("database", "embeddings.db")
+MAX_EMBEDDINGS = 100_000         # LRU-evict past this many stored vectors
+EMBED_BATCH_SIZE = 32            # Inputs per HTTP request
+MAX_INPUT_CHARS = 1000
+REQUEST_TIMEOUT = (3.05, 30)     # (connect, read) seconds
+HF_BREAKER = get_breaker("huggingface")
+
+
+# === Text normalization / keys ===
+def normalize_text(text: str) -> str:
+    return text.strip().replace("\n", " ")[:MAX_INPUT_CHARS]
+
+
+def text_key(text: str) -> str:
+    """
+    Cache key for a text: SHA-256 of its normalized form.
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+# === Persistent embedding store (SQLite float32 blobs, LRU) ===
+class EmbeddingStore:
+
+    def __init__(self, db_path: str = EMBEDDING_DB, max_entries: int = MAX_EMBEDDINGS):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB,
+                last_access REAL
+            )
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings(last_access)")
+        return conn
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        if not keys:
+            return found
+        with self._lock:
+            conn = self._connect()
+            try:
+                for i in range(0, len(keys), 500):
+                    chunk = keys[i:i + 500]
+                    rows = conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                    ).fetchall()
+                    found.update((key, np.frombuffer(blob, dtype=np.float32)) for key, blob in rows)
+                if found:
+                    now = time.time()
+                    conn.executemany("UPDATE embeddings SET last_access = ? WHERE key = ?",
+                                     [(now, key) for key in found])
+                    conn.commit()
+            finally:
+                conn.close()
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, last_access) VALUES (?, ?, ?)",
+                    [(key, np.asarray(vec, dtype=np.float32).tobytes(), now) for key, vec in items.items()]
+                )
+                overflow = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    conn.execute('''
+                        DELETE FROM embeddings WHERE key IN
+                        (SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)
+                    ''', (overflow,))
+                conn.commit()
+            finally:
+                conn.close()
+
+
+# === Hugging Face client (pooled session, batched inputs, explicit timeouts) ===
+class HFEmbeddingClient:
+
+    def __init__(self, api_url: str = HF_API_URL, token: Optional[str] = None,
+                 timeout=REQUEST_TIMEOUT, batch_size: int = EMBED_BATCH_SIZE,
+                 session: Optional[requests.Session] = None):
+        self.api_url = api_url
+        self.token = token if token is not None else HF_API_TOKEN
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self.session = session or requests.Session()
+
+    def embed(self, texts: List[str], budget: Optional[LatencyBudget] = None) -> np.ndarray:
+        """
+        Return a (len(texts), dim) float32 matrix, sending batch_size inputs per request.
+        With a budget, every request is clamped to what is left of it and no request
+        starts once it is spent (BudgetExceeded).
+        """
+        if not self.token:
+            raise ValueError("No Hugging Face token")
+        headers = {"Authorization": f"Bearer {self.token}", "Content-Type": "application/json"}
+        batches = []
+        for i in range(0, len(texts), self.batch_size):
+            batch = [normalize_text(t) for t in texts[i:i + self.batch_size]]
+            timeout = self.timeout
+            if budget is not None:
+                if budget.exhausted:
+                    raise BudgetExceeded("latency budget spent")
+                timeout = budget.timeout(self.timeout)
+            try:
+                response = self.session.post(self.api_url, headers=headers, json={"inputs": batch}, timeout=timeout)
+            except requests.Timeout:
+                if timeout != self.timeout:   # Cut short by our own budget, not the provider's fault
+                    raise BudgetExceeded("latency budget spent")
+                raise
+            response.raise_for_status()
+            batches.append(_as_matrix(response.json(), len(batch)))
+        return np.vstack(batches)
+
+
+def _as_matrix(data, n_inputs: int) -> np.ndarray:
+    vectors = np.asarray(data, dtype=np.float32)
+    if vectors.ndim == 3:  # Token-level output: mean-pool into sentence vectors
+        vectors = vectors.mean(axis=1)
+    if vectors.ndim == 1 and n_inputs == 1:
+        vectors = vectors[None, :]
+    if vectors.ndim != 2 or vectors.shape[0] != n_inputs:
+        raise ValueError("Unexpected Hugging Face response format")
+    return vectors
+
+
+# === Cached embedding lookup ===
+_store: Optional[EmbeddingStore] = None
+_client: Optional[HFEmbeddingClient] = None
+
+
+def get_store() -> EmbeddingStore:
+    global _store
+    if _store is None:
+        _store = EmbeddingStore()
+    return _store
+
+
+def get_client() -> HFEmbeddingClient:
+    global _client
+    if _client is None:
+        _client = HFEmbeddingClient()
+    return _client
+
+
+def embed_texts(texts: List[str], store: Optional[EmbeddingStore] = None,
+                client: Optional[HFEmbeddingClient] = None,
+                budget: Optional[LatencyBudget] = None) -> np.ndarray:
+    """
+    Embed texts, serving repeats from the store and requesting only the misses (batched).
+    Requests go through the Hugging Face circuit breaker (CircuitOpenError while it is open);
+    running out of our own budget (BudgetExceeded) is not counted against the provider.
+    """
+    store = store or get_store()
+    client = client or get_client()
+    keys = [text_key(t) for t in texts]
+    found = store.get_many(list(dict.fromkeys(keys)))
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in found:
+            missing.setdefault(key, text)
+    if missing:
+        if not HF_BREAKER.allow():
+            raise CircuitOpenError("Hugging Face circuit open")
+        try:
+            vectors = client.embed(list(missing.values()), budget=budget)
+        except BudgetExceeded:
+            HF_BREAKER.release()
+            raise
+        except Exception:
+            HF_BREAKER.record_failure()
+            raise
+        HF_BREAKER.record_success()
+        fresh = dict(zip(missing, vectors))
+        store.put_many(fresh)
+        found.update(fresh)
+    return np.vstack([found[key] for key in keys])
+
+
+def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    norm = np.linalg.norm(a) * np.linalg.norm(b)
+    if norm == 0:
+        raise ValueError("Zero-length embedding")
+    return float(np.dot(a, b) / norm)
@@ -0,0 +1,166 @@
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+GPT_CACHE_DB = os.getenv("GPT_CACHE_DB", os.path.join("database", "gpt_cache.db"))
+GPT_CACHE_TTL = 30 * 24 * 3600      # Seconds before a stored completion is asked for again
+MAX_GPT_CACHE_ENTRIES = 50_000      # LRU-evict past this many responses
+
+
+def canonical_skills(skills: Iterable[str]) -> List[str]:
+    """
+    Order- and case-insensitive form of a skill set: sorted, lowercased, de-duplicated.
+    """
+    return sorted({skill.strip().lower() for skill in skills if skill and skill.strip()})
+
+
+# === Persistent GPT response cache (SQLite, TTL + LRU, hit/miss counters) ===
+class GPTCache:
+    """
+    Completions keyed by (kind, canonical skill set, model, prompt version).
+    One file is shared by the web app and batch jobs; SQLite's locking keeps
+    concurrent writers safe.
+    """
+
+    def __init__(self, db_path: str = GPT_CACHE_DB, ttl: float = GPT_CACHE_TTL,
+                 max_entries: int = MAX_GPT_CACHE_ENTRIES):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                kind TEXT,
+                response TEXT,
+                created_at REAL,
+                last_access REAL
+            )
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS counters (
+                kind TEXT PRIMARY KEY,
+                hits INTEGER DEFAULT 0,
+                misses INTEGER DEFAULT 0
+            )
+        ''')
+        return conn
+
+    @staticmethod
+    def key(kind: str, skills: Iterable[str], model: str, prompt_version: str) -> str:
+        payload = json.dumps([kind, canonical_skills(skills), model, prompt_version])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # --- Reading ---
+    def get_many(self, kind: str, skill_lists: List[Iterable[str]], model: str,
+                 prompt_version: str) -> Dict[str, List[str]]:
+        """
+        Return {key: response} for the skill sets with a fresh entry, counting hits and misses.
+        """
+        keys = list(dict.fromkeys(self.key(kind, skills, model, prompt_version) for skills in skill_lists))
+        found = {}
+        if not keys:
+            return found
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                for i in range(0, len(keys), 500):
+                    chunk = keys[i:i + 500]
+                    rows = conn.execute(
+                        f"SELECT key, response FROM responses WHERE created_at > ? "
+                        f"AND key IN ({','.join('?' * len(chunk))})", (now - self.ttl, *chunk)
+                    ).fetchall()
+                    found.update((key, json.loads(response)) for key, response in rows)
+                conn.executemany("UPDATE responses SET last_access = ? WHERE key = ?", [(now, key) for key in found])
+                conn.execute('''
+                    INSERT INTO counters (kind, hits, misses) VALUES (?, ?, ?)
+                    ON CONFLICT(kind) DO UPDATE SET hits = hits + excluded.hits, misses = misses + excluded.misses
+                ''', (kind, len(found), len(keys) - len(found)))
+                conn.commit()
+            finally:
+                conn.close()
+        return found
+
+    def get(self, kind: str, skills: Iterable[str], model: str, prompt_version: str) -> Optional[List[str]]:
+        skills = list(skills)
+        return self.get_many(kind, [skills], model, prompt_version).get(self.key(kind, skills, model, prompt_version))
+
+    # --- Writing ---
+    def put(self, kind: str, skills: Iterable[str], model: str, prompt_version: str, response: List[str]) -> None:
+        """
+        Store a successful response; evicts expired entries, then the least recently used.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, kind, response, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.key(kind, skills, model, prompt_version), kind, json.dumps(response), now, now)
+                )
+                conn.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl,))
+                overflow = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+                if overflow > 0:
+                    conn.execute('''
+                        DELETE FROM responses WHERE key IN
+                        (SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)
+                    ''', (overflow,))
+                conn.commit()
+            finally:
+                conn.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Hit/miss counts per kind, plus the number of stored responses.
+        """
+        with self._lock:
+            conn = self._connect()
+            try:
+                result = {kind: {"hits": hits, "misses": misses}
+                          for kind, hits, misses in conn.execute("SELECT kind, hits, misses FROM counters")}
+                result["entries"] = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+                return result
+            finally:
+                conn.close()
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM responses")
+                conn.execute("DELETE FROM counters")
+                conn.commit()
+            finally:
+                conn.close()
+
+
+_cache: Optional[GPTCache] = None
+
+
+def get_cache() -> GPTCache:
+    global _cache
+    if _cache is None:
+        _cache = GPTCache()
+    return _cache
+
+
+if __name__ == "__main__":
+    import sys
+
+    if "--clear" in sys.argv:
+        get_cache().clear()
+        print("🧹 Cleared GPT response cache")
+    else:
+        print(json.dumps(get_cache().stats(), indent=2))
@@ -1,44 +1,179 @@
 import os
+import json
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Optional
+
 import requests
 from dotenv import load_dotenv
 
+from utils.circuit_breaker import CircuitOpenError, get_breaker
+from utils.gpt_cache import GPTCache, canonical_skills, get_cache
+
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+OPENAI_API_URL = os.getenv("OPENAI_API_URL", "https://api.openai.com/v1/chat/completions")
+OPENAI_MODEL = "gpt-3.5-turbo"
+PROMPT_VERSION = "1"             # Bump when a prompt changes, so cached responses are not reused
 
-def suggest_job_titles(skills, api_key=None):
-    api_key = api_key or OPENAI_API_KEY
-    if not skills:
-        return ["❌ No skills provided"]
-    if not api_key:
-        return ["❌ Missing API key"]
+GPT_TIMEOUT = (3.05, 20)         # (connect, read) seconds per request
+GPT_MAX_RETRIES = 3              # Extra attempts after a 429/5xx or network error
+GPT_BACKOFF_BASE = 0.5           # Seconds; doubles per attempt, full jitter
+GPT_BACKOFF_MAX = 8.0
+GPT_CONCURRENCY = int(os.getenv("GPT_CONCURRENCY", "8"))
+GPT_RATE_PER_SEC = float(os.getenv("GPT_RATE_PER_SEC", "5"))
+GPT_DEADLINE = 60.0              # Seconds for a whole suggest_job_titles_many call
+GPT_PACK_SIZE = int(os.getenv("GPT_PACK_SIZE", "10"))    # Candidates per packed title request
+GPT_PACK_RETRIES = 2             # Re-asks for candidates missing from a packed reply
+GPT_TOKENS_PER_CANDIDATE = 40
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+OPENAI_BREAKER = get_breaker("openai")
+
+
+# === Rate limiting ===
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests per second on average, bursts up to `capacity`.
+    """
+
+    def __init__(self, rate: float = GPT_RATE_PER_SEC, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting for it if needed. False if the deadline would pass first.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait_for = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait_for > deadline:
+                return False
+            time.sleep(wait_for)
+
+
+class GPTRequestError(Exception):
+    pass
+
+
+class DeadlineExceeded(GPTRequestError):
+    pass
 
+
+def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+    if retry_after:
+        try:
+            return min(float(retry_after), GPT_BACKOFF_MAX)
+        except ValueError:
+            pass
+    return random.uniform(0, min(GPT_BACKOFF_MAX, GPT_BACKOFF_BASE * 2 ** attempt))
+
+
+def _chat(messages, max_tokens, api_key, deadline=None, limiter=None, timeout=GPT_TIMEOUT,
+          json_mode=False) -> str:
+    """
+    One chat completion with per-call timeouts and jittered exponential backoff
+    on 429/5xx and network errors, never running past `deadline` (monotonic time).
+    json_mode asks the API for a single JSON object as the reply.
+
+    Goes through the shared OpenAI circuit breaker: while it is open, calls fail
+    with CircuitOpenError at once. Running out of our own deadline is not
+    counted against the provider.
+    """
+    if not OPENAI_BREAKER.allow():
+        raise CircuitOpenError("OpenAI circuit open")
+    try:
+        content = _chat_with_retries(messages, max_tokens, api_key, deadline, limiter, timeout, json_mode)
+    except DeadlineExceeded:
+        OPENAI_BREAKER.release()
+        raise
+    except Exception:
+        OPENAI_BREAKER.record_failure()
+        raise
+    OPENAI_BREAKER.record_success()
+    return content
+
+
+def _chat_with_retries(messages, max_tokens, api_key, deadline, limiter, timeout, json_mode) -> str:
+    payload = {
+        "model": OPENAI_MODEL,
+        "messages": messages,
+        "temperature": 0.5,
+        "max_tokens": max_tokens
+    }
+    if json_mode:
+        payload["response_format"] = {"type": "json_object"}
+    for attempt in range(GPT_MAX_RETRIES + 1):
+        if limiter is not None and not limiter.acquire(deadline):
+            raise DeadlineExceeded("deadline exceeded")
+        call_timeout = timeout
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise DeadlineExceeded("deadline exceeded")
+            call_timeout = (min(timeout[0], remaining), min(timeout[1], remaining))
+
+        retry_after = None
+        try:
+            response = requests.post(
+                OPENAI_API_URL,
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json"
+                },
+                json=payload,
+                timeout=call_timeout
+            )
+            if response.status_code not in RETRY_STATUSES:
+                data = response.json()
+                return data["choices"][0]["message"]["content"].strip()
+            error = GPTRequestError(f"HTTP {response.status_code}")
+            retry_after = response.headers.get("Retry-After")
+        except requests.Timeout as e:
+            # Cut short by the caller's deadline, not the provider's fault
+            if deadline is not None and (call_timeout != timeout or time.monotonic() >= deadline):
+                raise DeadlineExceeded("deadline exceeded") from e
+            error = e
+        except requests.ConnectionError as e:
+            error = e
+
+        if attempt == GPT_MAX_RETRIES:
+            break
+        delay = _backoff(attempt, retry_after)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            break
+        time.sleep(delay)
+    raise error
+
+
+# === Job title suggestions ===
+def _title_messages(skills):
     prompt = (
         "Suggest 3 job titles for a person who has the following skills:\n\n"
         + ", ".join(skills)
         + "\n\nRespond in bullet points."
     )
+    return [
+        {"role": "system", "content": "You are a helpful career assistant."},
+        {"role": "user", "content": prompt}
+    ]
 
+
+def _fetch_titles(skills, api_key, deadline=None, limiter=None):
     try:
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "gpt-3.5-turbo",
-                "messages": [
-                    {"role": "system", "content": "You are a helpful career assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.5,
-                "max_tokens": 100
-            }
-        )
-
-        data = response.json()
-        raw_text = data["choices"][0]["message"]["content"].strip()
+        raw_text = _chat(_title_messages(skills), 100, api_key, deadline=deadline, limiter=limiter)
 
         if not raw_text:
             return ["❌ GPT returned empty"]
@@ -51,16 +186,180 @@ def suggest_job_titles(skills, api_key=None):
         return [f"❌ GPT Error: {str(e)}"]
 
 
-def suggest_learning_gap(resume_skills, jd_skills, api_key=None):
+def _is_error(response: List[str]) -> bool:
+    return not response or response[0].startswith("❌")
+
+
+def suggest_job_titles(skills, api_key=None, deadline=None, limiter=None, use_cache: bool = True,
+                       cache: Optional[GPTCache] = None):
+    """
+    Three job titles for a skill set, from the response cache (the shared one unless `cache` is given) when possible.
+    """
+    api_key = api_key or OPENAI_API_KEY
+    if not skills:
+        return ["❌ No skills provided"]
+    cache = (cache or get_cache()) if use_cache else None
+    if cache is not None:
+        cached = cache.get("titles", skills, OPENAI_MODEL, PROMPT_VERSION)
+        if cached is not None:
+            return cached
+    if not api_key:
+        return ["❌ Missing API key"]
+
+    titles = _fetch_titles(canonical_skills(skills), api_key, deadline, limiter)
+    if cache is not None and not _is_error(titles):
+        cache.put("titles", skills, OPENAI_MODEL, PROMPT_VERSION, titles)
+    return titles
+
+
+# === Packed title suggestions (several candidates per request) ===
+def _packed_title_messages(skill_lists):
+    candidates = "\n".join(f"{i}: {', '.join(skills)}" for i, skills in enumerate(skill_lists, start=1))
+    prompt = (
+        "Suggest 3 job titles for each candidate below, based on their skills.\n"
+        'Respond with a JSON object of the form {"candidates": [{"id": 1, "titles": ["...", "...", "..."]}]} '
+        "with exactly one entry per candidate id.\n\n"
+        + candidates
+    )
+    return [
+        {"role": "system", "content": "You are a helpful career assistant. You reply with JSON only."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _parse_packed(raw_text: str, count: int) -> dict:
+    """
+    {position: titles} for the well-formed entries of a packed reply; anything missing or malformed is left out.
+    """
+    raw_text = raw_text.strip()
+    if raw_text.startswith("```"):
+        raw_text = raw_text.strip("`").split("\n", 1)[-1]
+    try:
+        entries = json.loads(raw_text).get("candidates", [])
+    except (ValueError, AttributeError):
+        return {}
+
+    parsed = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        candidate_id, titles = entry.get("id"), entry.get("titles")
+        if not isinstance(candidate_id, int) or not 1 <= candidate_id <= count or not isinstance(titles, list):
+            continue
+        titles = [str(title).strip("-• ").strip() for title in titles if str(title).strip("-• ").strip()]
+        if titles:
+            parsed[candidate_id - 1] = titles
+    return parsed
+
+
+def suggest_job_titles_packed(skill_lists: List[List[str]], api_key=None, deadline=None,
+                              limiter=None) -> List[List[str]]:
+    """
+    Titles for several candidates from one chat completion, in input order.
+
+    The reply is JSON keyed by candidate id. Candidates missing from it or
+    malformed are asked for again (only those, up to GPT_PACK_RETRIES times);
+    a request error fails the whole pack.
+    """
+    api_key = api_key or OPENAI_API_KEY
+    results = [None if skills else ["❌ No skills provided"] for skills in skill_lists]
+    if not api_key:
+        return [result or ["❌ Missing API key"] for result in results]
+
+    todo = [i for i, result in enumerate(results) if result is None]
+    error = ["❌ Could not parse GPT response"]
+    for _ in range(GPT_PACK_RETRIES + 1):
+        if not todo:
+            break
+        try:
+            raw_text = _chat(_packed_title_messages([canonical_skills(skill_lists[i]) for i in todo]),
+                             GPT_TOKENS_PER_CANDIDATE * len(todo) + 20, api_key,
+                             deadline=deadline, limiter=limiter, json_mode=True)
+        except Exception as e:
+            error = [f"❌ GPT Error: {str(e)}"]
+            break
+        parsed = _parse_packed(raw_text, len(todo))
+        for position, titles in parsed.items():
+            results[todo[position]] = titles
+        todo = [i for position, i in enumerate(todo) if position not in parsed]
+    return [result or error for result in results]
+
+
+def suggest_job_titles_many(skill_lists: List[List[str]], api_key=None, max_workers: int = GPT_CONCURRENCY,
+                            rate: float = GPT_RATE_PER_SEC, deadline: float = GPT_DEADLINE,
+                            use_cache: bool = True, cache: Optional[GPTCache] = None,
+                            pack_size: int = GPT_PACK_SIZE) -> List[List[str]]:
+    """
+    suggest_job_titles for many candidates at once, in input order.
+
+    Candidates with the same skill set share one request, and sets already in
+    the response cache (the shared one unless `cache` is given) cost nothing.
+    The rest go out pack_size candidates per request (1: one prompt each).
+    At most max_workers requests are in flight and a shared token bucket keeps
+    the request rate under `rate` per second. Candidates not finished within
+    `deadline` seconds get an error entry instead of holding up the rest.
+    """
+    if not skill_lists:
+        return []
+    api_key = api_key or OPENAI_API_KEY
+    cache = (cache or get_cache()) if use_cache else None
+    keys = [GPTCache.key("titles", skills, OPENAI_MODEL, PROMPT_VERSION) for skills in skill_lists]
+    unique = dict(zip(keys, skill_lists))
+
+    results = {}
+    if cache is not None:
+        results = cache.get_many("titles", [skills for skills in unique.values() if skills], OPENAI_MODEL, PROMPT_VERSION)
+    pending = [key for key in unique if key not in results]
+
+    if pending:
+        pack_size = max(1, pack_size)
+        packs = [pending[i:i + pack_size] for i in range(0, len(pending), pack_size)]
+        limiter = TokenBucket(rate)
+        stop_at = time.monotonic() + deadline
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(packs))), thread_name_prefix="gpt")
+        try:
+            if pack_size == 1:
+                # Cache lookups and writes for the batch happen here, not per call
+                futures = [executor.submit(lambda skills: [suggest_job_titles(skills, api_key, stop_at, limiter,
+                                                                              use_cache=False)],
+                                           unique[pack[0]]) for pack in packs]
+            else:
+                futures = [executor.submit(suggest_job_titles_packed, [unique[key] for key in pack],
+                                           api_key, stop_at, limiter) for pack in packs]
+            wait(futures, timeout=max(0.0, stop_at - time.monotonic()))
+            for pack, future in zip(packs, futures):
+                pack_results = future.result() if future.done() else [["❌ GPT Error: deadline exceeded"]] * len(pack)
+                for key, titles in zip(pack, pack_results):
+                    results[key] = titles
+                    if cache is not None and not _is_error(titles):
+                        cache.put("titles", unique[key], OPENAI_MODEL, PROMPT_VERSION, titles)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return [results[key] for key in keys]
+
+
+# === Learning gap suggestions ===
+def suggest_learning_gap(resume_skills, jd_skills, api_key=None, use_cache: bool = True,
+                         cache: Optional[GPTCache] = None):
+    """
+    Learning suggestions for the JD skills a resume lacks, cached by that missing set
+    (in the shared response cache unless `cache` is given).
+    """
     api_key = api_key or OPENAI_API_KEY
     if not api_key:
         return ["❌ Missing API key"]
     if not jd_skills:
         return ["❌ No job description skills provided"]
 
-    missing_skills = list(set(jd_skills) - set(resume_skills))
+    missing_skills = canonical_skills(set(jd_skills) - set(resume_skills))
     if not missing_skills:
         return ["✅ No major skill gaps!"]
+    cache = (cache or get_cache()) if use_cache else None
+    if cache is not None:
+        cached = cache.get("learning_gap", missing_skills, OPENAI_MODEL, PROMPT_VERSION)
+        if cached is not None:
+            return cached
 
     prompt = (
         f"A candidate is missing the following job skills: {', '.join(missing_skills)}.\n"
@@ -69,27 +368,16 @@ def suggest_learning_gap(resume_skills, jd_skills, api_key=None):
     )
 
     try:
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "gpt-3.5-turbo",
-                "messages": [
-                    {"role": "system", "content": "You are a helpful career advisor."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.5,
-                "max_tokens": 200
-            }
-        )
-
-        data = response.json()
-        raw_text = data["choices"][0]["message"]["content"].strip()
+        raw_text = _chat([
+            {"role": "system", "content": "You are a helpful career advisor."},
+            {"role": "user", "content": prompt}
+        ], 200, api_key)
         suggestions = [line.strip("-• ").strip() for line in raw_text.split("\n") if line.strip()]
-        return suggestions if suggestions else ["❌ Could not parse GPT suggestions"]
+        if not suggestions:
+            return ["❌ Could not parse GPT suggestions"]
+        if cache is not None:
+            cache.put("learning_gap", missing_skills, OPENAI_MODEL, PROMPT_VERSION, suggestions)
+        return suggestions
 
     except Exception as e:
         return [f"❌ GPT Error: {str(e)}"]
@@ -0,0 +1,141 @@
+import os
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from utils import local_embeddings, skill_index, text_cache
+from utils.database import upsert_resume, get_resumes
+from utils.parser import (
+    EXTRACTOR_VERSION,
+    MAX_PDF_PAGES,
+    PARSE_TIMEOUT,
+    extract_texts_parallel,
+    extract_features_many,
+    taxonomy_version
+)
+from ml_model import job_title_predictor, registry, resume_classifier
+from ml_model.job_title_predictor import predict_job_title_many
+from ml_model.resume_classifier import predict_resume_title_many
+
+# One background thread is enough: each job already fans parsing out to processes
+INGEST_THREADS = 1
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+# === Background queue ===
+def enqueue(paths: List[str], workers: Optional[int] = None, timeout: float = PARSE_TIMEOUT) -> Future:
+    """
+    Queue uploaded resumes for ingestion in a background thread.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=INGEST_THREADS, thread_name_prefix="ingest")
+    future = _executor.submit(ingest_files, list(paths), workers, timeout)
+    future.add_done_callback(_log_failure)
+    return future
+
+
+def _log_failure(future: Future) -> None:
+    if future.exception() is not None:
+        logging.error(f"[Ingest FAIL] {future.exception()}")
+
+
+# === Ingestion ===
+def current_versions() -> Dict[str, str]:
+    """
+    What a row's features are computed with; rows stored under other versions are re-ingested.
+    """
+    return {
+        "model_version": "|".join(
+            f"{module.MODEL_NAME}:{registry.model_version(module.MODEL_NAME, module.MODEL_PATH)}"
+            for module in (job_title_predictor, resume_classifier)
+        ),
+        "extractor_version": f"{EXTRACTOR_VERSION}:p{MAX_PDF_PAGES}",
+        "taxonomy_version": taxonomy_version(),
+    }
+
+
+def ingest_files(paths: List[str], workers: Optional[int] = None, timeout: float = PARSE_TIMEOUT,
+                 force: bool = False) -> Dict[str, dict]:
+    """
+    Make sure every resume has up-to-date pre-computed features in the database.
+
+    Files whose content hash and versions (models, extractor, taxonomy) match
+    the stored row are skipped; the rest are parsed once, featurized, run
+    through both ML title models and stored.
+
+    Returns:
+        dict: {filename: resume row} for every path that could be read.
+    """
+    digests = {}
+    for path in paths:
+        try:
+            digests[path] = text_cache.file_digest(path)
+        except OSError as e:
+            logging.error(f"[Ingest FAIL] {os.path.basename(path)}: {e}")
+
+    # Read before predicting: a model promoted mid-batch leaves rows marked with the
+    # older version, so they are redone next time rather than kept as stale forever
+    versions = current_versions()
+    filenames = [os.path.basename(path) for path in digests]
+    stored = get_resumes(filenames)
+    stale = [path for path, digest in digests.items()
+             if force or _is_stale(stored.get(os.path.basename(path)), digest, versions)]
+
+    if stale:
+        texts = {}
+        for path, text, error in extract_texts_parallel(stale, workers=workers, timeout=timeout,
+                                                        max_pages=MAX_PDF_PAGES):
+            if error:
+                logging.error(f"[Ingest FAIL] {os.path.basename(path)}: {error}")
+                continue
+            texts[path] = text
+
+        ingested = list(texts)
+        batch = [texts[p] for p in ingested]
+        skills_by_file = {}
+        for path, features, ml_titles, (resume_title, resume_confidence) in zip(
+                ingested, extract_features_many(batch), predict_job_title_many(batch), predict_resume_title_many(batch)):
+            upsert_resume(
+                filename=os.path.basename(path), content_hash=digests[path],
+                name=features.name, email=features.email, phone=features.phone,
+                skills=", ".join(features.skills),
+                experience_years=features.experience_years,
+                experience_level=features.experience_level,
+                ml_title=ml_titles[0][0],
+                ml_title_top3=json.dumps([[str(title), round(float(conf), 2)] for title, conf in ml_titles]),
+                resume_title=resume_title, resume_confidence=float(resume_confidence),
+                **versions
+            )
+            skills_by_file[os.path.basename(path)] = features.skills
+            logging.info(f"[Ingest] {os.path.basename(path)}")
+        stored.update(get_resumes([os.path.basename(p) for p in ingested]))
+        skill_index.update_many(skills_by_file)
+
+        # Document vectors for semantic matching; a missing model must not block ingestion
+        try:
+            local_embeddings.add_documents([os.path.basename(p) for p in ingested], [texts[p] for p in ingested])
+        except Exception as e:
+            logging.warning(f"[Ingest] Skipped document vectors: {e}")
+
+    return {name: stored[name] for name in filenames if name in stored}
+
+
+def _is_stale(row: Optional[dict], digest: str, versions: Dict[str, str]) -> bool:
+    if row is None or row["content_hash"] != digest:
+        return True
+    return any(row.get(column) != version for column, version in versions.items())
+
+
+# === Row helpers ===
+def resume_skills(row: dict) -> List[str]:
+    return row["skills"].split(", ") if row.get("skills") else []
+
+
+def resume_top_titles(row: dict) -> List[tuple]:
+    return [tuple(item) for item in json.loads(row["ml_title_top3"])] if row.get("ml_title_top3") else []
@@ -0,0 +1,308 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+import joblib
+import numpy as np
+from numpy.lib import format as npy_format
+
+from utils import resources
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are not guarded across processes
+    fcntl = None
+
+EMBEDDER_PATH = os.path.join("ml_model", "local_embedder.pkl")
+VECTORS_PATH = os.path.join("database", "resume_vectors.npy")
+EMBEDDING_DIM = 256
+
+
+# ==============================
+# 🧮 Local Document Embedder
+# ==============================
+
+class LocalEmbedder:
+    """
+    Offline document vectors: a TF-IDF + TruncatedSVD projection fit on our own
+    corpus when one has been saved, otherwise spaCy's averaged word vectors.
+    Every vector is L2-normalized, so a dot product is a cosine similarity.
+    """
+
+    def __init__(self, vectorizer=None, svd=None):
+        self.vectorizer = vectorizer
+        self.svd = svd
+        self._fingerprint = None
+
+    @property
+    def backend(self) -> str:
+        return "tfidf-svd" if self.svd is not None else "spacy"
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Identifies the vector space: vectors from embedders with different fingerprints are not comparable.
+        """
+        if self._fingerprint is None:
+            if self.svd is not None:
+                digest = hashlib.sha256(np.ascontiguousarray(self.svd.components_, dtype=np.float32).tobytes())
+                self._fingerprint = f"tfidf-svd:{digest.hexdigest()[:16]}"
+            else:
+                # Read from the installed package, so keying a cache does not load the model
+                from spacy.util import get_package_version
+                self._fingerprint = f"spacy:en_core_web_md-{get_package_version('en_core_web_md')}"
+        return self._fingerprint
+
+    @property
+    def dim(self) -> int:
+        if self.svd is not None:
+            return self.svd.components_.shape[0]
+        return resources.get("spacy_md").vocab.vectors_length
+
+    @classmethod
+    def fit(cls, texts: List[str], dim: int = EMBEDDING_DIM) -> "LocalEmbedder":
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.decomposition import TruncatedSVD
+
+        vectorizer = TfidfVectorizer(stop_words="english", max_features=20000, sublinear_tf=True)
+        X = vectorizer.fit_transform(texts)
+        n_components = max(1, min(dim, X.shape[0] - 1, X.shape[1] - 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=42).fit(X)
+        return cls(vectorizer, svd)
+
+    def save(self, path: str = EMBEDDER_PATH) -> None:
+        joblib.dump((self.vectorizer, self.svd), path)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        if self.svd is not None:
+            vectors = self.svd.transform(self.vectorizer.transform(texts))
+        else:
+            nlp = resources.get("spacy_md")
+            vectors = np.array([doc.vector for doc in nlp.pipe(texts, batch_size=32)])
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _load_embedder() -> LocalEmbedder:
+    if os.path.exists(EMBEDDER_PATH):
+        return LocalEmbedder(*joblib.load(EMBEDDER_PATH))
+    return LocalEmbedder()
+
+resources.register("local_embedder", _load_embedder)
+
+
+# ==============================
+# 🗄️ Append-Only Memory-Mapped Vector Store
+# ==============================
+
+class VectorStore:
+    """
+    Resume vectors in one float32 .npy matrix that only ever grows, plus a
+    sidecar id file with one filename per row. Readers open the matrix with
+    mmap_mode='r', so every worker process shares it through the page cache.
+    Re-ingesting a file appends a new row; the latest row for an id wins.
+    A .json sidecar header records which embedder (and dimension) wrote the
+    rows, so vectors from another embedder are never mixed in or compared.
+    """
+
+    def __init__(self, path: str = VECTORS_PATH):
+        self.path = path
+        self.ids_path = os.path.splitext(path)[0] + ".ids"
+        self.header_path = os.path.splitext(path)[0] + ".json"
+        self._lock = threading.Lock()
+        self._version = None
+        self._matrix = None
+        self._ids: List[str] = []
+
+    # --- Writing ---
+    def append(self, ids: List[str], vectors: np.ndarray, embedder: str = "") -> None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if len(ids) != len(vectors):
+            raise ValueError("ids and vectors must have the same length")
+        if not len(ids):
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._lock, open(self.path + ".lock", "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            if not os.path.exists(self.path):
+                with open(self.path, "wb") as f:
+                    self._write_header(f, (0, vectors.shape[1]))
+                open(self.ids_path, "w").close()
+                with open(self.header_path, "w", encoding="utf-8") as header_file:
+                    json.dump({"embedder": embedder, "dim": vectors.shape[1]}, header_file)
+
+            with open(self.path, "r+b") as f:
+                rows, dim = self._read_shape(f)
+                if vectors.shape[1] != dim:
+                    raise ValueError(f"Vector store holds {dim}-d vectors, got {vectors.shape[1]}-d; rebuild it")
+                stored = self.header().get("embedder")
+                if embedder and stored and embedder != stored:
+                    raise ValueError(f"Vector store was written by {stored}, got vectors from {embedder}; rebuild it")
+                f.seek(0, os.SEEK_END)
+                f.write(vectors.tobytes())
+                with open(self.ids_path, "a", encoding="utf-8") as id_file:
+                    id_file.writelines(f"{name}\n" for name in ids)
+                f.flush()
+                # The header has fixed-width room to grow, so the shape is rewritten in place
+                self._write_header(f, (rows + len(ids), dim))
+
+    @staticmethod
+    def _write_header(f, shape) -> None:
+        f.seek(0)
+        npy_format.write_array_header_1_0(f, {"descr": "<f4", "fortran_order": False, "shape": shape})
+
+    @staticmethod
+    def _read_shape(f):
+        f.seek(0)
+        npy_format.read_magic(f)
+        shape, _, _ = npy_format.read_array_header_1_0(f)
+        return shape
+
+    def header(self) -> dict:
+        """
+        {"embedder": ..., "dim": ...} of the stored rows; empty for a missing store,
+        embedder "" for a store written before headers were recorded.
+        """
+        if not os.path.exists(self.path):
+            return {}
+        if os.path.exists(self.header_path):
+            with open(self.header_path, encoding="utf-8") as f:
+                return json.load(f)
+        with open(self.path, "rb") as f:
+            return {"embedder": "", "dim": self._read_shape(f)[1]}
+
+    def check_embedder(self, embedder: LocalEmbedder) -> None:
+        """
+        Raise ValueError if the stored rows cannot be compared with this embedder's vectors.
+        """
+        header = self.header()
+        if not header:
+            return
+        if header["dim"] != embedder.dim or header["embedder"] not in ("", embedder.fingerprint):
+            raise ValueError(
+                f"Resume vectors were written by {header['embedder'] or 'an older embedder'} ({header['dim']}-d), "
+                f"but the current embedder is {embedder.fingerprint} ({embedder.dim}-d); "
+                f"re-embed them with python -m utils.local_embeddings"
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in (self.path, self.ids_path, self.header_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._version = None
+
+    # --- Reading ---
+    def load(self):
+        """
+        Return (matrix, ids): a read-only memmap and the filename of each row.
+        The pair is one consistent snapshot; index rows only through these ids.
+        """
+        with self._lock:
+            if not os.path.exists(self.path):
+                return np.zeros((0, 0), dtype=np.float32), []
+            version = tuple((st.st_ino, st.st_size, st.st_mtime_ns)
+                            for st in (os.stat(self.path), os.stat(self.ids_path)))
+            if version != self._version:
+                matrix = np.load(self.path, mmap_mode="r")
+                with open(self.ids_path, encoding="utf-8") as f:
+                    ids = f.read().splitlines()
+                rows = min(matrix.shape[0], len(ids))  # Ignore a half-finished append
+                self._matrix, self._ids, self._version = matrix[:rows], ids[:rows], version
+            return self._matrix, self._ids
+
+    @property
+    def version(self):
+        """
+        Changes whenever load() would return a different matrix.
+        """
+        return self._version
+
+    def latest_rows(self, ids: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        Map each id to its most recent row, in the ids of a load() snapshot (default: a fresh load).
+        """
+        if ids is None:
+            _, ids = self.load()
+        return {name: row for row, name in enumerate(ids)}
+
+
+_store: Optional[VectorStore] = None
+
+
+def get_store() -> VectorStore:
+    global _store
+    if _store is None:
+        _store = VectorStore()
+    return _store
+
+
+# ==============================
+# 🔎 Corpus Operations
+# ==============================
+
+def add_documents(filenames: List[str], texts: List[str]) -> None:
+    """
+    Embed documents at ingestion time and append them to the vector store.
+    """
+    if filenames:
+        embedder = resources.get("local_embedder")
+        get_store().append(filenames, embedder.embed(texts), embedder.fingerprint)
+
+
+def semantic_scores(query_text: str, filenames: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Cosine similarity (0-100) of a query against every stored resume, via one matrix-vector product.
+
+    Raises:
+        ValueError: if the stored vectors came from a different embedder than the current one.
+    """
+    matrix, ids = get_store().load()
+    latest = get_store().latest_rows(ids)   # Rows of this snapshot; a concurrent append cannot shift them
+    if filenames is not None:
+        latest = {name: latest[name] for name in filenames if name in latest}
+    if not latest or not matrix.size:
+        return {}
+    embedder = resources.get("local_embedder")
+    get_store().check_embedder(embedder)
+    query = embedder.embed([query_text])[0]
+    rows = np.fromiter(latest.values(), dtype=np.int64, count=len(latest))
+    scores = matrix[rows] @ query
+    return {name: round(float(score) * 100, 2) for name, score in zip(latest, scores)}
+
+
+def text_similarity(text1: str, text2: str) -> float:
+    """
+    Local stand-in for get_bert_similarity: cosine (0-100) of two texts.
+    """
+    v1, v2 = resources.get("local_embedder").embed([text1, text2])
+    return round(float(v1 @ v2) * 100, 2)
+
+
+def rebuild(filenames: List[str], texts: List[str], dim: int = EMBEDDING_DIM) -> LocalEmbedder:
+    """
+    Fit the TF-IDF + SVD projection on the corpus, save it, and re-embed everything.
+    """
+    embedder = LocalEmbedder.fit(texts, dim)
+    embedder.save()
+    resources.reset("local_embedder")
+    store = get_store()
+    store.clear()
+    add_documents(filenames, texts)
+    return embedder
+
+
+if __name__ == "__main__":
+    from config import UPLOAD_FOLDER_RESUMES, ALLOWED_EXTENSIONS
+    from utils.parser import MAX_PDF_PAGES, extract_texts_parallel
+
+    paths = [os.path.join(UPLOAD_FOLDER_RESUMES, f) for f in os.listdir(UPLOAD_FOLDER_RESUMES)
+             if f.rsplit(".", 1)[-1].lower() in ALLOWED_EXTENSIONS]
+    corpus = {os.path.basename(p): text for p, text, error in extract_texts_parallel(paths, max_pages=MAX_PDF_PAGES)
+              if not error}
+    fitted = rebuild(list(corpus), list(corpus.values()))
+    print(f"✅ Fitted {fitted.svd.n_components}-d projection and embedded {len(corpus)} resumes")
@@ -1,17 +1,25 @@
 # utils/matcher.py
 
-import os
-import requests
-import spacy
+import logging
+import numpy as np
 from dotenv import load_dotenv
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+from utils import embeddings, local_embeddings, resources
+from utils.circuit_breaker import BudgetExceeded, CircuitOpenError, LatencyBudget
+from utils.parser import EXTRACTOR_VERSION, MAX_PDF_PAGES, taxonomy_version
+from utils import skill_vectors  # Registers the "skill_vectors" resource
 
 # Load environment variables
 load_dotenv()
-HF_API_TOKEN = os.getenv("HF_API_TOKEN")
+HF_API_TOKEN = embeddings.HF_API_TOKEN
+
+# spaCy model for fallback semantic matching (loaded on first use)
+def _load_nlp():
+    import spacy
+    return spacy.load("en_core_web_md")
 
-# Load spaCy model for fallback semantic matching
-nlp = spacy.load("en_core_web_md")
+resources.register("spacy_md", _load_nlp)
 
 # === Synonym Map for Soft Matching ===
 SYNONYM_MAP = {
@@ -22,6 +30,23 @@ SYNONYM_MAP = {
 }
 
 
+# Bump whenever scoring logic changes, so stored match results are recomputed
+SCORING_VERSION = "1"
+
+
+def scoring_key(matching_mode: str = "exact", skill_weight: float = 0.5) -> str:
+    """
+    Identifies everything besides the two documents that a stored match score depends on:
+    the extractor and page cap resume skills were read with, and the skill taxonomy, which
+    also decides the JD's skills. Semantic scores also depend on the local embedder, so a
+    refit invalidates them.
+    """
+    base = f"{SCORING_VERSION}:{EXTRACTOR_VERSION}:p{MAX_PDF_PAGES}:{taxonomy_version()}"
+    if matching_mode == "semantic":
+        return f"{base}:semantic:{skill_weight:g}:{resources.get('local_embedder').fingerprint}"
+    return f"{base}:exact"
+
+
 # ✅ 1. Exact Keyword Match
 def calculate_match_score(resume_skills: List[str], jd_skills: List[str]) -> Tuple[float, List[str]]:
     if not resume_skills or not jd_skills:
@@ -31,38 +56,135 @@ def calculate_match_score(resume_skills: List[str], jd_skills: List[str]) -> Tup
     return round(match_percent, 2), matched_skills
 
 
-# ✅ 2. Semantic Similarity Using BERT API (with spaCy fallback)
-def get_bert_similarity(text1: str, text2: str) -> float:
+# ✅ 1b. Batch Exact Match over a Sparse Resume × Skill Matrix
+class SkillMatrix:
+    """
+    Binary CSR matrix of resumes × skills over a shared vocabulary.
+    Build it once for a set of candidates, then score any JD against all of them
+    with a single sparse matrix-vector product.
+    """
+
+    def __init__(self, resume_skill_lists: List[List[str]]):
+        from scipy import sparse
+
+        self.vocabulary = {}
+        indptr, indices = [0], []
+        for skills in resume_skill_lists:
+            columns = {self.vocabulary.setdefault(skill, len(self.vocabulary)) for skill in skills}
+            indices.extend(sorted(columns))
+            indptr.append(len(indices))
+        self.matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(resume_skill_lists), len(self.vocabulary))
+        )
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def score(self, jd_skills: List[str], with_matched: bool = True) -> List[Tuple[float, List[str]]]:
+        """
+        Same results as calculate_match_score(resume_skills, jd_skills) for every row.
+        """
+        n_rows = self.matrix.shape[0]
+        if not jd_skills:
+            return [(0, []) for _ in range(n_rows)]
+
+        percents = self.percents(jd_skills)
+        matched = self.matched(range(n_rows), jd_skills) if with_matched else [[] for _ in range(n_rows)]
+        empty_rows = np.diff(self.matrix.indptr) == 0
+        return [(0, []) if empty_rows[i] else (round(float(percents[i]), 2), matched[i])
+                for i in range(n_rows)]
+
+    def percents(self, jd_skills: List[str], rows=None) -> np.ndarray:
+        """
+        Unrounded match percent of every row (or just the given rows) as one float64 array.
+        """
+        matrix = self.matrix if rows is None else self.matrix[np.asarray(rows, dtype=np.int64)]
+        if not jd_skills:
+            return np.zeros(matrix.shape[0])
+        counts = np.asarray(matrix @ self._jd_vector(jd_skills)[1], dtype=np.float64)
+        # Same float ops and Python round() as calculate_match_score, so results match exactly
+        return (counts / len(jd_skills)) * 100
+
+    def percent_matrix(self, jd_skill_lists: List[List[str]]) -> np.ndarray:
+        """
+        (n_jds, n_rows) match percents for many JDs at once: one sparse product
+        J @ R.T instead of one pass per JD. Row j equals percents(jd_skill_lists[j]).
+        """
+        from scipy import sparse
+
+        indptr, indices = [0], []
+        for jd_skills in jd_skill_lists:
+            indices.extend(sorted({self.vocabulary[skill] for skill in jd_skills if skill in self.vocabulary}))
+            indptr.append(len(indices))
+        jd_matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), indices, indptr),
+            shape=(len(jd_skill_lists), self.matrix.shape[1])
+        )
+        counts = (jd_matrix @ self.matrix.T).toarray().astype(np.float64)
+        lengths = np.array([len(jd_skills) for jd_skills in jd_skill_lists], dtype=np.float64)
+        percents = np.zeros_like(counts)
+        has_skills = lengths > 0
+        percents[has_skills] = (counts[has_skills] / lengths[has_skills, None]) * 100
+        return percents
+
+    def matched(self, rows, jd_skills: List[str]) -> List[List[str]]:
+        """
+        Matched JD skills for the given rows, in JD order.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        jd_known, _ = self._jd_vector(jd_skills)
+        if not len(jd_known) or not len(rows):
+            return [[] for _ in rows]
+        columns = np.array([self.vocabulary[skill] for skill in jd_known], dtype=np.int64)
+        sub = self.matrix[rows][:, columns].tocsr()
+        sub.sort_indices()
+        return [[jd_known[j] for j in sub.indices[sub.indptr[i]:sub.indptr[i + 1]]] for i in range(len(rows))]
+
+    def _jd_vector(self, jd_skills: List[str]):
+        jd_known = [skill for skill in dict.fromkeys(jd_skills) if skill in self.vocabulary]
+        jd_vector = np.zeros(self.matrix.shape[1], dtype=np.float32)
+        jd_vector[[self.vocabulary[skill] for skill in jd_known]] = 1.0
+        return jd_known, jd_vector
+
+
+def score_many(resume_skill_lists: List[List[str]], jd_skills: List[str]) -> List[Tuple[float, List[str]]]:
+    """
+    Batch calculate_match_score: one (score, matched_skills) per resume.
+    """
+    return SkillMatrix(resume_skill_lists).score(jd_skills)
+
+
+# ✅ 2. Semantic Similarity Using BERT API (with local embedding fallback)
+def get_bert_similarity(text1: str, text2: str, budget: Optional[LatencyBudget] = None) -> float:
+    """
+    Hugging Face cosine (0-100) of two texts, or the local-embedding score when
+    there is no token, the HF circuit is open or the request's budget is spent.
+    """
+    if not HF_API_TOKEN or (budget is not None and budget.exhausted):
+        return local_embeddings.text_similarity(text1, text2)
     try:
-        if not HF_API_TOKEN:
-            raise ValueError("No Hugging Face token")
-
-        API_URL = "https://api-inference.huggingface.co/models/sentence-transformers/all-MiniLM-L6-v2"
-        headers = {
-            "Authorization": f"Bearer {HF_API_TOKEN}",
-            "Content-Type": "application/json"
-        }
-
-        def get_embedding(text: str) -> List[float]:
-            text = text.strip().replace("\n", " ")[:1000]
-            response = requests.post(API_URL, headers=headers, json={"inputs": text})
-            response.raise_for_status()
-            data = response.json()
-            if isinstance(data, list) and isinstance(data[0], list):
-                return data[0]
-            raise ValueError("Unexpected Hugging Face response format")
-
-        emb1 = get_embedding(text1)
-        emb2 = get_embedding(text2)
-        dot = sum(a * b for a, b in zip(emb1, emb2))
-        norm1 = sum(a**2 for a in emb1) ** 0.5
-        norm2 = sum(b**2 for b in emb2) ** 0.5
-        return round((dot / (norm1 * norm2)) * 100, 2)
+        emb1, emb2 = embeddings.embed_texts([text1, text2], budget=budget)
+        return round(embeddings.cosine_similarity(emb1, emb2) * 100, 2)
 
+    except (CircuitOpenError, BudgetExceeded):
+        return local_embeddings.text_similarity(text1, text2)
+    except Exception as e:
+        logging.warning(f"[Fallback to local embeddings] Reason: {e}")
+        return local_embeddings.text_similarity(text1, text2)
+
+
+def warm_embeddings(texts: List[str], budget: Optional[LatencyBudget] = None) -> None:
+    """
+    Fetch embeddings for many texts in batched requests, so later
+    get_bert_similarity calls on them are served from the embedding store.
+    """
+    if not HF_API_TOKEN or not texts or (budget is not None and budget.exhausted):
+        return
+    try:
+        embeddings.embed_texts(texts, budget=budget)
     except Exception as e:
-        print(f"[Fallback to spaCy] Reason: {e}")
-        doc1, doc2 = nlp(text1), nlp(text2)
-        return round(doc1.similarity(doc2) * 100, 2)
+        logging.warning(f"[Embedding prefetch failed] {e}")
 
 
 # ✅ 3. Feedback Message Generator
@@ -87,25 +209,48 @@ def boost_with_synonyms(skills: List[str]) -> List[str]:
     return list(boosted)
 
 
-# ✅ 5. Semantic Matching with Synonyms (spaCy-based)
+# ✅ 5. Semantic Matching with Synonyms (spaCy vectors, precomputed per skill)
+SYNONYM_SIMILARITY_THRESHOLD = 0.75
+
 def calculate_synonym_boosted_score(resume_skills: List[str], jd_skills: List[str]) -> Tuple[float, List[str]]:
     if not resume_skills or not jd_skills:
         return 0, []
+    jd_names = [skill.lower() for skill in jd_skills]
+    return _synonym_boosted_score(resume_skills, jd_names, _skill_vectors(jd_names))
+
+
+def calculate_synonym_boosted_scores(resume_skill_lists: List[List[str]],
+                                     jd_skills: List[str]) -> List[Tuple[float, List[str]]]:
+    """
+    Batch calculate_synonym_boosted_score; JD skill vectors are looked up once.
+    """
+    if not jd_skills:
+        return [(0, []) for _ in resume_skill_lists]
+    jd_names = [skill.lower() for skill in jd_skills]
+    jd_vectors = _skill_vectors(jd_names)
+    return [_synonym_boosted_score(skills, jd_names, jd_vectors) if skills else (0, [])
+            for skills in resume_skill_lists]
+
+
+def _skill_vectors(skills: List[str]) -> np.ndarray:
+    return resources.get("skill_vectors").vectors(skills)
+
+
+def _synonym_boosted_score(resume_skills: List[str], jd_names: List[str],
+                           jd_vectors: np.ndarray) -> Tuple[float, List[str]]:
+    resume_names = [skill.lower() for skill in boost_with_synonyms(resume_skills)]
+    similar = (_skill_vectors(resume_names) @ jd_vectors.T) >= SYNONYM_SIMILARITY_THRESHOLD
+    similar |= np.equal.outer(np.array(resume_names, dtype=object), np.array(jd_names, dtype=object))
 
-    boosted_resume = boost_with_synonyms(resume_skills)
+    # Each resume skill claims the first JD skill it matches that isn't matched yet
     matched = set()
-    resume_docs = [nlp(skill.lower()) for skill in boosted_resume]
-    jd_docs = [nlp(skill.lower()) for skill in jd_skills]
-
-    for res_doc in resume_docs:
-        for jd_doc in jd_docs:
-            if jd_doc.text in matched:
-                continue
-            if res_doc.similarity(jd_doc) >= 0.75:
-                matched.add(jd_doc.text)
+    for row in similar:
+        for j in np.flatnonzero(row):
+            if jd_names[j] not in matched:
+                matched.add(jd_names[j])
                 break
 
-    match_percent = (len(matched) / len(jd_skills)) * 100
+    match_percent = (len(matched) / len(jd_names)) * 100
     return round(match_percent, 2), list(matched)
 
 
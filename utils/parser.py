@@ -1,15 +1,35 @@
 import os
 import re
-import pdfplumber
-import docx
-import spacy
-from typing import Optional, Dict, List
+import time
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import wait
+from typing import Optional, Dict, List, Iterator, Tuple
 
-# ✅ Load spaCy English language model for name/entity extraction
-try:
-    nlp = spacy.load("en_core_web_sm")
-except:
-    raise ImportError("⚠️ Please run: python -m spacy download en_core_web_sm")
+from config import PARSE_TIMEOUT  # Per-file deadline for batch extraction; a stuck PDF is killed after this
+from utils import resources, text_cache
+from utils.skill_matcher import SkillMatcher, TOKEN_PATTERN
+
+# ✅ spaCy English language model for name/entity extraction (loaded on first use)
+def _load_nlp():
+    import spacy
+    try:
+        return spacy.load("en_core_web_sm")
+    except OSError:
+        raise ImportError("⚠️ Please run: python -m spacy download en_core_web_sm")
+
+resources.register("spacy_sm", _load_nlp)
+
+def get_nlp():
+    return resources.get("spacy_sm")
+
+# ✅ NER only needs tok2vec + ner; the rest of the pipeline is skipped
+NER_DISABLED_PIPES = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+NER_BATCH_SIZE = 64
+
+# ✅ Names sit in the resume header, so NER runs on this window first
+NAME_HEADER_CHARS = 500
 
 # ✅ Predefined skill keywords (extendable)
 SKILL_KEYWORDS = [
@@ -19,47 +39,254 @@ SKILL_KEYWORDS = [
     "flask", "django", "pandas", "numpy"
 ]
 
+# ✅ Full skill vocabulary ("canonical|alias" per line); SKILL_KEYWORDS is the fallback
+SKILL_TAXONOMY_PATH = os.path.join("data", "skill_taxonomy.txt")
+
+# ✅ Bump whenever extraction output changes, so cached text is re-extracted
+EXTRACTOR_VERSION = "1"
+
+# ✅ Resume ingestion reads at most this many PDF pages; pages past it rarely matter
+# for screening. Other reads (JDs, exports) take the whole document.
+MAX_PDF_PAGES = 5
+
+# ✅ Whole-document reads of PDFs with at least this many pages are split across processes
+PARALLEL_PAGE_THRESHOLD = 20
+
+
 # ==============================
 # 📄 Text Extraction Functions
 # ==============================
 
-def extract_text_from_file(file_path: str) -> str:
+def extract_text_from_file(file_path: str, use_cache: bool = True, max_pages: Optional[int] = None,
+                           workers: int = 1) -> str:
     """
     Extract text from PDF or DOCX file based on extension.
+    Results are cached on disk by content hash, so each file is parsed once.
+    max_pages caps the PDF pages read (None reads them all); workers > 1 lets
+    long PDFs be read as page ranges in parallel.
+    """
+    if not use_cache:
+        return _extract_text_uncached(file_path, max_pages, workers)
+    try:
+        key = text_cache.cache_key(text_cache.file_digest(file_path), _cache_version(max_pages))
+    except OSError as e:
+        print(f"[ERROR] File read failed: {e}")
+        return ""
+    text = text_cache.get_text(key)
+    if text is None:
+        text = _extract_text_uncached(file_path, max_pages, workers)
+        if text:  # Empty output may be a read failure, so it is not cached
+            text_cache.put_text(key, text)
+    return text
+
+def _cache_version(max_pages: Optional[int] = None) -> str:
+    """
+    Extractor version plus the page cap, since both change the cached text.
+    """
+    return f"{EXTRACTOR_VERSION}:p{max_pages if max_pages is not None else 'all'}"
+
+def _extract_text_uncached(file_path: str, max_pages: Optional[int] = None, workers: int = 1) -> str:
+    """
+    Dispatch to the PDF or DOCX extractor without touching the cache.
     """
     ext = os.path.splitext(file_path)[1].lower()
     if ext == ".pdf":
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path, max_pages, workers)
     elif ext == ".docx":
         return extract_text_from_docx(file_path)
     return ""  # Unsupported file type
 
-def extract_text_from_pdf(file_path: str) -> str:
+def extract_text_from_pdf(file_path: str, max_pages: Optional[int] = None, workers: int = 1) -> str:
     """
     Use pdfplumber to read and extract text from a PDF file.
+    Reads at most max_pages pages; with workers > 1, long documents are split
+    into page ranges extracted in separate processes and joined in order.
     """
-    text = ""
     try:
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
+        return _read_pdf(file_path, max_pages, workers)
     except Exception as e:
         print(f"[ERROR] PDF read failed: {e}")
-    return text
+        return ""
 
 def extract_text_from_docx(file_path: str) -> str:
     """
     Use python-docx to read and extract text from a DOCX file.
     """
-    text = ""
     try:
-        doc = docx.Document(file_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
+        return _read_docx(file_path)
     except Exception as e:
         print(f"[ERROR] DOCX read failed: {e}")
-    return text
+        return ""
+
+def _read_text(file_path: str, max_pages: Optional[int] = None) -> str:
+    """
+    Like _extract_text_uncached, but lets read errors propagate to the caller.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".pdf":
+        return _read_pdf(file_path, max_pages)
+    elif ext == ".docx":
+        return _read_docx(file_path)
+    return ""
+
+def _read_pdf(file_path: str, max_pages: Optional[int] = None, workers: int = 1) -> str:
+    import pdfplumber
+    if workers > 1:
+        with pdfplumber.open(file_path) as pdf:
+            page_count = len(pdf.pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
+        if page_count >= PARALLEL_PAGE_THRESHOLD:
+            step = -(-page_count // workers)
+            ranges = [(file_path, start, min(start + step, page_count))
+                      for start in range(0, page_count, step)]
+            with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+                return "".join(pool.map(_read_pdf_range, ranges))
+    return "".join(page_text + "\n" for page_text in iter_pdf_pages(file_path, max_pages) if page_text)
+
+def _read_pdf_range(args: Tuple[str, int, int]) -> str:
+    file_path, start, stop = args
+    return "".join(page_text + "\n"
+                   for page_text in iter_pdf_pages(file_path, stop - start, start) if page_text)
+
+def iter_pdf_pages(file_path: str, max_pages: Optional[int] = None, start: int = 0) -> Iterator[str]:
+    """
+    Yield the text of each PDF page in order, releasing every page's parsed
+    objects before moving on, so memory stays flat on long documents.
+    """
+    import pdfplumber
+    with pdfplumber.open(file_path) as pdf:
+        stop = len(pdf.pages)
+        if max_pages is not None:
+            stop = min(stop, start + max_pages)
+        for index in range(start, stop):
+            page = pdf.pages[index]
+            try:
+                yield page.extract_text() or ""
+            finally:
+                page.close()
+
+def _read_docx(file_path: str) -> str:
+    import docx
+    doc = docx.Document(file_path)
+    return "\n".join([para.text for para in doc.paragraphs])
+
+# ==============================
+# ⚡ Parallel Batch Extraction
+# ==============================
+
+def extract_texts_parallel(paths: List[str], workers: Optional[int] = None,
+                           timeout: float = PARSE_TIMEOUT, use_cache: bool = True,
+                           max_pages: Optional[int] = None) -> Iterator[Tuple[str, str, Optional[str]]]:
+    """
+    Extract many files over a pool of worker processes.
+
+    Args:
+        paths (list): File paths to extract.
+        workers (int): Number of worker processes (defaults to the CPU count).
+        timeout (float): Seconds a single file may take before its worker is killed.
+        use_cache (bool): Serve and store results through the text cache.
+        max_pages (int): PDF page cap (None reads every page).
+
+    Yields:
+        tuple: (path, text, error) as each file finishes; error is None on success.
+    """
+    pending = deque()
+    for path in paths:
+        key = None
+        if use_cache:
+            try:
+                key = text_cache.cache_key(text_cache.file_digest(path), _cache_version(max_pages))
+            except OSError as e:
+                yield path, "", str(e)
+                continue
+            text = text_cache.get_text(key)
+            if text is not None:
+                yield path, text, None
+                continue
+        pending.append((path, key))
+
+    if not pending:
+        return
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+    idle, busy = [], {}
+    try:
+        for _ in range(workers):
+            idle.append(_start_worker())
+
+        while pending or busy:
+            while pending and idle:
+                worker = idle.pop()
+                path, key = pending.popleft()
+                worker[1].send((path, max_pages))
+                busy[worker[1]] = (worker, path, key, time.monotonic() + timeout)
+
+            next_deadline = min(deadline for _, _, _, deadline in busy.values())
+            ready = wait(list(busy), timeout=max(0.0, next_deadline - time.monotonic()))
+
+            for conn in ready:
+                worker, path, key, _ = busy.pop(conn)
+                try:
+                    _, text, error = conn.recv()
+                except EOFError:  # Worker crashed mid-file
+                    _stop_worker(worker)
+                    if pending:
+                        idle.append(_start_worker())
+                    yield path, "", "Worker exited unexpectedly"
+                    continue
+                idle.append(worker)
+                if key and text and not error:
+                    text_cache.put_text(key, text)
+                yield path, text, error
+
+            now = time.monotonic()
+            for conn in [c for c, entry in busy.items() if entry[3] <= now]:
+                worker, path, _, _ = busy.pop(conn)
+                _stop_worker(worker)
+                if pending:
+                    idle.append(_start_worker())
+                yield path, "", f"Timed out after {timeout}s"
+    finally:
+        for worker in idle + [entry[0] for entry in busy.values()]:
+            _stop_worker(worker)
+
+def _start_worker():
+    parent_conn, child_conn = multiprocessing.Pipe()
+    process = multiprocessing.Process(target=_extraction_worker, args=(child_conn,), daemon=True)
+    process.start()
+    child_conn.close()
+    return process, parent_conn
+
+def _stop_worker(worker) -> None:
+    process, conn = worker
+    try:
+        conn.send(None)
+    except (OSError, ValueError):
+        pass
+    process.join(timeout=1)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    conn.close()
+
+def _extraction_worker(conn) -> None:
+    """
+    Worker loop: receive (path, max_pages), send back (path, text, error); None means stop.
+    """
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        path, max_pages = job
+        try:
+            conn.send((path, _read_text(path, max_pages), None))
+        except Exception as e:
+            conn.send((path, "", str(e)))
+    conn.close()
 
 # ==============================
 # 🔎 Field Extraction (NER)
@@ -68,37 +295,101 @@ def extract_text_from_docx(file_path: str) -> str:
 def extract_name(text: str) -> Optional[str]:
     """
     Use spaCy NER to find a person name.
+    Only the resume header is tagged first; the full text is the fallback.
+    """
+    nlp = get_nlp()
+    disable = _ner_disabled_pipes()
+    name = _first_person(nlp(text[:NAME_HEADER_CHARS], disable=disable))
+    if name is None and len(text) > NAME_HEADER_CHARS:
+        name = _first_person(nlp(text, disable=disable))
+    return name
+
+def extract_names(texts: List[str], batch_size: int = NER_BATCH_SIZE,
+                  n_process: int = 1) -> List[Optional[str]]:
     """
-    doc = nlp(text)
+    Batch version of extract_name using nlp.pipe.
+    """
+    nlp = get_nlp()
+    disable = _ner_disabled_pipes()
+    headers = (text[:NAME_HEADER_CHARS] for text in texts)
+    names = [_first_person(doc) for doc in nlp.pipe(headers, batch_size=batch_size,
+                                                      n_process=n_process, disable=disable)]
+
+    fallback = [i for i, name in enumerate(names) if name is None and len(texts[i]) > NAME_HEADER_CHARS]
+    if fallback:
+        docs = nlp.pipe((texts[i] for i in fallback), batch_size=batch_size,
+                        n_process=n_process, disable=disable)
+        for i, doc in zip(fallback, docs):
+            names[i] = _first_person(doc)
+    return names
+
+def _first_person(doc) -> Optional[str]:
     for ent in doc.ents:
         if ent.label_ == "PERSON":
             return ent.text
     return None
 
+def _ner_disabled_pipes() -> List[str]:
+    return [pipe for pipe in NER_DISABLED_PIPES if pipe in get_nlp().pipe_names]
+
+EMAIL_PATTERN = r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+"
+PHONE_PATTERN = r"(?:\+?\d{1,4}[\s-]?)?(?:\(?\d{2,4}\)?[\s-]?)?\d{3,4}[\s-]?\d{4}"
+
 def extract_email(text: str) -> Optional[str]:
     """
     Extract the first valid email using regex.
     """
-    match = re.search(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text)
+    match = re.search(EMAIL_PATTERN, text)
     return match.group() if match else None
 
 def extract_phone(text: str) -> Optional[str]:
     """
     Extract phone number using regex (flexible to international formats).
     """
-    match = re.search(r"(\+?\d{1,4}[\s-]?)?(\(?\d{2,4}\)?[\s-]?)?\d{3,4}[\s-]?\d{4}", text)
+    match = re.search(PHONE_PATTERN, text)
     return match.group() if match else None
 
 # ==============================
 # 💼 Skill Matching
 # ==============================
 
+_skill_matcher = None
+
+def get_skill_matcher() -> SkillMatcher:
+    """
+    Build the shared skill matcher once, from the taxonomy file when present.
+    """
+    global _skill_matcher
+    if _skill_matcher is None:
+        if os.path.exists(SKILL_TAXONOMY_PATH):
+            _skill_matcher = SkillMatcher.from_file(SKILL_TAXONOMY_PATH)
+        else:
+            _skill_matcher = SkillMatcher(SKILL_KEYWORDS)
+    return _skill_matcher
+
+def taxonomy_version() -> str:
+    """
+    Fingerprint of the skill taxonomy extraction currently runs with.
+    """
+    return get_skill_matcher().version
+
 def extract_skills(text: str) -> List[str]:
     """
-    Match predefined skills (case-insensitive).
+    Match taxonomy skills (case-insensitive, whole words only).
+    """
+    return get_skill_matcher().extract(text)
+
+def find_skills(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Return (skill, start, end) for every skill mention, in text order.
+    """
+    return get_skill_matcher().find(text)
+
+def count_skills(text: str) -> Dict[str, int]:
+    """
+    Return how many times each skill is mentioned.
     """
-    text = text.lower()
-    return [skill for skill in SKILL_KEYWORDS if skill in text]
+    return get_skill_matcher().counts(text)
 
 def extract_jd_skills(text: str) -> List[str]:
     """
@@ -114,27 +405,120 @@ def extract_resume_data(text: str) -> Dict[str, Optional[str]]:
     """
     Return structured data dictionary: name, email, phone, skills.
     """
+    features = extract_features(text)
     return {
-        "name": extract_name(text),
-        "email": extract_email(text),
-        "phone": extract_phone(text),
-        "skills": extract_skills(text)
+        "name": features.name,
+        "email": features.email,
+        "phone": features.phone,
+        "skills": features.skills
     }
 
+def extract_resume_data_many(texts: List[str], batch_size: int = NER_BATCH_SIZE,
+                             n_process: int = 1) -> List[Dict[str, Optional[str]]]:
+    """
+    Batch version of extract_resume_data; names are tagged with one nlp.pipe pass.
+    """
+    return [
+        {"name": f.name, "email": f.email, "phone": f.phone, "skills": f.skills}
+        for f in extract_features_many(texts, batch_size=batch_size, n_process=n_process)
+    ]
+
 # ==============================
 # 📈 Classify Experience Level
 # ==============================
 
+YEARS_PATTERN = r"(\d+)\+?\s+years?"
+
 def classify_experience(text: str) -> str:
     """
     Use regex to detect and classify years of experience.
     """
-    matches = re.findall(r"(\d+)\+?\s+years?", text.lower())
+    matches = re.findall(YEARS_PATTERN, text.lower())
     if not matches:
         return "Unknown"
-    years = max(int(m) for m in matches)
+    return experience_level(max(int(m) for m in matches))
+
+def experience_level(years: Optional[int]) -> str:
+    """
+    Map years of experience to Junior / Mid-Level / Senior.
+    """
+    if years is None:
+        return "Unknown"
     if years < 2:
         return "Junior"
     elif years < 5:
         return "Mid-Level"
     return "Senior"
+
+# ==============================
+# 🧾 Single-Pass Feature Extraction
+# ==============================
+
+# One alternation covers every regex field plus skill tokens, so the text is
+# scanned once. Earlier alternatives win at a position: an email is never
+# re-read as skill tokens, and "5 years" is never read as a phone number.
+FEATURE_PATTERN = re.compile(
+    r"(?P<email>" + EMAIL_PATTERN + r")"
+    r"|(?P<years>" + YEARS_PATTERN + r")"
+    r"|(?P<phone>" + PHONE_PATTERN + r")"
+    r"|(?P<token>" + TOKEN_PATTERN.pattern + r")",
+    re.IGNORECASE
+)
+
+class ResumeFeatures:
+    """
+    Compact record of everything the pipeline needs from one resume.
+    """
+    __slots__ = ("name", "email", "phone", "skills", "experience_years", "experience_level")
+
+    def __init__(self, name=None, email=None, phone=None, skills=None, experience_years=None):
+        self.name = name
+        self.email = email
+        self.phone = phone
+        self.skills = skills or []
+        self.experience_years = experience_years
+        self.experience_level = experience_level(experience_years)
+
+    def as_dict(self) -> Dict[str, object]:
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        return f"ResumeFeatures({self.as_dict()!r})"
+
+def extract_features(text: str, with_name: bool = True) -> ResumeFeatures:
+    """
+    Fill a ResumeFeatures record from one scan of the text (plus NER for the name).
+    """
+    features = _scan_features(text)
+    if with_name:
+        features.name = extract_name(text)
+    return features
+
+def extract_features_many(texts: List[str], with_name: bool = True, batch_size: int = NER_BATCH_SIZE,
+                          n_process: int = 1) -> List[ResumeFeatures]:
+    """
+    Batch version of extract_features; names are tagged with one nlp.pipe pass.
+    """
+    texts = list(texts)
+    records = [_scan_features(text) for text in texts]
+    if with_name:
+        for record, name in zip(records, extract_names(texts, batch_size=batch_size, n_process=n_process)):
+            record.name = name
+    return records
+
+def _scan_features(text: str) -> ResumeFeatures:
+    email = phone = years = None
+    tokens = []
+    for m in FEATURE_PATTERN.finditer(text):
+        kind = m.lastgroup
+        if kind == "token":
+            tokens.append((m.group().lower(), m.start(), m.end()))
+        elif kind == "years":
+            value = int(re.match(r"\d+", m.group()).group())
+            years = value if years is None else max(years, value)
+        elif kind == "email" and email is None:
+            email = m.group()
+        elif kind == "phone" and phone is None:
+            phone = m.group()
+    skills = list(dict.fromkeys(skill for skill, _, _ in get_skill_matcher().match_tokens(tokens)))
+    return ResumeFeatures(email=email, phone=phone, skills=skills, experience_years=years)
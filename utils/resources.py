@@ -0,0 +1,98 @@
+import time
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+# name -> zero-argument loader; heavy objects are built on first get() or warm_up()
+_loaders: Dict[str, Callable[[], object]] = {}
+_resources: Dict[str, object] = {}
+_load_times: Dict[str, float] = {}
+# name -> cheap callable naming the version that should be loaded (hot-reloaded resources)
+_version_fns: Dict[str, Callable[[], object]] = {}
+_loaded_versions: Dict[str, object] = {}
+_lock = threading.RLock()
+
+
+def register(name: str, loader: Callable[[], object], version: Optional[Callable[[], object]] = None) -> None:
+    """
+    Register a loader for a heavy resource without loading it.
+
+    With `version`, get() reloads the resource whenever version() changes.
+    Callers still holding the old object keep using it; if the reload fails,
+    the old object stays in service.
+    """
+    with _lock:
+        _loaders[name] = loader
+        if version is not None:
+            _version_fns[name] = version
+        else:
+            _version_fns.pop(name, None)
+
+
+def get(name: str):
+    """
+    Return the resource, loading it on first use (thread-safe).
+    """
+    version_fn = _version_fns.get(name)
+    if version_fn is None:
+        try:
+            return _resources[name]
+        except KeyError:
+            pass
+    else:
+        version = version_fn()
+        if name in _resources and _loaded_versions.get(name) == version:
+            return _resources[name]
+    with _lock:
+        if name not in _loaders:
+            raise KeyError(f"Unknown resource: {name}")
+        if version_fn is None:
+            if name not in _resources:
+                _load(name)
+        elif name not in _resources or _loaded_versions.get(name) != version:
+            try:
+                _load(name)
+            except Exception as e:
+                if name not in _resources:
+                    raise
+                logging.error(f"[Resource] Reloading {name} failed, keeping the loaded version: {e}")
+            _loaded_versions[name] = version
+        return _resources[name]
+
+
+def _load(name: str) -> None:
+    start = time.perf_counter()
+    _resources[name] = _loaders[name]()
+    _load_times[name] = time.perf_counter() - start
+    logging.info(f"[Resource] Loaded {name} in {_load_times[name]:.2f}s")
+
+
+def is_loaded(name: str) -> bool:
+    return name in _resources
+
+
+def reset(name: str) -> None:
+    """
+    Drop a loaded resource so the next get() reloads it.
+    """
+    with _lock:
+        _resources.pop(name, None)
+        _load_times.pop(name, None)
+        _loaded_versions.pop(name, None)
+
+
+def warm_up(names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Load the given resources (default: all registered) and return seconds spent per resource.
+    """
+    names = list(names) if names is not None else list(_loaders)
+    for name in names:
+        get(name)
+    return {name: _load_times.get(name, 0.0) for name in names}
+
+
+def status() -> Dict[str, bool]:
+    """
+    Map every registered resource to whether it is loaded.
+    """
+    return {name: name in _resources for name in _loaders}
@@ -0,0 +1,269 @@
+import os
+import heapq
+import threading
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from utils import local_embeddings, resources
+from utils.database import get_resume_skills, get_resumes_version
+from utils.matcher import SkillMatrix
+
+DEFAULT_K = 25
+MAX_K = 1000
+BLOCK_ROWS = 65536               # Rows scored per matmul block (~64 MB of float32 at 256-d)
+IVF_PATH = os.path.join("database", "resume_vectors.ivf.npz")
+IVF_NPROBE = 8                   # Lists scanned per query in IVF mode
+IVF_TRAIN_SAMPLE = 100_000
+
+
+# ==============================
+# 🏆 Heap-Based Top-k
+# ==============================
+
+def top_k_blocks(n_rows: int, k: int, block_scores: Callable[[int, int], np.ndarray],
+                 block_rows: int = BLOCK_ROWS):
+    """
+    Top-k over rows [0, n_rows), scoring one block at a time.
+
+    block_scores(start, stop) returns the scores of that block (-inf to skip a row).
+    Each block is cut down with argpartition and merged into a size-k min-heap,
+    so memory stays O(block_rows + k) however large the corpus is.
+    Ties go to the lower row. Returns (rows, scores), best first.
+    """
+    heap = []
+    for start in range(0, n_rows, block_rows):
+        stop = min(start + block_rows, n_rows)
+        scores = np.asarray(block_scores(start, stop), dtype=np.float64)
+        take = min(k, len(scores))
+        if take <= 0:
+            continue
+        threshold = np.partition(scores, len(scores) - take)[len(scores) - take]
+        above = np.flatnonzero(scores > threshold)
+        # Rows tied at the threshold are taken in row order, so ties always go to the lower row
+        tied = np.flatnonzero(scores == threshold)[:take - len(above)]
+        for i in np.concatenate([above, tied]):
+            if scores[i] == -np.inf:
+                continue
+            item = (float(scores[i]), -(start + int(i)))
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    ranked = sorted(heap, reverse=True)
+    return [-row for _, row in ranked], [score for score, _ in ranked]
+
+
+# ==============================
+# 🧭 IVF (Cluster-Pruned) Index
+# ==============================
+
+class IVFIndex:
+    """
+    Inverted-file index over unit vectors: rows are bucketed by their nearest
+    k-means centroid, and a query only scans the nprobe closest buckets.
+    Rows appended after the index was built are always scanned in full.
+    """
+
+    def __init__(self, centroids: np.ndarray, list_offsets: np.ndarray, list_rows: np.ndarray, n_rows: int):
+        self.centroids = centroids
+        self.list_offsets = list_offsets
+        self.list_rows = list_rows
+        self.n_rows = n_rows
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, n_lists: Optional[int] = None,
+              block_rows: int = BLOCK_ROWS) -> "IVFIndex":
+        from sklearn.cluster import MiniBatchKMeans
+
+        n_rows = matrix.shape[0]
+        n_lists = n_lists or max(1, int(np.sqrt(n_rows)))
+        rng = np.random.default_rng(42)
+        sample = np.sort(rng.choice(n_rows, size=min(n_rows, IVF_TRAIN_SAMPLE), replace=False))
+        kmeans = MiniBatchKMeans(n_clusters=min(n_lists, len(sample)), random_state=42, n_init=3)
+        kmeans.fit(matrix[sample])
+        centroids = kmeans.cluster_centers_.astype(np.float32)
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        centroids = np.divide(centroids, norms, out=np.zeros_like(centroids), where=norms > 0)
+
+        assignments = np.empty(n_rows, dtype=np.int32)
+        for start in range(0, n_rows, block_rows):
+            assignments[start:start + block_rows] = np.argmax(matrix[start:start + block_rows] @ centroids.T, axis=1)
+        list_rows = np.argsort(assignments, kind="stable").astype(np.int64)
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=len(centroids)))])
+        return cls(centroids, list_offsets, list_rows, n_rows)
+
+    @classmethod
+    def load(cls, path: str = IVF_PATH) -> "IVFIndex":
+        data = np.load(path)
+        return cls(data["centroids"], data["list_offsets"], data["list_rows"], int(data["n_rows"]))
+
+    def save(self, path: str = IVF_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(path, centroids=self.centroids, list_offsets=self.list_offsets,
+                 list_rows=self.list_rows, n_rows=self.n_rows)
+
+    def candidates(self, query: np.ndarray, nprobe: int, total_rows: int) -> np.ndarray:
+        """
+        Sorted rows to score for a query: the nprobe nearest lists plus the unindexed tail.
+        """
+        nprobe = min(nprobe, len(self.centroids))
+        lists = np.argpartition(self.centroids @ query, len(self.centroids) - nprobe)[len(self.centroids) - nprobe:]
+        parts = [self.list_rows[self.list_offsets[i]:self.list_offsets[i + 1]] for i in lists]
+        parts.append(np.arange(self.n_rows, total_rows, dtype=np.int64))
+        return np.sort(np.concatenate(parts))
+
+
+# ==============================
+# 🔍 Retrieval Index
+# ==============================
+
+class RetrievalIndex:
+    """
+    Top-k candidate retrieval for a JD over every ingested resume.
+
+    Skill sets live in a SkillMatrix and document vectors in the memory-mapped
+    VectorStore. Both are rebuilt only when the resumes table or the store
+    changes, so a query costs one sparse product plus a blocked matmul.
+    """
+
+    def __init__(self, store: Optional[local_embeddings.VectorStore] = None, ivf_path: str = IVF_PATH):
+        self.store = store or local_embeddings.get_store()
+        self.ivf_path = ivf_path
+        self._lock = threading.Lock()
+        self._skills_version = None
+        self._vectors_version = None
+        self._filenames: List[str] = []
+        self._skills = SkillMatrix([])
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._skill_rows = np.zeros(0, dtype=np.int64)    # Vector row -> skill row (-1: stale/unknown)
+        self._ivf: Optional[IVFIndex] = None
+
+    # --- Keeping in sync ---
+    def refresh(self):
+        """
+        Pick up new ingestions and return a consistent
+        (filenames, skills, matrix, skill_rows, ivf) snapshot.
+        """
+        with self._lock:
+            version = get_resumes_version()
+            if version != self._skills_version:
+                resume_skills = get_resume_skills()
+                self._filenames = list(resume_skills)
+                self._skills = SkillMatrix([skills.split(", ") if skills else [] for skills in resume_skills.values()])
+                self._skills_version, self._vectors_version = version, None
+
+            matrix, ids = self.store.load()
+            if self._vectors_version != (self._skills_version, self.store.version):
+                skill_row = {name: i for i, name in enumerate(self._filenames)}
+                skill_rows = np.full(len(ids), -1, dtype=np.int64)
+                for name, row in self.store.latest_rows(ids).items():
+                    skill_rows[row] = skill_row.get(name, -1)
+                self._matrix, self._skill_rows = matrix, skill_rows
+                self._ivf = self._load_ivf(matrix)
+                self._vectors_version = (self._skills_version, self.store.version)
+            return self._filenames, self._skills, self._matrix, self._skill_rows, self._ivf
+
+    def _load_ivf(self, matrix: np.ndarray) -> Optional[IVFIndex]:
+        if not os.path.exists(self.ivf_path):
+            return None
+        ivf = IVFIndex.load(self.ivf_path)
+        # An index from before a store rebuild points at rows that no longer mean the same thing
+        if ivf.n_rows > matrix.shape[0] or ivf.centroids.shape[1] != matrix.shape[1]:
+            return None
+        return ivf
+
+    def build_ivf(self, n_lists: Optional[int] = None) -> IVFIndex:
+        matrix, _ = self.store.load()
+        ivf = IVFIndex.build(matrix, n_lists)
+        ivf.save(self.ivf_path)
+        with self._lock:
+            self._vectors_version = None
+        return ivf
+
+    # --- Querying ---
+    def search(self, jd_text: str, jd_skills: List[str], k: int = DEFAULT_K, mode: str = "exact",
+               skill_weight: float = 0.5, nprobe: Optional[int] = None) -> List[Dict]:
+        """
+        Return the k best resumes for a JD, best first.
+
+        mode="exact" ranks by skill match percent; mode="semantic" ranks by
+        skill_weight * skill + (1 - skill_weight) * cosine, both 0-100, over
+        resumes that have a document vector. nprobe switches semantic search
+        to the IVF index when one has been built. Semantic mode raises
+        ValueError if the stored vectors came from a different embedder.
+        """
+        filenames, skills, matrix, skill_rows, ivf = self.refresh()
+        if k <= 0 or not filenames:
+            return []
+
+        if mode == "semantic" and len(skill_rows):
+            embedder = resources.get("local_embedder")
+            self.store.check_embedder(embedder)
+            query = embedder.embed([jd_text])[0]
+            if nprobe and ivf is not None:
+                # Only the probed rows are scored, skills included, so cost tracks nprobe, not corpus size
+                vector_rows = ivf.candidates(query, nprobe, len(skill_rows))
+                vector_rows = vector_rows[skill_rows[vector_rows] >= 0]
+                owners = skill_rows[vector_rows]
+                skill_scores = skills.percents(jd_skills, owners)
+            else:
+                vector_rows, owners = None, skill_rows
+                skill_scores = skills.percents(jd_skills)[np.maximum(owners, 0)]
+            results = _semantic_top_k(matrix, query, owners, skill_scores, k, skill_weight, vector_rows)
+        else:
+            percents = skills.percents(jd_skills)
+            rows, scores = top_k_blocks(len(percents), k, lambda start, stop: percents[start:stop])
+            results = [(row, score, score, None) for row, score in zip(rows, scores)]
+
+        matched = skills.matched([row for row, _, _, _ in results], jd_skills)
+        return [{
+            "filename": filenames[row],
+            "score": round(score, 2),
+            "skill_score": round(skill_score, 2),
+            "semantic_score": None if semantic is None else round(semantic, 2),
+            "matched_skills": matched_skills,
+        } for (row, score, skill_score, semantic), matched_skills in zip(results, matched)]
+
+
+def _semantic_top_k(matrix, query, owners, skill_scores, k, skill_weight, vector_rows=None):
+    """
+    Blocked top-k of the blended score over vector rows (all of them, or the given subset).
+    owners and skill_scores are aligned with those rows; owner -1 marks a stale vector.
+    Returns (skill row, blended score, skill score, semantic score) tuples.
+    """
+    def blended(start, stop):
+        block = slice(start, stop) if vector_rows is None else vector_rows[start:stop]
+        scores = skill_weight * skill_scores[start:stop] + (1 - skill_weight) * (matrix[block] @ query) * 100.0
+        return np.where(owners[start:stop] >= 0, scores, -np.inf)
+
+    positions, scores = top_k_blocks(len(owners), k, blended)
+    positions = np.asarray(positions, dtype=np.int64)
+    rows = positions if vector_rows is None else vector_rows[positions]
+    semantic = (matrix[rows] @ query) * 100.0 if len(rows) else []
+    return [(int(owners[p]), score, float(skill_scores[p]), float(sem))
+            for p, score, sem in zip(positions, scores, semantic)]
+
+
+_index: Optional[RetrievalIndex] = None
+
+
+def get_index() -> RetrievalIndex:
+    global _index
+    if _index is None:
+        _index = RetrievalIndex()
+    return _index
+
+
+def match_top_k(jd_text: str, jd_skills: List[str], k: int = DEFAULT_K, mode: str = "exact",
+                skill_weight: float = 0.5, nprobe: Optional[int] = None) -> List[Dict]:
+    """
+    Python API for /match_topk: the k best ingested resumes for a JD.
+    """
+    return get_index().search(jd_text, jd_skills, k, mode, skill_weight, nprobe)
+
+
+if __name__ == "__main__":
+    built = get_index().build_ivf()
+    print(f"✅ Built IVF index: {len(built.centroids)} lists over {built.n_rows} vectors")
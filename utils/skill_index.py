@@ -0,0 +1,192 @@
+import sqlite3
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Set
+
+import numpy as np
+
+from utils import database
+
+POSTING_DTYPE = np.dtype("<u4")
+
+
+# ==============================
+# 🗂️ Inverted Skill Index
+# ==============================
+# skill -> sorted array of doc ids, stored as uint32 blobs in results.db next to
+# the resumes table. Ingestion updates only the postings of skills that changed,
+# and readers keep decoded postings in memory until the index changes.
+
+_cache: Dict[str, np.ndarray] = {}
+_cache_version = None
+_cache_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    return sqlite3.connect(database.DB_NAME, timeout=30)
+
+
+def _decode(blob) -> np.ndarray:
+    return np.frombuffer(blob, dtype=POSTING_DTYPE) if blob else np.zeros(0, dtype=POSTING_DTYPE)
+
+
+def _split(skills: str) -> Set[str]:
+    return {skill for skill in skills.split(", ") if skill} if skills else set()
+
+
+# === Writing ===
+def update_many(skills_by_file: Dict[str, Iterable[str]]) -> None:
+    """
+    Point each file's postings at its current skills, in one transaction.
+    """
+    if not skills_by_file:
+        return
+    conn = _connect()
+    try:
+        c = conn.cursor()
+        # Take the write lock before the first read: concurrent ingests then queue up instead of
+        # both inserting the same new filename or overwriting each other's postings
+        c.execute("BEGIN IMMEDIATE")
+        added, removed = defaultdict(list), defaultdict(list)
+        for filename, skills in skills_by_file.items():
+            new = {skill.strip().lower() for skill in skills if skill.strip()}
+            row = c.execute("SELECT doc_id, skills FROM skill_index_docs WHERE filename = ?", (filename,)).fetchone()
+            if row is None:
+                c.execute("INSERT INTO skill_index_docs (filename, skills) VALUES (?, ?)",
+                          (filename, ", ".join(sorted(new))))
+                doc_id, old = c.lastrowid, set()
+            else:
+                doc_id, old = row[0], _split(row[1])
+                c.execute("UPDATE skill_index_docs SET skills = ? WHERE doc_id = ?", (", ".join(sorted(new)), doc_id))
+            for skill in new - old:
+                added[skill].append(doc_id)
+            for skill in old - new:
+                removed[skill].append(doc_id)
+
+        for skill in set(added) | set(removed):
+            row = c.execute("SELECT doc_ids FROM skill_postings WHERE skill = ?", (skill,)).fetchone()
+            posting = _decode(row[0] if row else None)
+            if skill in removed:
+                posting = np.setdiff1d(posting, removed[skill], assume_unique=True)
+            if skill in added:
+                posting = np.union1d(posting, added[skill])
+            # REPLACE (never DELETE) gives the row a new rowid, which is how readers spot changes
+            c.execute("INSERT OR REPLACE INTO skill_postings (skill, doc_ids) VALUES (?, ?)",
+                      (skill, posting.astype(POSTING_DTYPE).tobytes()))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def rebuild() -> None:
+    """
+    Re-index every ingested resume from the resumes table.
+    """
+    conn = _connect()
+    try:
+        conn.execute("INSERT OR REPLACE INTO skill_postings (skill, doc_ids) SELECT skill, X'' FROM skill_postings")
+        conn.execute("UPDATE skill_index_docs SET skills = ''")
+        conn.commit()
+    finally:
+        conn.close()
+    update_many({filename: _split(skills) for filename, skills in database.get_resume_skills().items()})
+
+
+def index_missing() -> None:
+    """
+    Index resumes ingested before the skill index existed.
+    """
+    conn = _connect()
+    try:
+        rows = conn.execute('''
+            SELECT r.filename, r.skills FROM resumes r
+            LEFT JOIN skill_index_docs d ON d.filename = r.filename
+            WHERE d.filename IS NULL
+        ''').fetchall()
+    finally:
+        conn.close()
+    update_many({filename: _split(skills) for filename, skills in rows})
+
+
+# === Reading ===
+def _index_version(conn: sqlite3.Connection):
+    return conn.execute("SELECT MAX(rowid), COUNT(*) FROM skill_postings").fetchone()
+
+
+def postings(skills: Iterable[str]) -> Dict[str, np.ndarray]:
+    """
+    Sorted doc-id arrays for the given skills (empty for unknown skills).
+    """
+    global _cache_version
+    skills = list(dict.fromkeys(skill.strip().lower() for skill in skills if skill.strip()))
+    conn = _connect()
+    try:
+        with _cache_lock:
+            version = _index_version(conn)
+            if version != _cache_version:
+                _cache.clear()
+                _cache_version = version
+            missing = [skill for skill in skills if skill not in _cache]
+            for i in range(0, len(missing), 500):
+                chunk = missing[i:i + 500]
+                rows = dict(conn.execute(
+                    f"SELECT skill, doc_ids FROM skill_postings WHERE skill IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall())
+                _cache.update((skill, _decode(rows.get(skill))) for skill in chunk)
+            return {skill: _cache[skill] for skill in skills}
+    finally:
+        conn.close()
+
+
+def intersect(skills: Iterable[str]) -> np.ndarray:
+    """
+    Doc ids having every one of the skills, shortest posting list first.
+    """
+    lists = sorted(postings(skills).values(), key=len)
+    if not lists:
+        return np.zeros(0, dtype=POSTING_DTYPE)
+    result = lists[0]
+    for posting in lists[1:]:
+        if not len(result):
+            break
+        result = np.intersect1d(result, posting, assume_unique=True)
+    return result
+
+
+def match_counts(jd_skills: Iterable[str]) -> Dict[str, int]:
+    """
+    How many of the JD's skills each resume has, for resumes with at least one.
+    """
+    lists = [posting for posting in postings(jd_skills).values() if len(posting)]
+    if not lists:
+        return {}
+    doc_ids, counts = np.unique(np.concatenate(lists), return_counts=True)
+    names = filenames_for(doc_ids)
+    return {names[doc_id]: int(count) for doc_id, count in zip(doc_ids.tolist(), counts) if doc_id in names}
+
+
+def filenames_for(doc_ids: Iterable[int]) -> Dict[int, str]:
+    doc_ids = [int(doc_id) for doc_id in doc_ids]
+    names = {}
+    conn = _connect()
+    try:
+        for i in range(0, len(doc_ids), 500):  # Stay under SQLite's bound-parameter limit
+            chunk = doc_ids[i:i + 500]
+            names.update(conn.execute(
+                f"SELECT doc_id, filename FROM skill_index_docs WHERE doc_id IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall())
+    finally:
+        conn.close()
+    return names
+
+
+def filenames_with_all(skills: Iterable[str]) -> Set[str]:
+    """
+    Filenames of resumes that have every one of the skills ("python AND sql").
+    """
+    return set(filenames_for(intersect(skills)).values())
+
+
+if __name__ == "__main__":
+    rebuild()
+    print("✅ Rebuilt skill index")
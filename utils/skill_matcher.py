@@ -0,0 +1,106 @@
+import re
+import hashlib
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple, Union
+
+# Word-like tokens; "+" and "#" stay attached (c++, c#) and inner dots join (node.js).
+# Anything else, including "-" and "/", separates tokens.
+TOKEN_PATTERN = re.compile(r"[\w+#]+(?:\.[\w+#]+)*")
+
+SkillEntry = Union[str, Tuple[str, Iterable[str]]]
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """
+    Split text into lowercased (token, start, end) triples.
+    """
+    return [(m.group().lower(), m.start(), m.end()) for m in TOKEN_PATTERN.finditer(text)]
+
+
+def load_taxonomy(path: str) -> List[Tuple[str, List[str]]]:
+    """
+    Read a taxonomy file with one "canonical|alias|alias" entry per line.
+    Blank lines and lines starting with '#' are ignored.
+    """
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            names = [name.strip().lower() for name in line.split("|") if name.strip()]
+            entries.append((names[0], names[1:]))
+    return entries
+
+
+class SkillMatcher:
+    """
+    Finds every taxonomy skill in a text in a single pass over its tokens.
+
+    Each skill (and alias) is stored as a token tuple, so matches always fall on
+    word boundaries: "java" never matches inside "javascript". At each position
+    the longest known phrase wins and matches never overlap.
+    """
+
+    def __init__(self, skills: Iterable[SkillEntry]):
+        self._phrases: Dict[Tuple[str, ...], str] = {}
+        self._prefixes = set()
+        for entry in skills:
+            canonical, aliases = (entry, []) if isinstance(entry, str) else entry
+            canonical = canonical.lower()
+            for name in [canonical, *aliases]:
+                tokens = tuple(token for token, _, _ in tokenize(name))
+                if not tokens:
+                    continue
+                self._phrases.setdefault(tokens, canonical)
+                for i in range(1, len(tokens)):
+                    self._prefixes.add(tokens[:i])
+        self.max_phrase_len = max((len(p) for p in self._phrases), default=0)
+        self.skills = sorted(set(self._phrases.values()))
+        # Fingerprint of the phrase table: changes whenever the taxonomy does
+        self.version = hashlib.sha256(repr(sorted(self._phrases.items())).encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        return cls(load_taxonomy(path))
+
+    def find(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Return (skill, start, end) for every match, in text order.
+        """
+        return self.match_tokens(tokenize(text))
+
+    def match_tokens(self, tokens: List[Tuple[str, int, int]]) -> List[Tuple[str, int, int]]:
+        """
+        Like find, for callers that already tokenized the text (lowercased tokens).
+        """
+        words = [token for token, _, _ in tokens]
+        matches = []
+        i = 0
+        while i < len(words):
+            best = 0
+            for length in range(1, min(self.max_phrase_len, len(words) - i) + 1):
+                phrase = tuple(words[i:i + length])
+                if phrase in self._phrases:
+                    best = length
+                if phrase not in self._prefixes:
+                    break
+            if best:
+                skill = self._phrases[tuple(words[i:i + best])]
+                matches.append((skill, tokens[i][1], tokens[i + best - 1][2]))
+                i += best
+            else:
+                i += 1
+        return matches
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """
+        Return how many times each skill occurs in the text.
+        """
+        return dict(Counter(skill for skill, _, _ in self.find(text)))
+
+    def extract(self, text: str) -> List[str]:
+        """
+        Return the distinct skills found, in order of first appearance.
+        """
+        return list(dict.fromkeys(skill for skill, _, _ in self.find(text)))
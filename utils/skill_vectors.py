@@ -0,0 +1,105 @@
+import os
+import threading
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from utils import resources
+
+SKILL_VECTORS_PATH = os.path.join("ml_model", "skill_vectors.npz")
+
+
+class SkillVectorTable:
+    """
+    L2-normalized float32 vectors for skill phrases (spaCy en_core_web_md doc vectors).
+
+    The taxonomy is precomputed into one matrix; skills outside it are embedded
+    on first sight and kept in an in-process cache. Because rows are unit length,
+    R @ J.T gives the same cosine similarity as spaCy's Doc.similarity.
+    """
+
+    def __init__(self, skills: Iterable[str] = (), vectors: np.ndarray = None):
+        skills = list(skills)
+        self._index: Dict[str, int] = {skill: i for i, skill in enumerate(skills)}
+        self._matrix = (vectors.astype(np.float32, copy=False) if vectors is not None
+                        else np.zeros((0, 0), dtype=np.float32))
+        self._extra: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, skills: Iterable[str], batch_size: int = 256) -> "SkillVectorTable":
+        skills = list(dict.fromkeys(skill.lower() for skill in skills))
+        return cls(skills, _embed(skills, batch_size))
+
+    @classmethod
+    def load(cls, path: str = SKILL_VECTORS_PATH) -> "SkillVectorTable":
+        data = np.load(path, allow_pickle=False)
+        return cls(data["skills"].tolist(), data["vectors"])
+
+    def save(self, path: str = SKILL_VECTORS_PATH) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(path, skills=np.array(list(self._index)), vectors=self._matrix)
+
+    def __len__(self):
+        return len(self._index) + len(self._extra)
+
+    def vectors(self, skills: List[str]) -> np.ndarray:
+        """
+        Return a (len(skills), dim) matrix of unit vectors, embedding unseen skills once.
+        """
+        unseen = [s for s in dict.fromkeys(skills) if s not in self._index and s not in self._extra]
+        if unseen:
+            embedded = _embed(unseen)
+            with self._lock:
+                self._extra.update(zip(unseen, embedded))
+
+        rows = [self._matrix[self._index[s]] if s in self._index else self._extra[s] for s in skills]
+        if not rows:
+            return np.zeros((0, self._dim()), dtype=np.float32)
+        return np.vstack(rows)
+
+    def _dim(self) -> int:
+        if self._matrix.size:
+            return self._matrix.shape[1]
+        return next(iter(self._extra.values())).shape[0] if self._extra else 0
+
+
+def _embed(skills: List[str], batch_size: int = 256) -> np.ndarray:
+    nlp = resources.get("spacy_md")
+    vectors = np.array([doc.vector for doc in nlp.pipe(skills, batch_size=batch_size)], dtype=np.float32)
+    if not len(vectors):
+        return np.zeros((0, nlp.vocab.vectors_length), dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    # Skills without vectors stay all-zero, i.e. similarity 0 (spaCy's behaviour too)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _load_table() -> SkillVectorTable:
+    if os.path.exists(SKILL_VECTORS_PATH):
+        return SkillVectorTable.load(SKILL_VECTORS_PATH)
+    return SkillVectorTable()
+
+resources.register("skill_vectors", _load_table)
+
+
+def skill_vocabulary() -> List[str]:
+    """
+    Every taxonomy skill and alias plus the matcher's synonym map.
+    """
+    from utils.parser import SKILL_KEYWORDS, SKILL_TAXONOMY_PATH
+    from utils.skill_matcher import load_taxonomy
+    from utils.matcher import SYNONYM_MAP
+
+    vocabulary = list(SKILL_KEYWORDS)
+    if os.path.exists(SKILL_TAXONOMY_PATH):
+        for canonical, aliases in load_taxonomy(SKILL_TAXONOMY_PATH):
+            vocabulary.extend([canonical, *aliases])
+    for skill, synonyms in SYNONYM_MAP.items():
+        vocabulary.extend([skill, *synonyms])
+    return vocabulary
+
+
+if __name__ == "__main__":
+    table = SkillVectorTable.build(skill_vocabulary())
+    table.save()
+    print(f"✅ Saved {len(table)} skill vectors to {SKILL_VECTORS_PATH}")
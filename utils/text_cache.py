@@ -0,0 +1,112 @@
+import os
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Optional
+
+CACHE_DB = os.path.join("database", "text_cache.db")
+MAX_CACHE_BYTES = 256 * 1024 * 1024  # Evict least-recently-used entries past this size
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_lock = threading.Lock()
+
+
+# === Content hashing ===
+def file_digest(file_path: str) -> str:
+    """
+    Return the SHA-256 hex digest of a file's bytes.
+    """
+    h = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(digest: str, extractor_version: str) -> str:
+    """
+    Combine a content digest with the extractor version, so a parser change
+    never serves text produced by an older extractor.
+    """
+    return f"{extractor_version}:{digest}"
+
+
+# === Connection ===
+def _connect(db_path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS texts (
+            key TEXT PRIMARY KEY,
+            text TEXT,
+            size INTEGER,
+            last_access REAL
+        )
+    ''')
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_texts_last_access ON texts(last_access)")
+    return conn
+
+
+# === Read / Write ===
+def get_text(key: str, db_path: str = CACHE_DB) -> Optional[str]:
+    """
+    Return the cached text for a key (and mark it recently used), or None.
+    """
+    with _lock:
+        conn = _connect(db_path)
+        try:
+            row = conn.execute("SELECT text FROM texts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE texts SET last_access = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            return row[0]
+        finally:
+            conn.close()
+
+
+def put_text(key: str, text: str, db_path: str = CACHE_DB, max_bytes: int = MAX_CACHE_BYTES) -> None:
+    """
+    Store extracted text and evict least-recently-used entries over the size limit.
+    """
+    size = len(text.encode("utf-8"))
+    with _lock:
+        conn = _connect(db_path)
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO texts (key, text, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, text, size, time.time())
+            )
+            _evict(conn, max_bytes)
+            conn.commit()
+        finally:
+            conn.close()
+
+
+def _evict(conn: sqlite3.Connection, max_bytes: int) -> None:
+    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM texts").fetchone()[0]
+    if total <= max_bytes:
+        return
+    rows = conn.execute("SELECT key, size FROM texts ORDER BY last_access ASC").fetchall()
+    stale = []
+    for key, size in rows:
+        if total <= max_bytes:
+            break
+        stale.append((key,))
+        total -= size
+    conn.executemany("DELETE FROM texts WHERE key = ?", stale)
+
+
+def clear(db_path: str = CACHE_DB) -> None:
+    """
+    Remove every cached entry.
+    """
+    with _lock:
+        conn = _connect(db_path)
+        try:
+            conn.execute("DELETE FROM texts")
+            conn.commit()
+        finally:
+            conn.close()